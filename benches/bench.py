@@ -1,62 +1,533 @@
+"""Benchmarks urelativedelta against python-dateutil, and against previous runs.
+
+Run from the repository root with e.g.
+
+    python benches/bench.py --output results.json
+    python benches/bench.py --compare results.json
+
+which times every case, prints a table of the timings (in microseconds per call)
+with the speedup over dateutil, and optionally records the results as JSON. When
+comparing against a previous run, cases slower by more than the threshold are
+flagged as regressions, and the script exits with status 1.
+
+The suite runs offline under both CPython and PyPy, and dateutil is optional: its
+timings are skipped when it isn't installed. Under PyPy, each case is run a few
+more times before timing, to give the JIT a chance to warm up.
+"""
 from __future__ import annotations
 
+import argparse
+import importlib.metadata
+import json
+import platform
 import random
 import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from timeit import timeit
-
-import dateutil.relativedelta
+from fnmatch import fnmatch
+from functools import partial
+from timeit import Timer
 
 import urelativedelta
+from urelativedelta import daterule
+
+try:
+    import dateutil
+    import dateutil.relativedelta
+    import dateutil.rrule
+except ImportError:
+    dateutil = None
 
-random.seed(12345)
-KLASS = sys.argv[1]
 NUMDATES = 5_000
+NUMRULEDATES = 10_000
+NUMPARALLELDATES = 1_000_000
+NUMLARGERULEDATES = 10_000_000
+PYPY = platform.python_implementation() == "PyPy"
 
+random.seed(12345)
 dates = [datetime(2000, 1, 1) + timedelta(days=n) for n in range(NUMDATES)]
 shuffled = list(dates)
 random.shuffle(shuffled)
+# The 28th, so that dateutil's rrule yields the same dates as urelativedelta
+rule_start = datetime(2000, 1, 28)
 
+# Each case maps its name to the number of calls it makes, and functions making
+# those calls with urelativedelta and (if there's an equivalent) with dateutil
+CASES = {}
 
-def do_combined():
-    if KLASS == "urelativedelta":
-        for d in dates:
-            d + urelativedelta.relativedelta(years=100)
-    if KLASS == "dateutil":
+
+def case(name, calls=NUMDATES):
+    def register(function):
+        CASES[name] = (calls, function(urelativedelta), function(dateutil))
+        return function
+
+    return register
+
+
+# utils
+
+
+@case("is_leap_year")
+def leap_years(lib):
+    if lib is not urelativedelta:
+        return None  # dateutil has no equivalent
+
+    def run():
+        for year in range(1, NUMDATES):
+            urelativedelta.is_leap_year(year)
+
+    return run
+
+
+def _shift_case(name, shift, amount, keyword):
+    @case(name)
+    def shifts(lib):
+        if lib is urelativedelta:
+            function = getattr(urelativedelta, shift)
+
+            def run():
+                for d in dates:
+                    function(d, amount)
+
+        elif lib is not None:
+            delta = dateutil.relativedelta.relativedelta(**{keyword: amount})
+
+            def run():
+                for d in dates:
+                    d + delta
+
+        else:
+            return None
+        return run
+
+
+_shift_case("shift_months", "shift_months", 13, "months")
+_shift_case("shift_years", "shift_years", 100, "years")
+_shift_case("with_day", "with_day", 31, "day")
+_shift_case("with_month", "with_month", 2, "month")
+_shift_case("with_year", "with_year", 2004, "year")
+
+
+# relativedelta
+
+
+def _relativedelta(lib):
+    if lib is urelativedelta:
+        return urelativedelta.relativedelta
+    if lib is not None:
+        return dateutil.relativedelta.relativedelta
+    return None
+
+
+@case("relativedelta init")
+def inits(lib):
+    klass = _relativedelta(lib)
+
+    def run():
+        for _ in range(NUMDATES):
+            klass(years=10, months=10, days=10)
+
+    return run if klass else None
+
+
+@case("relativedelta init and add")
+def combined(lib):
+    klass = _relativedelta(lib)
+
+    def run():
         for d in dates:
-            d + dateutil.relativedelta.relativedelta(years=100)
+            d + klass(years=100)
 
+    return run if klass else None
 
-def do_shifts():
-    if KLASS == "urelativedelta":
-        delta = urelativedelta.relativedelta(years=100)
+
+@case("date + relativedelta")
+def adds(lib):
+    klass = _relativedelta(lib)
+
+    def run():
+        delta = klass(years=100)
         for d in dates:
             d + delta
-    if KLASS == "dateutil":
-        delta = dateutil.relativedelta.relativedelta(years=100)
+
+    return run if klass else None
+
+
+@case("date - relativedelta")
+def subtracts(lib):
+    klass = _relativedelta(lib)
+
+    def run():
+        delta = klass(months=1, days=1, hours=1)
         for d in dates:
-            d + delta
+            d - delta
 
+    return run if klass else None
 
-def do_inits():
-    if KLASS == "urelativedelta":
-        for _ in range(NUMDATES):
-            urelativedelta.relativedelta(years=10, months=10, days=10)
-    if KLASS == "dateutil":
+
+@case("relativedelta + relativedelta")
+def delta_adds(lib):
+    klass = _relativedelta(lib)
+
+    def run():
+        first, second = klass(months=1), klass(days=1, hours=1)
         for _ in range(NUMDATES):
-            dateutil.relativedelta.relativedelta(years=10, months=10, days=10)
+            first + second
+
+    return run if klass else None
+
+
+@case("relativedelta * int")
+def delta_multiplies(lib):
+    klass = _relativedelta(lib)
+
+    def run():
+        delta = klass(months=1, days=1)
+        for n in range(NUMDATES):
+            delta * n
+
+    return run if klass else None
+
+
+@case("chained relativedeltas")
+def chains(lib):
+    klass = _relativedelta(lib)
+
+    def run():
+        first, second, third = klass(months=1), klass(months=1), klass(days=-3)
+        for d in dates:
+            ((d + first) + second) + third
+
+    return run if klass else None
+
+
+@case("DeltaPlan")
+def plans(lib):
+    if lib is not urelativedelta:
+        return None
+
+    def run():
+        delta = urelativedelta.relativedelta
+        plan = urelativedelta.DeltaPlan(
+            delta(months=1), delta(months=1), delta(days=-3)
+        )
+        for d in dates:
+            d + plan
+
+    return run
+
+
+@case("differences")
+def differences(lib):
+    if lib is urelativedelta:
+        difference = urelativedelta.relativedelta.difference
+    elif lib is not None:
+        difference = dateutil.relativedelta.relativedelta
+    else:
+        return None
+
+    def run():
+        for d1, d2 in zip(dates, shuffled):
+            difference(d1, d2)
+
+    return run
+
+
+# daterule
+
+
+# The number of dates generated at each frequency (fewer years, to stay in range)
+_FREQUENCIES = {
+    "secondly": NUMRULEDATES,
+    "minutely": NUMRULEDATES,
+    "hourly": NUMRULEDATES,
+    "daily": NUMRULEDATES,
+    "weekly": NUMRULEDATES,
+    "monthly": NUMRULEDATES,
+    "yearly": NUMRULEDATES // 10,
+}
+
+
+def _rule_end(freq):
+    """The end giving the same number of dates as the counted rules."""
+    return getattr(daterule, freq)(rule_start)[_FREQUENCIES[freq]]
+
+
+def _rule_case(freq, bound, rolling_day=None):
+    name = f"daterule.{freq} ({bound}"
+    name += f", rolling_day={rolling_day})" if rolling_day else ")"
+
+    count = _FREQUENCIES[freq]
+
+    @case(name, calls=count)
+    def rules(lib):
+        kwargs = {"count": count} if bound == "count" else {}
+        if lib is urelativedelta:
+            generator = getattr(daterule, freq)
+            if bound == "end":
+                kwargs["end"] = _rule_end(freq)
+            if rolling_day:
+                kwargs["rolling_day"] = rolling_day
+
+            def run():
+                for _ in generator(rule_start, **kwargs):
+                    pass
+
+        elif lib is not None and not rolling_day:
+            # NB: rrule includes its end, so stop just before it
+            if bound == "end":
+                kwargs["until"] = _rule_end(freq) - timedelta(microseconds=1)
+            rrule_freq = getattr(dateutil.rrule, freq.upper())
+
+            def run():
+                for _ in dateutil.rrule.rrule(rrule_freq, rule_start, **kwargs):
+                    pass
+
+        else:
+            return None
+        return run
+
+
+for _freq in _FREQUENCIES:
+    for _bound in ("count", "end"):
+        _rule_case(_freq, _bound)
+for _bound in ("count", "end"):
+    _rule_case("monthly", _bound, rolling_day=31)
+    _rule_case("yearly", _bound, rolling_day=29)
+
+
+# Timing and reporting
+
+
+def time_case(run, calls, repeats):
+    """The best time for a single call of the case, in seconds."""
+    timer = Timer(run)
+    if PYPY:
+        timer.timeit(5)  # warm the JIT
+    # Enough runs to take at least 0.2s, so that noise is small
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeats, number)) / (number * calls)
+
+
+def bytes_per_delta(klass):
+    # Distinct timedeltas, so that nothing is shared between instances
+    timedeltas = [timedelta(seconds=n) for n in range(NUMDATES)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    deltas = [
+        klass(months=n % 120, seconds=td.seconds) for n, td in enumerate(timedeltas)
+    ]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del deltas
+    return (after - before) / NUMDATES
+
+
+def large_rules(lib, freq):
+    """Generate 10mn dates with a rule.
+
+    Monthly dates are generated by 1000 rules of 10,000 dates, to stay in range.
+    """
+    count = NUMLARGERULEDATES if freq == "hourly" else NUMRULEDATES
+    if lib is urelativedelta:
+        make = partial(getattr(daterule, freq), rule_start, count=count)
+    else:
+        rrule_freq = getattr(dateutil.rrule, freq.upper())
+        make = partial(dateutil.rrule.rrule, rrule_freq, rule_start, count=count)
+
+    for _ in range(NUMLARGERULEDATES // count):
+        for _ in make():
+            pass
+
+
+def parallel_shifts(workers):
+    many = dates * (NUMPARALLELDATES // NUMDATES)
+    urelativedelta.parallel.shift_months_many(many, 1200, workers=workers)
+
+
+def parallel_differences(workers):
+    many = dates * (NUMPARALLELDATES // NUMDATES)
+    urelativedelta.parallel.difference_many(many, many[::-1], workers=workers)
+
+
+def threaded_shifts(threads):
+    many = dates * (NUMPARALLELDATES // NUMDATES)
+    chunks = [many[i::threads] for i in range(threads)]
+    delta = urelativedelta.relativedelta(years=100)
+
+    def run(chunk):
+        return [d + delta for d in chunk]
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(run, chunks))
+
+
+def threaded_differences(threads):
+    many = dates * (NUMPARALLELDATES // NUMDATES)
+    chunks = [many[i::threads] for i in range(threads)]
+    difference = urelativedelta.relativedelta.difference
+
+    def run(chunk):
+        return list(map(difference, chunk, chunk[::-1]))
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(run, chunks))
+
+
+def slow_cases():
+    """Rules generating 10mn dates, and the parallel and threaded cases.
+
+    The parallel and threaded cases only scale with free cpus, and threads only
+    scale on free-threaded builds of python.
+    """
+    cases = {}
+    for freq in ("hourly", "monthly"):
+        ours = partial(large_rules, urelativedelta, freq)
+        theirs = None if dateutil is None else partial(large_rules, dateutil, freq)
+        cases[f"daterule.{freq} (10mn dates)"] = (NUMLARGERULEDATES, ours, theirs)
+
+    for name, function in (
+        ("parallel shifts", parallel_shifts),
+        ("parallel differences", parallel_differences),
+    ):
+        for workers in (1, 2, 4, 8):
+            run = partial(function, workers)
+            cases[f"{name} ({workers} workers)"] = (NUMPARALLELDATES, run, None)
+
+    for name, function in (
+        ("threaded shifts", threaded_shifts),
+        ("threaded differences", threaded_differences),
+    ):
+        for threads in (1, 2, 4, 8):
+            run = partial(function, threads)
+            cases[f"{name} ({threads} threads)"] = (NUMPARALLELDATES, run, None)
+    return cases
+
+
+def metadata():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "implementation": platform.python_implementation(),
+        "python": platform.python_version(),
+        "version": sys.version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "urelativedelta": _version("urelativedelta"),
+        # Whether the date arithmetic was compiled with mypyc
+        "compiled": not urelativedelta.utils.__file__.endswith(".py"),
+        "dateutil": _version("python-dateutil"),
+    }
+
+
+def _version(package):
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def load_previous(path):
+    """The results of a previous run, warning if they aren't comparable."""
+    with open(path) as f:
+        previous = json.load(f)
+
+    old = previous["metadata"]
+    print(f"comparing with {path}: {old['implementation']} {old['python']}")
+    print(f"recorded at {old['timestamp']} on {old['platform']}\n")
+    if old["implementation"] != platform.python_implementation():
+        print("warning: the previous run used a different interpreter\n")
+    if old.get("compiled", False) != metadata()["compiled"]:
+        print("warning: the previous run used a different (compiled or pure) build\n")
+    return previous["results"]
+
+
+def run_suite(cases, repeats, previous, threshold):
+    """Time and report each case, returning the results and any regressions."""
+    header = f"{'case':<42} {'urelativedelta':>12} {'dateutil':>12} {'speedup':>8}"
+    print(header + (f" {'change':>8}" if previous else ""))
+
+    results, regressions = {}, []
+    for name, (calls, ours, theirs) in cases.items():
+        result = {"calls": calls, "urelativedelta": time_case(ours, calls, repeats)}
+        if theirs is not None:
+            result["dateutil"] = time_case(theirs, calls, repeats)
+        results[name] = result
+
+        before = previous.get(name, {}).get("urelativedelta")
+        change = None if before is None else result["urelativedelta"] / before - 1
+        if change is not None and change > threshold:
+            regressions.append(name)
+        report(name, result, change, threshold)
+
+    return results, regressions
+
+
+def report(name, result, change, threshold):
+    ours, theirs = result["urelativedelta"], result.get("dateutil")
+    line = f"{name:<42} {1e6 * ours:>10.3f}us"
+    if theirs is not None:
+        line += f" {1e6 * theirs:>10.3f}us {theirs / ours:>7.2f}x"
+    elif change is not None:
+        line += " " * 22
+    if change is not None:
+        line += f" {change:>+8.1%}"
+        if change > threshold:
+            line += "  REGRESSION"
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="a file to record the results in")
+    parser.add_argument("-c", "--compare", help="the results of a previous run")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="the slowdown flagged as a regression (default 0.1, i.e. 10%%)",
+    )
+    parser.add_argument(
+        "-r", "--repeats", type=int, default=5, help="timings taken of each case"
+    )
+    parser.add_argument(
+        "-k", "--filter", default="*", help="a glob of the cases to run"
+    )
+    parser.add_argument(
+        "--slow",
+        "--scaling",
+        action="store_true",
+        help="also run the 10mn date rules, and the parallel and threaded cases",
+    )
+    args = parser.parse_args(argv)
+
+    cases = dict(CASES)
+    if args.slow:
+        cases.update(slow_cases())
+    cases = {name: c for name, c in cases.items() if fnmatch(name, args.filter)}
+    previous = load_previous(args.compare) if args.compare else {}
+
+    results, regressions = run_suite(cases, args.repeats, previous, args.threshold)
+
+    memory = {"urelativedelta": bytes_per_delta(urelativedelta.relativedelta)}
+    if dateutil is not None:
+        memory["dateutil"] = bytes_per_delta(dateutil.relativedelta.relativedelta)
+    print("\nbytes per delta:", memory)
 
+    if args.output:
+        with open(args.output, "w") as f:
+            record = {"metadata": metadata(), "results": results, "memory": memory}
+            json.dump(record, f, indent=2)
 
-def do_difference_inits():
-    if KLASS == "urelativedelta":
-        for d1, d2 in zip(shuffled, shuffled, strict=False):
-            urelativedelta.relativedelta.difference(d1, d2)
-    if KLASS == "dateutil":
-        for d1, d2 in zip(shuffled, shuffled, strict=False):
-            dateutil.relativedelta.relativedelta(d1, d2)
+    if regressions:
+        print(f"{len(regressions)} regressions beyond {args.threshold:.0%}")
+        return 1
+    return 0
 
 
-print(f"{KLASS} combined:", timeit(do_combined, number=1000))
-print(f"{KLASS} shifts:", timeit(do_shifts, number=1000))
-print(f"{KLASS} inits:", timeit(do_inits, number=1000))
-print(f"{KLASS} differences:", timeit(do_difference_inits, number=1000))
+# Guarded, as worker processes may re-import this module
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import DeltaPlan, daterule, relativedelta, shift_months, with_day
+
+pytest.importorskip("numpy")
+accessors = pytest.importorskip("urelativedelta.accessors")
+
+_datetimes = st.lists(
+    st.datetimes(min_value=datetime(1900, 1, 1), max_value=datetime(2100, 1, 1)),
+    min_size=1,
+    max_size=10,
+)
+
+
+def _pd_series(dates):
+    pd = pytest.importorskip("pandas")
+    return pd.Series(pd.to_datetime(dates), name="dates")
+
+
+@given(_datetimes, st.integers(min_value=-50, max_value=50))
+def test_pandas_shift_months(dates, months):
+    shifted = _pd_series(dates).urd.shift_months(months)
+    assert shifted.name == "dates"
+    assert shifted.dt.to_pydatetime().tolist() == [
+        shift_months(d, months) for d in dates
+    ]
+
+
+def test_pandas_operations():
+    pd = pytest.importorskip("pandas")
+    dates = [datetime(2020, 1, 31), None, datetime(2020, 3, 31, 12)]
+    series = _pd_series(dates)
+
+    delta = relativedelta(months=1, hours=13)
+    assert (series.urd + delta).tolist()[::2] == [dates[0] + delta, dates[2] + delta]
+    assert pd.isna((series.urd + delta)[1])
+    assert (series.urd - delta).tolist()[0] == dates[0] - delta
+    assert series.urd.with_day(30).tolist()[2] == with_day(dates[2], 30)
+    assert series.urd.shift_months(pd.Series([1, 2, 3])).tolist()[2] == datetime(
+        2020, 6, 30, 12
+    )
+
+    plan = DeltaPlan(relativedelta(months=1), relativedelta(months=1))
+    assert series.urd.add(plan).tolist()[0] == datetime(2020, 3, 29)
+    with pytest.raises(TypeError, match="int"):
+        series.urd.add(1)
+
+    starts = _pd_series([datetime(2019, 12, 31), datetime(2020, 1, 1), dates[0]])
+    deltas = series.urd.difference(starts)
+    assert list(deltas.columns) == ["months", "timedelta"]
+    assert deltas["months"].tolist() == [1, 0, 2]
+    assert deltas["timedelta"][2] == timedelta(hours=12)
+
+    indices = series.urd.bucket(relativedelta(months=1), start=datetime(2020, 1, 31))
+    assert indices.tolist() == [0, -1, 2]
+
+
+def test_pandas_timezones_and_index():
+    pd = pytest.importorskip("pandas")
+    series = _pd_series([datetime(2020, 1, 31, 12)]).dt.tz_localize("Europe/London")
+    shifted = series.urd.shift_months(6)
+    assert shifted[0] == pd.Timestamp("2020-07-31 12:00", tz="Europe/London")
+
+    index = pd.DatetimeIndex(series)
+    assert isinstance(index.urd.shift_months(1), pd.DatetimeIndex)
+    assert index.urd.shift_months(1)[0] == pd.Timestamp(
+        "2020-02-29 12:00", tz="Europe/London"
+    )
+
+    with pytest.raises(AttributeError, match="datetime"):
+        pd.Series([1, 2]).urd  # noqa: B018
+
+
+def test_polars_expressions():
+    pl = pytest.importorskip("polars")
+    df = pl.DataFrame(
+        {
+            "date": [date(2020, 1, 31), None, date(2020, 3, 31)],
+            "months": [1, 2, 3],
+            "time": [datetime(2020, 1, 31, 5), None, datetime(1969, 12, 31, 12)],
+        }
+    )
+    result = df.lazy().select(
+        shifted=pl.col("date").urd.shift_months(1),
+        by_column=pl.col("date").urd.shift_months(pl.col("months")),
+        # As for python dates, part of a day moves the date by a whole day
+        earlier=pl.col("date").urd - relativedelta(hours=12),
+        later=pl.col("time").urd + relativedelta(months=1, hours=12),
+        day=pl.col("time").urd.with_day(30),
+        bucket=pl.col("date").urd.bucket(relativedelta(months=1), date(2020, 1, 31)),
+        delta=pl.col("time").urd.difference(pl.col("date").cast(pl.Datetime("us"))),
+    )
+    assert result.collect_schema()["shifted"] == pl.Date
+    assert result.collect_schema()["later"] == pl.Datetime("us")
+
+    rows = result.collect().to_dict(as_series=False)
+    assert rows["shifted"] == [date(2020, 2, 29), None, date(2020, 4, 30)]
+    assert rows["by_column"] == [date(2020, 2, 29), None, date(2020, 6, 30)]
+    assert rows["earlier"] == [date(2020, 1, 30), None, date(2020, 3, 30)]
+    assert rows["later"][2] == datetime(1970, 2, 1)
+    assert rows["day"][0] == datetime(2020, 1, 30, 5)
+    assert rows["bucket"] == [0, -1, 2]
+    assert rows["delta"][0] == {"months": 0, "timedelta": timedelta(hours=5)}
+    assert rows["delta"][2]["months"] == -602
+
+
+def test_polars_series():
+    pl = pytest.importorskip("polars")
+    series = pl.Series("d", [datetime(2020, 1, 31, 12)]).dt.replace_time_zone(
+        "Europe/London"
+    )
+    shifted = series.urd.shift_months(6)
+    assert shifted.dtype == series.dtype
+    assert shifted.dt.replace_time_zone(None).to_list() == [datetime(2020, 7, 31, 12)]
+
+    rule = daterule.monthly(date(2020, 1, 31), count=3)
+    assert pl.Series(list(rule)).urd.with_day(31).to_list() == list(rule)
+
+
+def test_differences_keep_nanoseconds():
+    pd = pytest.importorskip("pandas")
+    pl = pytest.importorskip("polars")
+    ends = ["2020-03-31 00:00:00.000000001", "2020-02-29 23:59:59.999999999"]
+    starts = ["2020-01-31 00:00:00.000000002", "2020-01-31 00:00:00.000000000"]
+
+    end = pd.Series(pd.to_datetime(ends)).astype("M8[ns]")
+    start = pd.Series(pd.to_datetime(starts)).astype("M8[ns]")
+    deltas = end.urd.difference(start)
+    assert deltas["timedelta"].dtype == "m8[ns]"
+    assert (start.urd.shift_months(deltas["months"]) + deltas["timedelta"]).equals(end)
+
+    df = pl.from_pandas(pd.DataFrame({"end": end, "start": start}))
+    assert df.schema["end"] == pl.Datetime("ns")
+    result = df.lazy().with_columns(delta=pl.col("end").urd.difference(pl.col("start")))
+    assert result.collect_schema()["delta"].to_schema()["timedelta"] == pl.Duration(
+        "ns"
+    )
+    result = result.with_columns(
+        back=pl.col("start").urd.shift_months(pl.col("delta").struct.field("months"))
+        + pl.col("delta").struct.field("timedelta")
+    ).collect()
+    assert result["back"].equals(result["end"])
+
+    deltas = df["end"].urd.difference(df["start"])
+    assert deltas.struct.field("timedelta").dtype == pl.Duration("ns")
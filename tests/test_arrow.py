@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import DeltaPlan, relativedelta, shift_months
+
+pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+arrow = pytest.importorskip("urelativedelta.arrow")
+
+_dates = st.lists(
+    st.one_of(
+        st.none(), st.dates(min_value=date(1900, 1, 1), max_value=date(2100, 1, 1))
+    ),
+    max_size=10,
+)
+_datetimes = st.lists(
+    st.one_of(
+        st.none(),
+        st.datetimes(min_value=datetime(1900, 1, 1), max_value=datetime(2100, 1, 1)),
+    ),
+    max_size=10,
+)
+
+
+def _shift(dates, months):
+    return [None if d is None else shift_months(d, months) for d in dates]
+
+
+@given(_dates, st.integers(min_value=-50, max_value=50))
+def test_shift_months_dates(dates, months):
+    for type_ in (pa.date32(), pa.date64()):
+        shifted = arrow.shift_months(pa.array(dates, type_), months)
+        assert shifted.type == type_
+        assert shifted.to_pylist() == _shift(dates, months)
+
+
+@given(_datetimes, st.integers(min_value=-50, max_value=50))
+def test_shift_months_timestamps(dates, months):
+    for unit in ("s", "ms", "us", "ns"):
+        if unit == "s":
+            dates = [d and d.replace(microsecond=0) for d in dates]
+        shifted = arrow.shift_months(pa.array(dates, pa.timestamp(unit)), months)
+        assert shifted.type == pa.timestamp(unit)
+        assert shifted.to_pylist() == _shift(dates, months)
+
+
+def test_shift_months_slices_and_chunks():
+    dates = pa.array([date(2020, 1, 31), None, date(2020, 3, 31), date(2020, 5, 31)])
+    months = [1, 2, 3, 4]
+
+    sliced = arrow.shift_months(dates.slice(1), pa.array(months[1:]))
+    assert sliced.to_pylist() == [None, date(2020, 6, 30), date(2020, 9, 30)]
+
+    chunked = pa.chunked_array([dates.slice(0, 3), dates.slice(3)])
+    shifted = arrow.shift_months(chunked, pa.chunked_array([months[:1], months[1:]]))
+    assert isinstance(shifted, pa.ChunkedArray)
+    assert shifted.num_chunks == 2
+    assert shifted.to_pylist() == [
+        date(2020, 2, 29),
+        None,
+        date(2020, 6, 30),
+        date(2020, 9, 30),
+    ]
+
+    with_nulls = pa.array([None, 2, None, 4])
+    shifted = arrow.shift_months(chunked, pa.chunked_array([with_nulls]))
+    assert shifted.to_pylist() == [None, None, None, date(2020, 9, 30)]
+    assert shifted.null_count == 3
+    shifted = arrow.shift_months(dates.slice(2), with_nulls.slice(2))
+    assert shifted.to_pylist() == [None, date(2020, 9, 30)]
+
+    empty = arrow.shift_months(pa.chunked_array([], pa.date32()), 1)
+    assert empty.type == pa.date32()
+    assert len(empty) == 0
+
+
+def test_values_read_in_place():
+    dates = pa.array([datetime(2020, 1, 31), None], pa.timestamp("us")).slice(1)
+    values = arrow._read(dates)
+    address = values.__array_interface__["data"][0]
+    assert address == dates.buffers()[1].address + 8 * dates.offset
+
+
+def test_add():
+    dates = [date(2020, 1, 31), None, date(2020, 3, 31)]
+    array = pa.array(dates, pa.date32())
+    for delta in (
+        relativedelta(months=1),
+        relativedelta(months=1, hours=-1),
+        timedelta(days=3),
+        DeltaPlan(relativedelta(months=1), relativedelta(months=1)),
+    ):
+        expected = [None if d is None else d + delta for d in dates]
+        assert arrow.add(array, delta).to_pylist() == expected
+
+    with pytest.raises(TypeError, match="unsupported delta type"):
+        arrow.add(array, 1)
+    with pytest.raises(TypeError, match="expected date32, date64 or timestamp"):
+        arrow.add(pa.array([1, 2]), relativedelta(months=1))
+
+
+def test_add_timezone_aware():
+    zone = timezone(timedelta(hours=5))
+    dates = [datetime(2020, 1, 31, 23, tzinfo=zone), None]
+    array = pa.array(dates, pa.timestamp("ns", "+05:00"))
+    delta = relativedelta(months=1, hours=2)
+
+    result = arrow.add(array, delta)
+    assert result.type == array.type
+    assert result.to_pylist() == [dates[0] + delta, None]
+
+
+@given(_datetimes, _datetimes)
+def test_difference(d1, d2):
+    d1, d2 = d1[: len(d2)], d2[: len(d1)]
+    result = arrow.difference(
+        pa.array(d1, pa.timestamp("us")), pa.array(d2, pa.timestamp("us"))
+    )
+    assert result.type == pa.struct(
+        [("months", pa.int64()), ("timedelta", pa.duration("us"))]
+    )
+    expected = []
+    for a, b in zip(d1, d2):
+        if a is None or b is None:
+            expected.append(None)
+        else:
+            delta = relativedelta.difference(a, b)
+            expected.append(
+                {"months": delta.total_months, "timedelta": delta.timedelta}
+            )
+    assert result.to_pylist() == expected
+
+
+def test_difference_chunked_dates():
+    d1 = pa.chunked_array([[date(2020, 3, 31)], [None, date(2020, 2, 29)]])
+    d2 = pa.chunked_array([[date(2020, 1, 31), date(2020, 1, 1), date(2020, 1, 31)]])
+    assert arrow.difference(d1, d2).to_pylist() == [
+        {"months": 2, "timedelta": timedelta(0)},
+        None,
+        {"months": 1, "timedelta": timedelta(0)},
+    ]
+
+    with pytest.raises(ValueError, match="same length"):
+        arrow.difference(pa.array([date(2020, 1, 1)]), pa.array([], pa.date32()))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import BusinessCalendar, daterule, relativedelta
+
+_START = date(2019, 12, 1)
+_END = date(2021, 1, 31)
+_HOLIDAYS = [date(2019, 12, 25), date(2020, 1, 1), date(2020, 4, 10), date(2020, 8, 31)]
+_CALENDAR = BusinessCalendar(_START, _END, _HOLIDAYS)
+
+_dates = st.dates(min_value=date(2020, 1, 1), max_value=date(2020, 12, 31))
+_conventions = st.sampled_from(
+    ["following", "modified_following", "preceding", "modified_preceding"]
+)
+
+
+def _is_business_day(d: date) -> bool:
+    return d.weekday() < 5 and d not in _HOLIDAYS
+
+
+def _roll_by_hand(d: date, convention: str) -> date:
+    step = timedelta(1 if convention.endswith("following") else -1)
+    rolled = d
+    while not _is_business_day(rolled):
+        rolled += step
+    if convention.startswith("modified") and rolled.month != d.month:
+        rolled = _roll_by_hand(d, "preceding" if step.days > 0 else "following")
+    return rolled
+
+
+@given(_dates, _dates)
+def test_business_days_by_hand(d1, d2):
+    assert _CALENDAR.is_business_day(d1) == _is_business_day(d1)
+
+    expected = sum(map(_is_business_day, daterule.daily(min(d1, d2), max(d1, d2))))
+    assert _CALENDAR.business_days_between(d1, d2) == (
+        expected if d2 >= d1 else -expected
+    )
+
+
+@given(_dates, _conventions)
+def test_roll_by_hand(d, convention):
+    assert _CALENDAR.roll(d, convention) == _roll_by_hand(d, convention)
+
+    moment = datetime.combine(d, datetime.min.time()) + timedelta(hours=13)
+    assert _CALENDAR.roll(moment, convention) == moment + (
+        _roll_by_hand(d, convention) - d
+    )
+
+
+def test_calendar_special_cases():
+    assert _CALENDAR.roll(date(2020, 5, 30), "modified_following") == date(2020, 5, 29)
+    assert _CALENDAR.roll(date(2020, 8, 1), "modified_preceding") == date(2020, 8, 3)
+    every_day = daterule.daily(_START, _END + timedelta(1))
+    assert _CALENDAR.business_days_between(_START, _END + timedelta(1)) == sum(
+        map(_is_business_day, every_day)
+    )
+
+    with pytest.raises(ValueError, match="outside"):
+        _CALENDAR.roll(date(2021, 2, 1))
+    with pytest.raises(ValueError, match="convention"):
+        _CALENDAR.roll(date(2020, 1, 2), "nearest")
+    with pytest.raises(ValueError, match="no business day"):
+        _CALENDAR.roll(date(2021, 1, 31))
+    with pytest.raises(ValueError, match="before"):
+        BusinessCalendar(_END, _START)
+
+    middle_east = BusinessCalendar(_START, _END, weekend=[4, 5])
+    assert middle_east.roll(date(2020, 1, 3)) == date(2020, 1, 5)
+
+
+def test_rolling_relativedeltas_and_rules():
+    delta = relativedelta(months=1)
+    assert delta.apply(date(2020, 3, 10)) == date(2020, 4, 10)
+    assert delta.apply(date(2020, 3, 10), _CALENDAR) == date(2020, 4, 13)
+    assert delta.apply(date(2020, 3, 10), _CALENDAR, "preceding") == date(2020, 4, 9)
+
+    rule = daterule.monthly(
+        date(2020, 1, 31), count=12, calendar=_CALENDAR, convention="modified_following"
+    )
+    expected = [
+        _roll_by_hand(d, "modified_following")
+        for d in daterule.monthly(date(2020, 1, 31), count=12)
+    ]
+    assert list(rule) == expected
+    assert [rule[i] for i in range(12)] == expected
+    assert rule.index(date(2020, 5, 29)) == 4
+
+    # The end applies to the rolled dates, and Oct 31st rolls to Nov 2nd
+    rule = daterule.monthly(date(2020, 1, 31), date(2020, 11, 1), calendar=_CALENDAR)
+    assert len(rule) == len(list(rule)) == 9
+
+
+def test_rolling_sub_day_rules():
+    # Sat 11:00 rolls to Mon 11:00, but the later Sun 09:00 rolls to Mon 09:00, so
+    # the rolled dates aren't monotonic and can't be searched
+    def make_rule():
+        return daterule.iterator(
+            timedelta(hours=3),
+            datetime(2020, 1, 14, 13),
+            datetime(2020, 1, 20, 17),
+            calendar=_CALENDAR,
+        )
+
+    expected = list(make_rule())
+    assert len(expected) == 34
+    assert len(make_rule()) == 34
+
+    rule = make_rule()
+    len(rule)
+    assert list(rule) == expected
+    for value in (datetime(2020, 1, 20, 10), datetime(2020, 1, 20, 16)):
+        assert make_rule().index(value) == expected.index(value)
+        assert value in make_rule()
+    assert datetime(2020, 1, 18, 10) not in make_rule()
+
+    with pytest.raises(ValueError, match="increasing"):
+        daterule.RuleSet(make_rule())
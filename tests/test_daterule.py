@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from datetime import date as pydate, datetime, timedelta
+import copy
+import itertools
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as pydate, datetime, timedelta, timezone
 
-from urelativedelta import daterule, relativedelta
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import RuleSet, daterule, relativedelta, with_day
 
 
 def test_date_rule_with_date():
@@ -142,3 +149,438 @@ def test_long_running_rules():
                 assert shifted.day == 31
             elif shifted.month == 4:
                 assert shifted.day == 30
+
+
+def test_rule_sequence():
+    start = pydate(2020, 1, 31)
+    rule = daterule.monthly(start, end=pydate(2021, 1, 1))
+    dates = list(rule)
+
+    assert len(rule) == len(dates) == 12
+    assert rule[0] == start
+    assert rule[1] == pydate(2020, 2, 29)
+    assert rule[-1] == pydate(2020, 12, 31)
+    assert list(reversed(rule)) == dates[::-1]
+    assert list(rule[2:9:3]) == dates[2:9:3]
+    assert list(rule[::-2]) == dates[::-2]
+    assert list(rule[10:2:-3][1:]) == dates[10:2:-3][1:]
+    assert len(rule[5:]) == 7
+
+    with pytest.raises(IndexError):
+        rule[12]
+    with pytest.raises(IndexError):
+        rule[-13]
+
+    # Iterating doesn't consume the rule
+    assert list(rule) == dates
+
+
+def test_rule_index():
+    start = pydate(2020, 1, 31)
+    rule = daterule.monthly(start, count=120)
+
+    assert rule.index(pydate(2020, 2, 29)) == 1
+    assert rule.index(pydate(2029, 12, 31)) == 119
+    assert pydate(2020, 4, 30) in rule
+    assert pydate(2020, 4, 29) not in rule
+    assert pydate(2030, 1, 31) not in rule
+    assert datetime(2020, 4, 30) not in rule
+
+    with pytest.raises(ValueError, match="not in DateRule"):
+        rule.index(pydate(2019, 12, 31))
+
+    backwards = daterule.iterator(
+        relativedelta(months=-1), start, end=pydate(2010, 1, 1)
+    )
+    assert backwards.index(pydate(2019, 11, 30)) == 2
+    assert len(backwards) == 121
+    assert backwards[2:].index(pydate(2019, 11, 30)) == 0
+    assert backwards[::-1].index(pydate(2019, 11, 30)) == 118
+
+
+def test_infinite_rule():
+    start = pydate(2020, 1, 31)
+    rule = daterule.monthly(start)
+
+    assert rule
+    assert rule[1000] == start + relativedelta(months=1000)
+    assert rule.index(pydate(2120, 1, 31)) == 1200
+    assert pydate(2120, 1, 30) not in rule
+    assert list(rule[12:48:12]) == [
+        pydate(2021, 1, 31),
+        pydate(2022, 1, 31),
+        pydate(2023, 1, 31),
+    ]
+    assert rule[12::12][2] == pydate(2023, 1, 31)
+
+    with pytest.raises(TypeError, match="len"):
+        len(rule)
+    with pytest.raises(TypeError, match="reversed"):
+        reversed(rule)
+    with pytest.raises(IndexError):
+        rule[-1]
+    with pytest.raises(ValueError, match="infinite"):
+        rule[::-1]
+
+    # A rule moving away from its end never finishes
+    away = daterule.iterator(relativedelta(months=-1), start, end=pydate(2021, 1, 1))
+    assert away[100] == start - relativedelta(months=100)
+    with pytest.raises(TypeError, match="len"):
+        len(away)
+
+
+def test_rule_next():
+    rule = daterule.daily(pydate(2020, 1, 1), count=2)
+    assert next(rule) == pydate(2020, 1, 1)
+    assert next(rule) == pydate(2020, 1, 2)
+    with pytest.raises(StopIteration):
+        next(rule)
+
+
+def test_rule_iter_after_next():
+    rule = daterule.daily(pydate(2020, 1, 1), count=4)
+    assert next(rule) == pydate(2020, 1, 1)
+    assert list(rule) == [pydate(2020, 1, d) for d in range(2, 5)]
+    assert list(rule) == []
+    assert len(rule) == 4
+    assert rule[0] == pydate(2020, 1, 1)
+    assert list(rule[:]) == [pydate(2020, 1, d) for d in range(1, 5)]
+
+
+@pytest.mark.parametrize(
+    "name", ["freq", "start", "end", "count", "rolling_day", "calendar", "convention"]
+)
+def test_rule_read_only(name):
+    rule = daterule.daily(pydate(2020, 1, 1), count=5)
+    assert len(rule) == 5
+    with pytest.raises(AttributeError):
+        setattr(rule, name, 10)
+    assert len(rule) == 5
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        daterule.monthly(pydate(2020, 1, 31), count=12, rolling_day=31),
+        daterule.daily(datetime(2020, 1, 1, 3), datetime(2020, 3, 1))[5::7],
+        daterule.monthly(datetime(2020, 1, 31, tzinfo=timezone.utc))[:10],
+        daterule.nth_weekday(pydate(2020, 1, 1), 4, -1, months=3, count=8),
+        daterule.nth_weekday(pydate(2020, 1, 1), 2, 3, count=8),
+        daterule.last_business_day(pydate(2020, 1, 1), count=8),
+    ],
+)
+def test_rule_pickle_and_deepcopy(rule):
+    next(rule)
+    len(rule)
+    for copied in (pickle.loads(pickle.dumps(rule)), copy.deepcopy(rule)):
+        assert type(copied) is type(rule)
+        assert copied._key() == rule._key()
+        assert list(copied) == list(rule[:])
+        assert next(copied) == rule[0]
+    assert next(rule) == rule[1]
+
+
+_freqs = st.builds(
+    relativedelta,
+    months=st.integers(min_value=-13, max_value=13),
+    days=st.integers(min_value=-40, max_value=40),
+    hours=st.integers(min_value=-30, max_value=30),
+)
+_starts = st.datetimes(min_value=datetime(1900, 1, 1), max_value=datetime(2100, 1, 1))
+
+
+@given(
+    _freqs,
+    _starts,
+    _starts,
+    st.one_of(st.none(), st.integers(min_value=0, max_value=50)),
+    st.one_of(st.none(), st.integers(min_value=1, max_value=31)),
+)
+def test_rule_sequence_matches_iteration(freq, start, end, count, rolling_day):
+    if count is None and freq.total_months == 0 and not freq.timedelta:
+        count = 10  # a zero frequency would never reach the end
+
+    rule = daterule.iterator(freq, start, end, count, rolling_day)
+    dates = list(
+        itertools.islice(daterule.iterator(freq, start, end, count, rolling_day), 200)
+    )
+    if len(dates) == 200:
+        return  # too long (or infinite) to compare
+
+    assert len(rule) == len(dates)
+    assert [rule[i] for i in range(len(dates))] == dates
+    for current in dates:
+        assert rule.index(current) == dates.index(current)
+
+
+@pytest.mark.parametrize(
+    "freq",
+    [
+        relativedelta(months=1),
+        relativedelta(months=-5),
+        relativedelta(years=1),
+        relativedelta(hours=7),
+        relativedelta(days=-3),
+        timedelta(hours=12),
+    ],
+)
+@pytest.mark.parametrize("start", [pydate(2020, 1, 31), datetime(2019, 8, 30, 12)])
+@pytest.mark.parametrize("rolling_day", [None, 1, 29, 31])
+def test_rule_stepping_matches_closed_form(freq, start, rolling_day):
+    def closed_form(n):
+        current = start + freq * n
+        return current if rolling_day is None else with_day(current, rolling_day)
+
+    rule = daterule.iterator(freq, start, count=100, rolling_day=rolling_day)
+    assert list(rule) == [closed_form(n) for n in range(100)]
+    assert list(rule[3::7]) == [closed_form(n) for n in range(3, 100, 7)]
+    assert list(rule[::-3]) == [closed_form(n) for n in range(99, -1, -3)]
+
+
+def test_rule_set_operations():
+    month_ends = daterule.monthly(pydate(2020, 1, 31))
+    quarter_ends = daterule.iterator(relativedelta(months=3), pydate(2020, 3, 31))
+    fortnights = daterule.iterator(timedelta(days=14), pydate(2020, 1, 3))
+
+    union = RuleSet(quarter_ends, fortnights)
+    assert list(itertools.islice(union, 5)) == [
+        pydate(2020, 1, 3),
+        pydate(2020, 1, 17),
+        pydate(2020, 1, 31),
+        pydate(2020, 2, 14),
+        pydate(2020, 2, 28),
+    ]
+    assert list(itertools.islice(union, 1)) == [pydate(2020, 1, 3)]
+
+    both = RuleSet(month_ends).intersection(quarter_ends)
+    assert list(itertools.islice(both, 3)) == [
+        pydate(2020, 3, 31),
+        pydate(2020, 6, 30),
+        pydate(2020, 9, 30),
+    ]
+
+    others = RuleSet(month_ends).difference(quarter_ends).exclude(pydate(2020, 2, 29))
+    assert list(itertools.islice(others, 3)) == [
+        pydate(2020, 1, 31),
+        pydate(2020, 4, 30),
+        pydate(2020, 5, 31),
+    ]
+
+    assert list(RuleSet()) == []
+    assert list(RuleSet().intersection()) == []
+    with pytest.raises(ValueError, match="increasing"):
+        RuleSet(daterule.iterator(relativedelta(months=-1), pydate(2020, 1, 31)))
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.integers(min_value=1, max_value=40),
+            st.dates(min_value=pydate(2000, 1, 1), max_value=pydate(2001, 1, 1)),
+        ),
+        min_size=1,
+        max_size=4,
+    ),
+    st.lists(st.dates(min_value=pydate(2000, 1, 1), max_value=pydate(2002, 1, 1))),
+)
+def test_rule_set_matches_sets(rule_args, exdates):
+    end = pydate(2002, 1, 1)
+    rules = [
+        daterule.iterator(timedelta(days), start, end) for days, start in rule_args
+    ]
+    sets = [set(rule) for rule in rules]
+
+    union = RuleSet(*rules).exclude(*exdates)
+    assert list(union) == sorted(set.union(*sets) - set(exdates))
+
+    intersection = RuleSet(rules[0]).intersection(*rules[1:])
+    assert list(intersection) == sorted(set.intersection(*sets))
+
+    difference = RuleSet(rules[0]).difference(*rules[1:])
+    assert list(difference) == sorted(sets[0].difference(*sets[1:]))
+
+
+def _anchored_by_hand(start, months, pick, count):
+    dates, year, month = [], start.year, start.month
+    while len(dates) < count:
+        candidates = [
+            d
+            for d in daterule.daily(pydate(year, month, 1))[:31]
+            if d.month == month and pick(d)
+        ]
+        dates.append(candidates)
+        year, month = divmod(12 * year + month - 1 + months, 12)
+        month += 1
+    return dates
+
+
+@given(
+    st.dates(min_value=pydate(1900, 1, 1), max_value=pydate(2100, 1, 1)),
+    st.integers(min_value=0, max_value=6),
+    st.sampled_from([1, 2, 3, 4, -1, -2, -3, -4]),
+    st.sampled_from([1, 3, 12, -1, -6]),
+)
+def test_nth_weekday_by_hand(start, weekday, nth, months):
+    rule = daterule.nth_weekday(start, weekday, nth, count=6, months=months)
+
+    months_of_weekdays = _anchored_by_hand(
+        start, months, lambda d: d.weekday() == weekday, 7
+    )
+    expected = [
+        weekdays[nth - 1 if nth > 0 else nth] for weekdays in months_of_weekdays
+    ]
+    if (expected[0] < start) if months > 0 else (expected[0] > start):
+        expected = expected[1:]
+
+    assert list(rule) == expected[:6]
+    assert [rule[i] for i in range(5, -1, -1)] == expected[5::-1]
+    assert rule.index(expected[3]) == 3
+
+
+def test_anchored_rules():
+    rule = daterule.last_business_day(datetime(2020, 1, 31, 12), months=3)
+    assert list(rule[:4]) == [
+        datetime(2020, 1, 31, 12),
+        datetime(2020, 4, 30, 12),
+        datetime(2020, 7, 31, 12),
+        datetime(2020, 10, 30, 12),
+    ]
+    assert rule[40] == datetime(2030, 1, 31, 12)
+
+    rule = daterule.nth_weekday(pydate(2020, 1, 16), 2, 3, end=pydate(2021, 1, 1))
+    assert len(rule) == 11
+    assert rule[0] == pydate(2020, 2, 19)
+    assert rule[-1] == pydate(2020, 12, 16)
+    assert pydate(2020, 3, 18) in rule
+    assert pydate(2020, 3, 17) not in rule
+
+    for d in daterule.last_business_day(pydate(1999, 1, 1), count=300):
+        later = [d + timedelta(days) for days in range(1, 4)]
+        assert d.weekday() < 5
+        assert all(e.month != d.month or e.weekday() >= 5 for e in later)
+
+    with pytest.raises(ValueError, match="nth"):
+        daterule.nth_weekday(pydate(2020, 1, 1), 0, 5)
+    with pytest.raises(ValueError, match="weekday"):
+        daterule.nth_weekday(pydate(2020, 1, 1), 7, 1)
+    with pytest.raises(ValueError, match="months"):
+        daterule.last_business_day(pydate(2020, 1, 1), months=0)
+
+
+def test_anchored_rule_repr():
+    rule = daterule.last_business_day(pydate(2020, 1, 1), count=8)
+    assert repr(rule) == (
+        "last_business_day(months=1, start=datetime.date(2020, 1, 1), "
+        "end=None, count=8)"
+    )
+    rule = daterule.nth_weekday(pydate(2020, 1, 1), 4, -1, months=3, count=8)
+    assert repr(rule) == (
+        "nth_weekday(weekday=4, nth=-1, months=3, "
+        "start=datetime.date(2020, 1, 1), end=None, count=8)"
+    )
+
+
+def test_schedule_cache():
+    cache = daterule.ScheduleCache()
+    rules = [
+        daterule.monthly(pydate(2020, 1, 31), count=24),
+        daterule.monthly(datetime(2020, 1, 31, 12), count=24),
+        daterule.daily(pydate(2020, 1, 1), pydate(2020, 3, 1))[::7],
+        daterule.nth_weekday(pydate(2020, 1, 1), 2, 3, count=12),
+        daterule.nth_weekday(pydate(2020, 1, 1), 3, 3, count=12),
+    ]
+    for rule in rules:
+        assert cache.materialise(rule) == list(rule)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 5, 5)
+
+    for rule in rules:
+        assert cache.materialise(copy.copy(rule)) == list(rule)
+    assert (cache.hits, cache.misses, len(cache)) == (5, 5, 5)
+
+    hourly = daterule.hourly(datetime(2020, 1, 1), count=5)
+    assert cache.materialise(hourly) is cache.materialise(copy.copy(hourly))
+    assert (cache.hits, cache.misses, len(cache)) == (6, 6, 6)
+
+    with pytest.raises(ValueError, match="infinite"):
+        cache.materialise(daterule.monthly(pydate(2020, 1, 31)))
+
+    cache.clear()
+    assert (cache.hits, cache.misses, cache.nbytes, len(cache)) == (0, 0, 0, 0)
+
+
+def test_schedule_cache_timezones():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        london = zoneinfo.ZoneInfo("Europe/London")
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip("no timezone data")
+
+    cache = daterule.ScheduleCache()
+    for tz in (timezone.utc, london, timezone(timedelta(hours=1))):
+        start = datetime(2020, 3, 1, tzinfo=timezone.utc).astimezone(tz)
+        rule = daterule.monthly(start, count=6)
+        schedule = cache.materialise(rule)
+        assert [d.isoformat() for d in schedule] == [d.isoformat() for d in rule]
+        assert schedule[0].tzinfo is tz
+        assert cache.materialise(rule) is schedule
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_schedule_cache_eviction():
+    rules = [
+        daterule.monthly(pydate(2020, month, 1), count=100) for month in range(1, 13)
+    ]
+    cache = daterule.ScheduleCache()
+    cache.materialise(rules[0])
+    cache = daterule.ScheduleCache(max_bytes=3 * cache.nbytes)
+
+    for rule in rules[:3]:
+        cache.materialise(rule)
+    cache.materialise(rules[0])  # now the most recently used
+    cache.materialise(rules[3])
+    assert (len(cache), cache.evictions) == (3, 1)
+
+    cache.materialise(rules[0])
+    cache.materialise(rules[1])
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 5, 2)
+    assert cache.nbytes <= cache.max_bytes
+
+    tiny = daterule.ScheduleCache(max_bytes=10)
+    assert tiny.materialise(rules[0]) == list(rules[0])
+    assert (len(tiny), tiny.nbytes) == (0, 0)
+
+
+def test_schedule_cache_threads():
+    rules = [
+        daterule.monthly(pydate(2020, month, 1), count=100) for month in range(1, 13)
+    ]
+    size = daterule.ScheduleCache()
+    size.materialise(rules[0])
+    cache = daterule.ScheduleCache(max_bytes=3 * size.nbytes)
+
+    def work(offset):
+        for i in range(200):
+            rule = rules[(offset + i) % len(rules)]
+            assert cache.materialise(rule) == list(rule)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(8)))
+
+    assert cache.hits + cache.misses == 8 * 200
+    assert len(cache) <= 3
+    assert cache.nbytes == len(cache) * size.nbytes
+
+
+def test_next_threads():
+    rule = daterule.daily(pydate(2020, 1, 1), count=8000)
+
+    def work(_):
+        return [next(rule) for _ in range(1000)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        seen = [d for result in executor.map(work, range(8)) for d in result]
+
+    assert sorted(seen) == list(rule[:])
+    assert list(rule) == []
+    with pytest.raises(StopIteration):
+        next(rule)
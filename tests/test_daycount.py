@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import daterule, daycount, is_leap_year
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "convention", "expected"),
+    [
+        (date(2020, 1, 31), date(2020, 3, 1), "ACT/360", 30 / 360),
+        (date(2020, 1, 31), date(2020, 3, 1), "ACT/365F", 30 / 365),
+        (date(2020, 1, 31), date(2020, 7, 31), "30/360", 0.5),
+        (date(2020, 1, 30), date(2020, 7, 31), "30/360", 0.5),
+        (date(2020, 1, 29), date(2020, 7, 31), "30/360", 182 / 360),
+        (date(2020, 1, 29), date(2020, 7, 31), "30E/360", 181 / 360),
+        (date(2020, 2, 29), date(2020, 3, 31), "30E/360", 31 / 360),
+        (date(2019, 12, 1), date(2020, 12, 1), "ACT/ACT", 31 / 365 + 335 / 366),
+        (date(2020, 3, 1), date(2020, 9, 1), "ACT/ACT", 184 / 366),
+        (date(2019, 7, 1), date(2022, 7, 1), "ACT/ACT", 184 / 365 + 2 + 181 / 365),
+    ],
+)
+def test_year_fraction(start, end, convention, expected):
+    assert daycount.year_fraction(start, end, convention) == pytest.approx(expected)
+    if convention.startswith("ACT"):
+        # The 30/360 conventions adjust the 31st differently at the start and end
+        assert daycount.year_fraction(end, start, convention) == pytest.approx(
+            -expected
+        )
+
+
+@given(
+    st.dates(min_value=date(1900, 1, 1), max_value=date(2100, 1, 1)),
+    st.dates(min_value=date(1900, 1, 1), max_value=date(2100, 1, 1)),
+)
+def test_act_act_by_hand(start, end):
+    first, last = min(start, end), max(start, end)
+    expected = sum(
+        1 / (366 if is_leap_year(d.year) else 365) for d in daterule.daily(first, last)
+    )
+    if end < start:
+        expected = -expected
+
+    fraction = daycount.year_fraction(start, end, "ACT/ACT")
+    assert fraction == pytest.approx(expected, abs=1e-9)
+
+
+def test_year_fraction_special_cases():
+    start, end = datetime(2020, 1, 1, 23), date(2020, 1, 2)
+    assert daycount.year_fraction(start, end, "ACT/360") == 1 / 360
+    assert daycount.year_fraction(start, end, "ACT/ACT") == 1 / 366
+
+    with pytest.raises(ValueError, match="convention"):
+        daycount.year_fraction(start, end, "BUS/252")
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import urelativedelta
+from urelativedelta import (
+    RelativeDelta,
+    daterule,
+    instrument,
+    relativedelta,
+    shift_years,
+    utils,
+)
+
+
+def test_counts():
+    with instrument.enabled() as stats:
+        for months in range(1, 13):
+            date(2020, 1, 31) + relativedelta(months=months)
+        date(2020, 1, 1) + relativedelta(days=1)
+        relativedelta.difference(date(2020, 3, 1), date(2020, 1, 31))
+        relativedelta.difference(date(2020, 1, 31), date(2020, 3, 1))
+        relativedelta.difference(date(2020, 3, 1), date(2020, 1, 1))
+        list(daterule.monthly(date(2020, 1, 1), count=12, rolling_day=31))
+        shift_years(date(2020, 2, 29), 1)
+
+    paths = stats.as_dict()
+    assert paths["RelativeDelta.__radd__"]["calls"] == 13
+    assert paths["RelativeDelta.__radd__"]["months"] == 12
+    assert paths["RelativeDelta.__radd__"]["clamped"] == 5
+    assert paths["RelativeDelta.__radd__"]["timedelta"] == 1
+    assert paths["RelativeDelta.difference"]["calls"] == 3
+    assert paths["RelativeDelta.difference"]["corrected down"] == 1
+    assert paths["RelativeDelta.difference"]["corrected up"] == 1
+    assert paths["daterule.iterator"]["calls"] == 1
+    assert paths["daterule.iterator"]["rolling_day"] == 1
+    assert paths["daterule.dates"]["calls"] == 12
+    assert paths["daterule.dates"]["clamped"] == 5
+    if utils.__file__.endswith(".py"):
+        # Not counted when the compiled `shift_years` calls `shift_months` directly
+        assert paths["shift_months"]["calls"] == 1
+        assert paths["shift_months"]["clamped"] == 1
+    assert all(p["seconds"] > 0 for p in paths.values() if p["calls"])
+
+    summary = stats.summary()
+    assert summary.splitlines()[0].split() == ["path", "calls", "seconds", "us/call"]
+    assert "  corrected down" in summary
+
+
+def test_clamps_ignore_the_timedelta():
+    with instrument.enabled() as stats:
+        date(2020, 1, 15) + relativedelta(months=1, hours=23)
+        datetime(2020, 1, 15, 23) + relativedelta(months=1, hours=2)
+        datetime(2020, 1, 31, 1) + relativedelta(months=1, hours=-2)
+
+    branches = stats.as_dict()["RelativeDelta.__radd__"]
+    assert branches["months"] == 3
+    assert branches["clamped"] == 1
+
+
+def test_disable_restores_functions():
+    originals = (
+        RelativeDelta.__radd__,
+        RelativeDelta.__dict__["difference"],
+        daterule.DateRule._iterate,
+        daterule.iterator,
+        utils.shift_months,
+    )
+    instrument.enable()
+    assert instrument.is_enabled()
+    assert urelativedelta.shift_months is not originals[-1]
+    assert instrument.enable() is instrument.stats
+
+    instrument.disable()
+    assert not instrument.is_enabled()
+    assert originals == (
+        RelativeDelta.__radd__,
+        RelativeDelta.__dict__["difference"],
+        daterule.DateRule._iterate,
+        daterule.iterator,
+        utils.shift_months,
+    )
+    assert urelativedelta.shift_months is utils.shift_months
+
+    # Nothing is counted once disabled
+    instrument.stats.reset()
+    date(2020, 1, 31) + relativedelta(months=1)
+    list(daterule.daily(date(2020, 1, 1), count=3))
+    assert instrument.stats.as_dict() == {}
+
+
+def test_results_unchanged():
+    start = date(2020, 1, 31)
+    rule = daterule.iterator(relativedelta(months=1, days=1), start, count=30)
+    expected = (list(rule), [start + relativedelta(months=n) for n in range(30)])
+    with instrument.enabled():
+        rule = daterule.iterator(relativedelta(months=1, days=1), start, count=30)
+        assert (list(rule), [start + relativedelta(months=n) for n in range(30)]) == (
+            expected
+        )
+        assert next(rule) == start
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from urelativedelta import BusinessCalendar, parallel, relativedelta, shift_months
+
+_DATES = [date(2000, 1, 31) + timedelta(days=37 * n) for n in range(100)]
+_DATETIMES = [datetime(2000, 1, 31, 12) + timedelta(hours=901 * n) for n in range(100)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_shift_months_many(workers):
+    for dates in (_DATES, _DATETIMES):
+        shifted = parallel.shift_months_many(dates, 13, workers=workers, chunksize=7)
+        assert shifted == [shift_months(d, 13) for d in dates]
+
+        months = range(-50, 50)
+        shifted = parallel.shift_months_many(dates, months, workers, chunksize=30)
+        assert shifted == list(map(shift_months, dates, months))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_difference_many(workers):
+    deltas = parallel.difference_many(
+        _DATETIMES, _DATETIMES[::-1], workers=workers, chunksize=9
+    )
+    assert deltas == list(map(relativedelta.difference, _DATETIMES, _DATETIMES[::-1]))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_apply_many(workers):
+    delta = relativedelta(months=1, days=2)
+    assert parallel.apply_many(delta, _DATES, workers=workers, chunksize=11) == [
+        d + delta for d in _DATES
+    ]
+
+    calendar = BusinessCalendar(date(2000, 1, 1), date(2012, 1, 1))
+    rolled = parallel.apply_many(
+        delta, _DATES, calendar, "modified_following", workers=workers, chunksize=11
+    )
+    assert rolled == [delta.apply(d, calendar, "modified_following") for d in _DATES]
+
+
+def test_many_special_cases():
+    # Datetimes which can't share a compact schedule are passed as they are
+    mixed = [datetime(2020, 1, 31), datetime(2020, 1, 31, tzinfo=timezone.utc)] * 3
+    shifted = parallel.shift_months_many(mixed, 1, workers=2, chunksize=2)
+    assert shifted == [shift_months(d, 1) for d in mixed]
+    assert [d.tzinfo for d in shifted] == [d.tzinfo for d in mixed]
+
+    assert parallel.shift_months_many([], 1, workers=2) == []
+
+    with pytest.raises(ValueError, match="one per date"):
+        parallel.shift_months_many(_DATES, [1, 2])
+    with pytest.raises(ValueError, match="same length"):
+        parallel.difference_many(_DATES, _DATES[1:])
+    with pytest.raises(ValueError, match="chunksize"):
+        parallel.apply_many(relativedelta(months=1), _DATES, chunksize=0)
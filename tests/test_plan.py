@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pickle
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import DeltaPlan, relativedelta
+
+_restricted_dates = st.dates(min_value=date(1600, 1, 1), max_value=date(3000, 1, 1))
+_restricted_datetimes = st.datetimes(
+    min_value=datetime(1600, 1, 1),
+    max_value=datetime(3000, 1, 1),
+    timezones=st.sampled_from([None, timezone.utc, timezone(timedelta(hours=-5))]),
+)
+_steps = st.lists(
+    st.one_of(
+        st.builds(relativedelta, months=st.integers(min_value=-30, max_value=30)),
+        st.builds(timedelta, hours=st.integers(min_value=-100, max_value=100)),
+        st.builds(
+            relativedelta,
+            months=st.integers(min_value=-13, max_value=13),
+            days=st.integers(min_value=-40, max_value=40),
+            minutes=st.integers(min_value=-1500, max_value=1500),
+        ),
+    ),
+    max_size=6,
+)
+
+
+def _chained(d, steps):
+    for step in steps:
+        d = d + step
+    return d
+
+
+def test_ordered_semantics():
+    plan = DeltaPlan() + relativedelta(months=1) + relativedelta(months=1)
+    assert date(2020, 1, 31) + plan == date(2020, 3, 29)
+    assert date(2020, 1, 31) + DeltaPlan(relativedelta(months=2)) == date(2020, 3, 31)
+
+    plan -= relativedelta(days=3)
+    assert date(2020, 1, 31) + plan == date(2020, 3, 26)
+    assert plan.apply(datetime(2020, 1, 31, 12)) == datetime(2020, 3, 26, 12)
+    assert plan.apply_many([date(2020, 1, 15), date(2021, 1, 31)]) == [
+        date(2020, 3, 12),
+        date(2021, 3, 25),
+    ]
+
+    # The months after a timedelta start from the shifted date
+    plan = DeltaPlan(
+        relativedelta(months=1), timedelta(days=1), relativedelta(months=1)
+    )
+    assert date(2020, 1, 31) + plan == date(2020, 4, 1)
+
+
+@given(_restricted_dates, _steps)
+def test_dates_as_chained(d, steps):
+    assert d + DeltaPlan(*steps) == _chained(d, steps)
+
+
+@given(_restricted_datetimes, _steps)
+def test_datetimes_as_chained(d, steps):
+    shifted = d + DeltaPlan(*steps)
+    assert shifted == _chained(d, steps)
+    assert shifted.tzinfo is d.tzinfo
+
+
+def test_plan_protocols():
+    steps = (relativedelta(months=1), relativedelta(days=-3))
+    plan = DeltaPlan(*steps)
+    assert plan.steps == steps
+    assert len(plan) == 2
+    assert plan == DeltaPlan(relativedelta(months=1)) + DeltaPlan(timedelta(days=-3))
+    assert hash(plan) == hash(DeltaPlan(*steps))
+    assert pickle.loads(pickle.dumps(plan)) == plan
+    assert repr(DeltaPlan(relativedelta(months=1))) == (
+        "DeltaPlan(relativedelta(months=1, timedelta=0:00:00))"
+    )
+
+    with pytest.raises(TypeError, match="int"):
+        DeltaPlan(1)  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="out of range"):
+        date(9999, 12, 1) + DeltaPlan(relativedelta(months=1))
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+import copy
+import pickle
+from datetime import date, datetime, timedelta, timezone
 
 import dateutil.relativedelta
 import pytest
@@ -34,6 +36,99 @@ def test_duration_arithmetic():
         x / 2
 
 
+def test_immutable():
+    delta = relativedelta(months=5, days=1)
+
+    with pytest.raises(AttributeError):
+        delta.total_months = 2  # type: ignore[misc]
+
+    with pytest.raises(AttributeError):
+        delta.timedelta = timedelta(0)  # type: ignore[misc]
+
+    with pytest.raises(AttributeError):
+        delta.other = 1  # type: ignore[attr-defined]
+
+    assert not hasattr(delta, "__dict__")
+
+
+def test_interned():
+    assert relativedelta() is relativedelta(months=0)
+    assert relativedelta(years=1) is relativedelta(months=12)
+    assert relativedelta(months=3) is -relativedelta(months=-3)
+    assert relativedelta(months=1) is relativedelta(months=2) // 2
+    assert relativedelta(months=5) is not relativedelta(months=5)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected", "formatted"),
+    [
+        ("P1Y2M10DT2H30M", relativedelta(months=14, days=10, minutes=150), None),
+        ("P2W", relativedelta(days=14), "P14D"),
+        ("P1W3D", relativedelta(days=10), "P10D"),
+        ("-P1Y1D", relativedelta(months=-12, days=-1), None),
+        ("+P1M", relativedelta(months=1), "P1M"),
+        ("P1M-3D", relativedelta(months=1, days=-3), None),
+        ("-P1M-3D", relativedelta(months=-1, days=3), "P-1M3D"),
+        ("P-1Y2M", relativedelta(months=-10), "-P10M"),
+        ("PT0.5S", relativedelta(microseconds=500_000), None),
+        ("PT1,25M", relativedelta(seconds=75), "PT1M15S"),
+        ("P0.5D", relativedelta(hours=12), "PT12H"),
+        ("PT1.0000009S", relativedelta(seconds=1), "PT1S"),
+        ("-PT0.1S", relativedelta(microseconds=-100_000), None),
+        ("P0D", relativedelta(), "PT0S"),
+    ],
+)
+def test_isoformat(value, expected, formatted):
+    delta = relativedelta.from_isoformat(value)
+    assert delta == expected
+    assert delta.isoformat() == (formatted or value)
+
+
+_INVALID_DURATIONS = ["", "P", "PT", "-P", "P1", "1D", "P1D2M", "PT1H1D", "P1T1H"]
+_INVALID_DURATIONS += ["P1DT", "P-D", "P1D ", "P\u00b2D", "P1.D", "P1.5Y", "P1.5M"]
+_INVALID_DURATIONS += ["PT1.5M2S", "P0.5DT1H"]
+
+
+@pytest.mark.parametrize("value", _INVALID_DURATIONS)
+def test_isoformat_invalid(value):
+    with pytest.raises(ValueError, match="invalid ISO 8601 duration"):
+        relativedelta.from_isoformat(value)
+
+
+@given(
+    st.integers(min_value=-10_000, max_value=10_000),
+    st.timedeltas(
+        min_value=timedelta(days=-(10**6)), max_value=timedelta(days=10**6)
+    ),
+)
+def test_isoformat_round_trips(months, delta):
+    rd = relativedelta(months=months, timedelta=delta)
+    assert relativedelta.from_isoformat(rd.isoformat()) == rd
+
+
+def test_isoformat_cached():
+    assert relativedelta.from_isoformat("P5M1D") is relativedelta.from_isoformat(
+        "P5M1D"
+    )
+    assert relativedelta.from_isoformat("P12M") is relativedelta(years=1)
+    assert relativedelta.from_isoformat_many(["P1M", "PT0S", "P1M"]) == [
+        relativedelta(months=1),
+        relativedelta(),
+        relativedelta(months=1),
+    ]
+
+
+def test_copy_and_pickle():
+    delta = relativedelta(months=5, days=1)
+
+    assert copy.copy(delta) is delta
+    assert copy.deepcopy(delta) is delta
+    assert pickle.loads(pickle.dumps(delta)) == delta
+
+    interned = relativedelta(months=6)
+    assert pickle.loads(pickle.dumps(interned)) is interned
+
+
 def test_date_arithmetic():
     base = date(2020, 2, 29)
 
@@ -53,6 +148,21 @@ def test_date_arithmetic():
     assert base - tricky_delta == not_leap - tricky_delta
 
 
+def test_date_arithmetic_keeps_fold():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        london = zoneinfo.ZoneInfo("Europe/London")
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip("no timezone data")
+
+    # Clocks went back at 2am on both days, so 1:30am came round twice
+    base = datetime(2019, 10, 27, 1, 30, tzinfo=london, fold=1)
+    shifted = base + relativedelta(years=5)
+    assert shifted.fold == 1
+    assert shifted.utcoffset() == timedelta(0)
+    assert shifted == base + dateutil.relativedelta.relativedelta(years=5)
+
+
 def test_differences():
     # Later day of month -> last day of month counts as 1 month shift
     d1 = date(2020, 2, 29)
@@ -127,3 +237,18 @@ def test_difference_with_nones():
     assert relativedelta.difference(date(2020, 1, 1), None) == relativedelta()
     assert relativedelta.difference(None, date(2020, 1, 1)) == relativedelta()
     assert relativedelta.difference(None, None) == relativedelta()
+
+
+_timezones = st.sampled_from(
+    [None, timezone.utc, timezone(timedelta(hours=5)), timezone(-timedelta(hours=9))]
+)
+
+
+@given(_restricted_dates, _restricted_dates, _timezones, _timezones)
+def test_difference_spans_gap_with_timezones(d1, d2, tz1, tz2):
+    if (tz1 is None) != (tz2 is None):
+        return
+
+    d1, d2 = d1.replace(tzinfo=tz1), d2.replace(tzinfo=tz2)
+    delta = relativedelta.difference(d1, d2)
+    assert d2 + delta == d1
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import pickle
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import Schedule, daterule, relativedelta
+
+_rules = [
+    daterule.monthly(date(2020, 1, 31), count=50),
+    daterule.monthly(date(2020, 1, 31), count=50, rolling_day=15)[::-3],
+    daterule.monthly(datetime(2020, 1, 31, 5, 6, 7, 8, tzinfo=timezone.utc), count=9),
+    daterule.daily(date(2020, 1, 1), date(2021, 1, 1)),
+    daterule.weekly(datetime(2020, 1, 1, 3), count=10)[3:],
+    daterule.hourly(datetime(2020, 1, 1), count=50),
+    daterule.iterator(relativedelta(months=1, days=1), date(2020, 1, 31), count=20),
+    daterule.iterator(timedelta(0), date(2020, 1, 1), count=3),
+    daterule.nth_weekday(date(2020, 1, 1), 2, -1, count=30)[5:20:2],
+    daterule.daily(date(2020, 1, 1), count=0),
+]
+
+
+@pytest.mark.parametrize("rule", _rules)
+def test_materialise(rule):
+    schedule = rule.materialise()
+    assert isinstance(schedule, Schedule)
+    assert list(schedule) == list(rule)
+    assert schedule == Schedule(rule)
+    assert schedule.is_datetime == isinstance(rule.start, datetime)
+    assert list(reversed(schedule)) == list(reversed(rule))
+    assert pickle.loads(pickle.dumps(schedule)) == schedule
+
+
+_resizable = [
+    lambda n: daterule.monthly(date(2020, 1, 31), count=n, rolling_day=31),
+    lambda n: daterule.yearly(date(2020, 2, 29), count=n, rolling_day=29),
+    lambda n: daterule.monthly(datetime(2020, 1, 31, 5, tzinfo=timezone.utc), count=n),
+    lambda n: daterule.monthly(
+        date(2020, 1, 31), date(2020, 1, 31) + n * timedelta(30)
+    ),
+    lambda n: daterule.daily(date(2020, 1, 1), count=2 * n)[::2],
+    lambda n: daterule.iterator(
+        relativedelta(months=1, days=1), date(2020, 1, 31), count=n
+    ),
+    lambda n: daterule.nth_weekday(date(2020, 1, 1), 2, -1, count=n),
+    lambda n: daterule.iterator(
+        timedelta(10), date(2020, 1, 1), count=n, rolling_day=31
+    ),
+]
+
+
+@pytest.mark.parametrize("make_rule", _resizable)
+@pytest.mark.parametrize(("before", "after"), [(10, 25), (25, 10), (10, 10), (0, 5)])
+def test_materialise_previous(make_rule, before, after):
+    previous = make_rule(before).materialise()
+    copied = pickle.loads(pickle.dumps(previous))
+
+    resized = make_rule(after).materialise(previous)
+    expected = make_rule(after).materialise()
+    assert resized == expected
+    assert resized.values.tobytes() == expected.values.tobytes()
+    assert previous == copied
+
+
+def test_materialise_previous_mismatch():
+    previous = daterule.monthly(date(2020, 1, 31), count=5).materialise()
+    for rule in (
+        daterule.monthly(date(2020, 1, 30), count=10),
+        daterule.monthly(date(2020, 1, 31), count=10, rolling_day=30),
+        daterule.monthly(datetime(2020, 1, 31), count=10),
+    ):
+        with pytest.raises(ValueError, match="not of this rule"):
+            rule.materialise(previous)
+
+
+@given(
+    st.lists(st.datetimes(timezones=st.sampled_from([None, timezone.utc]))),
+    st.integers(min_value=-5, max_value=5),
+)
+def test_schedule_round_trips(datetimes, i):
+    datetimes = [d.replace(tzinfo=datetimes[0].tzinfo) for d in datetimes]
+    dates = [d.date() for d in datetimes]
+
+    for values in (datetimes, dates):
+        schedule = Schedule(values)
+        assert list(schedule) == values
+        assert schedule == values
+        assert schedule[1:-1] == values[1:-1]
+        if -len(values) <= i < len(values):
+            assert schedule[i] == values[i]
+        else:
+            with pytest.raises(IndexError):
+                schedule[i]
+
+
+def test_schedule_special_cases():
+    schedule = daterule.monthly(date(2020, 1, 31), count=3).materialise()
+    assert schedule.values.typecode == "i"
+    assert schedule.nbytes == 12
+    assert schedule.index(date(2020, 3, 31)) == 2
+    assert date(2020, 2, 29) in schedule
+    assert repr(schedule) == (
+        "Schedule([datetime.date(2020, 1, 31), datetime.date(2020, 2, 29), "
+        "datetime.date(2020, 3, 31)])"
+    )
+
+    with pytest.raises(TypeError):
+        hash(schedule)
+    with pytest.raises(ValueError, match="infinite"):
+        daterule.monthly(date(2020, 1, 31)).materialise()
+    with pytest.raises(OverflowError):
+        daterule.daily(date(9999, 1, 1), count=1000).materialise()
+    with pytest.raises(ValueError, match="tzinfo"):
+        Schedule([datetime(2020, 1, 1), datetime(2020, 1, 1, tzinfo=timezone.utc)])
+
+
+def test_schedule_to_numpy():
+    np = pytest.importorskip("numpy")
+
+    schedule = daterule.monthly(date(2020, 1, 31), count=3).materialise()
+    ordinals = np.frombuffer(schedule.values, dtype=np.int32)
+    np.testing.assert_array_equal(ordinals, [d.toordinal() for d in schedule])
+    np.testing.assert_array_equal(
+        np.asarray(schedule),
+        np.array(["2020-01-31", "2020-02-29", "2020-03-31"], dtype="M8[D]"),
+    )
+
+    schedule = daterule.hourly(datetime(2020, 1, 1), count=3).materialise()
+    arr = np.asarray(schedule)
+    assert arr.dtype == np.dtype("M8[us]")
+    assert arr.tolist() == list(schedule)
+    assert not arr.flags.writeable
+    assert np.shares_memory(arr, np.frombuffer(schedule.values, dtype=np.int64))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+
+import pytest
+
+from urelativedelta import BusinessCalendar, daterule
+from urelativedelta.store import ScheduleStore
+
+_CALENDAR = BusinessCalendar(date(2020, 1, 1), date(2021, 1, 31), [date(2020, 5, 1)])
+_RULES = [
+    daterule.monthly(date(2020, 1, 31), count=24),
+    daterule.monthly(date(2020, 1, 31), count=12, calendar=_CALENDAR),
+    daterule.hourly(datetime(2020, 1, 1, tzinfo=timezone.utc), count=30),
+    daterule.nth_weekday(date(2020, 1, 1), 2, 3, count=12),
+    daterule.daily(date(2020, 1, 1), date(2020, 3, 1))[::7],
+    daterule.daily(date(2020, 1, 1), count=0),
+]
+
+
+def _first_dates(store: ScheduleStore) -> tuple[list[date], int]:
+    rule = daterule.monthly(date(2020, 1, 31), count=24)
+    return store.materialise(rule)[:3], store.hits
+
+
+def test_schedule_store(tmp_path):
+    store = ScheduleStore.create(tmp_path / "schedules", _RULES + _RULES[:2])
+    assert len(store) == len(_RULES)
+
+    for rule in _RULES:
+        assert rule in store
+        schedule = store.materialise(rule)
+        assert schedule == list(rule)
+        assert isinstance(schedule.values, memoryview)
+        assert schedule.values.readonly
+        assert pickle.loads(pickle.dumps(schedule)) == schedule
+    assert (store.hits, store.misses) == (len(_RULES), 0)
+
+    missing = daterule.monthly(date(2020, 1, 30), count=24)
+    assert missing not in store
+    assert store.materialise(missing) == list(missing)
+    assert store.misses == 1
+
+    reopened = pickle.loads(pickle.dumps(store))
+    assert reopened.materialise(_RULES[0]) == list(_RULES[0])
+
+
+def test_materialise_from_store(tmp_path):
+    store = ScheduleStore.create(tmp_path / "schedules", _RULES)
+    previous = store.materialise(_RULES[0])
+    for count in (36, 12):
+        rule = daterule.monthly(date(2020, 1, 31), count=count)
+        assert rule.materialise(previous) == rule.materialise()
+    assert previous == list(_RULES[0])
+
+
+def test_schedule_store_across_processes(tmp_path):
+    store = ScheduleStore.create(tmp_path / "schedules", _RULES)
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        dates, hits = pool.submit(_first_dates, store).result()
+
+    assert dates == [date(2020, 1, 31), date(2020, 2, 29), date(2020, 3, 31)]
+    assert hits == 1
+
+
+def test_schedule_store_special_cases(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(bytes(100))
+    with pytest.raises(ValueError, match="not a schedule store"):
+        ScheduleStore(path)
+
+    with pytest.raises(ValueError, match="infinite"):
+        ScheduleStore.create(path, [daterule.monthly(date(2020, 1, 31))])
+
+    store = ScheduleStore.create(path, [])
+    assert len(store) == 0
+    store.close()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 import pytest
 
@@ -11,6 +11,7 @@ from urelativedelta import (
     with_month,
     with_year,
 )
+from urelativedelta.utils import _normalise_day
 
 LEAP_YEARS_1900_TO_2020 = frozenset(
     (
@@ -118,6 +119,22 @@ def test_shift_months_datetime():
     assert shift_months(base, 2) == datetime(2020, 3, 31, 1, 2, 3)
 
 
+def test_shift_months_keeps_fold():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        london = zoneinfo.ZoneInfo("Europe/London")
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip("no timezone data")
+
+    # Clocks went back at 2am on both days, so 1:30am came round twice
+    base = datetime(2019, 10, 27, 1, 30, tzinfo=london, fold=1)
+    shifted = shift_months(base, 60)
+    assert shifted.fold == 1
+    assert shifted.utcoffset() == base.utcoffset() == timedelta(0)
+    assert shift_years(base, 5) == shifted
+    assert shift_months(base.replace(fold=0), 60).fold == 0
+
+
 @pytest.mark.parametrize(
     ("shift", "expected"),
     [
@@ -184,3 +201,25 @@ def test_with_month(month: int, expected: date):
 def test_with_year(year: int, expected: date):
     base = date(2020, 2, 29)
     assert with_year(base, year) == expected
+
+
+def test_shift_months_out_of_range():
+    with pytest.raises(ValueError, match="out of range"):
+        shift_months(date(9999, 12, 31), 1)
+
+    with pytest.raises(ValueError, match="out of range"):
+        shift_months(date(1, 1, 1), -1)
+
+    assert shift_months(date(9999, 1, 31), 11) == date(9999, 12, 31)
+    assert shift_months(date(1, 12, 31), -11) == date(1, 1, 31)
+
+
+@pytest.mark.parametrize("year", [1, 4, 100, 1600, 1900, 2000, 2023, 2024, 9999])
+def test_shift_months_every_month(year: int):
+    for month in range(1, 13):
+        for day in (1, 15, 28, 29, 30, 31):
+            base = date(2000, 1, day)
+            expected = base.replace(
+                year=year, month=month, day=_normalise_day(year, month, day)
+            )
+            assert shift_months(base, 12 * (year - 2000) + month - 1) == expected
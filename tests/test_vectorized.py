@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from hypothesis import given, strategies as st
+
+from urelativedelta import (
+    BusinessCalendar,
+    DeltaPlan,
+    daterule,
+    daycount,
+    relativedelta,
+    shift_months,
+    with_day,
+    with_month,
+    with_year,
+)
+
+np = pytest.importorskip("numpy")
+vectorized = pytest.importorskip("urelativedelta.vectorized")
+
+_restricted_dates = st.dates(min_value=date(1600, 1, 1), max_value=date(3000, 1, 1))
+_restricted_datetimes = st.datetimes(
+    min_value=datetime(1600, 1, 1), max_value=datetime(3000, 1, 1)
+)
+
+
+def _to_date(value) -> date:
+    return value.astype("datetime64[D]").item()
+
+
+@given(_restricted_dates, st.integers(min_value=-1200, max_value=1200))
+def test_shift_months_against_scalar(d, months):
+    dates = np.array([d], dtype="datetime64[D]")
+    assert _to_date(vectorized.shift_months(dates, months)[0]) == shift_months(
+        d, months
+    )
+
+
+def test_shift_months_broadcasts():
+    dates = np.array(["2020-01-31", "2020-12-31"], dtype="datetime64[D]")
+
+    shifted = vectorized.shift_months(dates, [1, 2])
+    expected = np.array(["2020-02-29", "2021-02-28"], dtype="datetime64[D]")
+    np.testing.assert_array_equal(shifted, expected)
+
+    grid = vectorized.shift_months(dates[:, None], np.arange(3))
+    assert grid.shape == (2, 3)
+    assert _to_date(grid[1, 2]) == date(2021, 2, 28)
+
+
+def test_shift_months_preserves_time_and_nat():
+    dates = np.array(["2020-01-31T01:02:03.000000004", "NaT"], dtype="datetime64[ns]")
+
+    shifted = vectorized.shift_months(dates, 1)
+    assert shifted.dtype == np.dtype("datetime64[ns]")
+    assert shifted[0] == np.datetime64("2020-02-29T01:02:03.000000004")
+    assert np.isnat(shifted[1])
+
+
+def test_shift_months_from_python_dates():
+    shifted = vectorized.shift_months([datetime(2020, 1, 31, 12)], 13)
+    assert shifted[0].item() == datetime(2021, 2, 28, 12)
+
+
+def test_shift_months_requires_integers():
+    with pytest.raises(TypeError, match="months"):
+        vectorized.shift_months(np.array(["2020-01-31"], dtype="datetime64[D]"), 1.5)
+
+
+def test_shift_years():
+    dates = np.array(["2020-02-29"], dtype="datetime64[D]")
+    shifted = vectorized.shift_years(dates, [[1], [4], [-120]])
+    assert [_to_date(d) for d in shifted.ravel()] == [
+        date(2021, 2, 28),
+        date(2024, 2, 29),
+        date(1900, 2, 28),
+    ]
+
+
+@given(_restricted_dates, st.integers(min_value=1, max_value=31))
+def test_with_day_against_scalar(d, day):
+    dates = np.array([d], dtype="datetime64[D]")
+    assert _to_date(vectorized.with_day(dates, day)[0]) == with_day(d, day)
+
+
+@given(_restricted_dates, st.integers(min_value=1, max_value=12))
+def test_with_month_against_scalar(d, month):
+    dates = np.array([d], dtype="datetime64[D]")
+    assert _to_date(vectorized.with_month(dates, month)[0]) == with_month(d, month)
+
+
+@given(_restricted_dates, st.integers(min_value=1600, max_value=3000))
+def test_with_year_against_scalar(d, year):
+    dates = np.array([d], dtype="datetime64[D]")
+    assert _to_date(vectorized.with_year(dates, year)[0]) == with_year(d, year)
+
+
+def test_with_special_cases():
+    dates = np.array(["2020-01-31"], dtype="datetime64[D]")
+
+    with pytest.raises(ValueError, match="day"):
+        vectorized.with_day(dates, 0)
+
+    with pytest.raises(ValueError, match="month"):
+        vectorized.with_month(dates, 13)
+
+
+@given(st.lists(st.tuples(_restricted_datetimes, _restricted_datetimes), min_size=1))
+def test_difference_against_scalar(pairs):
+    d1 = np.array([p[0] for p in pairs], dtype="datetime64[us]")
+    d2 = np.array([p[1] for p in pairs], dtype="datetime64[us]")
+
+    deltas = vectorized.difference(d1, d2)
+    assert deltas.tolist() == [relativedelta.difference(*p) for p in pairs]
+    np.testing.assert_array_equal(vectorized.add(d2, deltas), d1)
+
+
+def test_difference_month_ends():
+    d1 = np.array(["2020-02-29", "2020-02-28", "2020-02-29"], dtype="datetime64[D]")
+    d2 = np.array(["2020-01-31", "2020-01-31", "2020-03-31"], dtype="datetime64[D]")
+
+    months, timedelta = vectorized.difference(d1, d2)
+    np.testing.assert_array_equal(months, [1, 0, -1])
+    np.testing.assert_array_equal(timedelta, np.array([0, 28, 0], dtype="m8[D]"))
+
+
+def test_difference_with_nat():
+    d1 = np.array(["2020-02-29", "NaT"], dtype="datetime64[D]")
+    d2 = np.array(["NaT", "2020-01-31"], dtype="datetime64[D]")
+
+    months, timedelta = vectorized.difference(d1, d2)
+    np.testing.assert_array_equal(months, [0, 0])
+    assert np.isnat(timedelta).all()
+
+    d1[1] = "2020-02-29"
+    deltas = vectorized.difference(d1, d2)
+    assert deltas.tolist() == [None, relativedelta(months=1)]
+
+
+def test_difference_of_scalars():
+    deltas = vectorized.difference(np.datetime64("2020-02-29"), "2020-01-31")
+    assert deltas.total_months.shape == deltas.timedelta.shape == ()
+    assert deltas.tolist() == [relativedelta(months=1)]
+
+    deltas = vectorized.difference(np.datetime64("NaT", "D"), date(2020, 1, 31))
+    assert deltas.tolist() == [None]
+
+    deltas = vectorized.difference([["2020-03-31"], ["2020-04-30"]], "2020-02-29")
+    assert deltas.total_months.shape == (2, 1)
+    assert deltas.tolist() == [
+        relativedelta.difference(date(2020, 3, 31), date(2020, 2, 29)),
+        relativedelta.difference(date(2020, 4, 30), date(2020, 2, 29)),
+    ]
+
+
+def test_add_relativedelta():
+    dates = np.array(["2020-01-30", "2020-01-31"], dtype="datetime64[D]")
+    delta = relativedelta(months=1, days=1)
+
+    shifted = vectorized.add(dates, delta)
+    assert [d.item() for d in shifted] == [d.item() + delta for d in dates]
+
+
+@given(
+    st.lists(_restricted_dates, min_size=1, max_size=5),
+    st.integers(min_value=-13, max_value=13),
+    st.integers(min_value=-50, max_value=50),
+)
+def test_add_sub_day_to_dates(dates, months, hours):
+    delta = relativedelta(months=months, hours=hours)
+    expected = [d + delta for d in dates]
+    arr = np.array(dates, dtype="datetime64[D]")
+
+    for shifted in (
+        vectorized.add(arr, delta),
+        vectorized.add(
+            arr,
+            vectorized.RelativeDeltaArray(
+                np.array([months]), np.array([delta.timedelta], dtype="m8[us]")
+            ),
+        ),
+    ):
+        assert shifted.dtype == np.dtype("datetime64[D]")
+        assert [d.item() for d in shifted] == expected
+    shifted = vectorized.add(arr, delta.timedelta)
+    assert [d.item() for d in shifted] == [d + delta.timedelta for d in dates]
+
+
+_freqs = st.builds(
+    relativedelta,
+    months=st.integers(min_value=-13, max_value=13),
+    days=st.integers(min_value=-40, max_value=40),
+    hours=st.integers(min_value=-30, max_value=30),
+)
+
+
+@given(
+    _freqs,
+    st.lists(_restricted_datetimes, min_size=1, max_size=5),
+    st.integers(min_value=0, max_value=30),
+    st.one_of(st.none(), st.integers(min_value=1, max_value=31)),
+)
+def test_schedules_with_counts(freq, starts, count, rolling_day):
+    counts = [count // (i + 1) for i in range(len(starts))]
+    grid = vectorized.schedules(
+        freq, np.array(starts, dtype="M8[us]"), counts, rolling_day=rolling_day
+    )
+
+    for row, start, row_count in zip(grid, starts, counts):
+        expected = list(daterule.iterator(freq, start, None, row_count, rolling_day))
+        assert [d.item() for d in row if not np.isnat(d)] == expected
+
+
+@given(
+    st.sampled_from(
+        [
+            relativedelta(months=1),
+            relativedelta(months=-3),
+            relativedelta(years=1, days=3),
+            relativedelta(days=10),
+            relativedelta(hours=-30),
+        ]
+    ),
+    st.lists(st.tuples(_restricted_dates, _restricted_dates), min_size=1, max_size=5),
+    st.one_of(st.none(), st.integers(min_value=1, max_value=31)),
+)
+def test_schedules_with_ends(freq, bounds, rolling_day):
+    forwards = freq.total_months > 0 or freq.timedelta > timedelta(0)
+    bounds = [(s, e) if (e >= s) == forwards else (e, s) for s, e in bounds]
+    bounds = [(s, e) for s, e in bounds if 0 < abs((e - s).days) < 3000]
+    if not bounds:
+        return
+
+    starts = np.array([s for s, _ in bounds], dtype="M8[D]")
+    ends = np.array([e for _, e in bounds], dtype="M8[D]")
+    grid = vectorized.schedules(freq, starts, ends=ends, rolling_day=rolling_day)
+
+    for row, (start, end) in zip(grid, bounds):
+        expected = list(daterule.iterator(freq, start, end, None, rolling_day))
+        assert [d.item() for d in row if not np.isnat(d)] == expected
+
+
+def test_schedules_special_cases():
+    starts = np.array(["2020-01-31", "NaT"], dtype="M8[D]")
+    freq = relativedelta(months=1)
+
+    with pytest.raises(ValueError, match="counts or ends"):
+        vectorized.schedules(freq, starts)
+
+    with pytest.raises(ValueError, match="never reach"):
+        vectorized.schedules(freq, starts, ends=np.datetime64("2019-01-01"))
+
+    grid = vectorized.schedules(freq, starts, ends=np.datetime64("2020-03-01"))
+    assert grid.shape == (2, 2)
+    assert np.isnat(grid[1]).all()
+
+    grid = vectorized.schedules(freq, starts, counts=0)
+    assert grid.shape == (2, 0)
+
+
+def _bucket_by_hand(rule, d):
+    index = -1
+    for i, boundary in enumerate(rule):
+        if boundary > d:
+            break
+        index = i
+    return index
+
+
+@given(
+    st.sampled_from(
+        [
+            relativedelta(months=1),
+            relativedelta(months=3),
+            relativedelta(years=1),
+            relativedelta(months=1, days=2),
+            relativedelta(days=10),
+            relativedelta(hours=36),
+        ]
+    ),
+    _restricted_datetimes,
+    st.lists(_restricted_datetimes, min_size=1, max_size=20),
+    st.one_of(st.none(), st.integers(min_value=1, max_value=31)),
+)
+def test_bucket_against_daterule(freq, start, dates, rolling_day):
+    dates = [start + (d - start) / 100 for d in dates]  # keep the rules short
+    if freq.timedelta.seconds:
+        rolling_day = None  # otherwise the rule would not be increasing
+    indices, totals = vectorized.bucket(
+        np.array(dates, dtype="M8[us]"),
+        freq,
+        start,
+        rolling_day=rolling_day,
+        amounts=np.ones(len(dates)),
+    )
+
+    # The end must lie after the start, even if the dates are all before it
+    end = max(*dates, start) + timedelta(1)
+    rule = daterule.iterator(freq, start, end=end, rolling_day=rolling_day)
+    expected = [_bucket_by_hand(rule, d) for d in dates]
+    assert indices.tolist() == expected
+    assert totals.sum() == sum(1 for i in expected if i >= 0)
+    assert len(totals) == max(expected) + 1
+
+
+def test_bucket_finite_rules():
+    dates = np.array(
+        ["2019-12-31", "2020-02-28", "2020-02-29", "NaT", "2030-01-01"], dtype="M8[D]"
+    )
+
+    for freq in (relativedelta(months=1), timedelta(days=29)):
+        indices, totals = vectorized.bucket(
+            dates, freq, date(2020, 1, 31), count=2, amounts=np.arange(5.0)
+        )
+        assert indices.tolist() == [-1, 0, 1, -1, 1]
+        assert totals.tolist() == [1.0, 6.0]
+
+        # Scalars give 0-d indices
+        index = vectorized.bucket(dates[2], freq, date(2020, 1, 31), count=2)
+        assert index.shape == ()
+        assert index == 1
+        index, totals = vectorized.bucket(
+            dates[3], freq, date(2020, 1, 31), count=2, amounts=5.0
+        )
+        assert index == -1
+        assert totals.tolist() == [0.0, 0.0]
+
+    with pytest.raises(ValueError, match="increasing"):
+        vectorized.bucket(dates, relativedelta(months=-1), date(2020, 1, 31))
+
+
+_CALENDAR = BusinessCalendar(
+    date(2019, 12, 1), date(2021, 1, 31), [date(2020, 1, 1), date(2020, 8, 31)]
+)
+
+
+@given(
+    st.lists(
+        st.dates(min_value=date(2020, 1, 1), max_value=date(2020, 12, 31)), min_size=1
+    ),
+    st.sampled_from(
+        ["following", "modified_following", "preceding", "modified_preceding"]
+    ),
+)
+def test_calendar_against_scalar(dates, convention):
+    arr = np.array(dates, dtype="M8[D]")
+
+    rolled = vectorized.roll(arr, _CALENDAR, convention)
+    assert rolled.tolist() == [_CALENDAR.roll(d, convention) for d in dates]
+
+    flags = vectorized.is_business_day(arr, _CALENDAR)
+    assert flags.tolist() == [_CALENDAR.is_business_day(d) for d in dates]
+
+    between = vectorized.business_days_between(arr, arr[::-1], _CALENDAR)
+    assert between.tolist() == [
+        _CALENDAR.business_days_between(d1, d2) for d1, d2 in zip(dates, dates[::-1])
+    ]
+
+
+def test_calendar_special_cases():
+    dates = np.array(["2020-05-30T12:00", "NaT"], dtype="M8[ns]")
+
+    rolled = vectorized.roll(dates, _CALENDAR, "modified_following")
+    assert rolled[0] == np.datetime64("2020-05-29T12:00")
+    assert np.isnat(rolled[1])
+    assert vectorized.is_business_day(dates, _CALENDAR).tolist() == [False, False]
+    assert vectorized.business_days_between(dates, dates[0], _CALENDAR).tolist() == [
+        0,
+        0,
+    ]
+
+    # Scalars give 0-d results
+    day = np.datetime64("2020-05-30")
+    assert vectorized.roll(day, _CALENDAR) == vectorized.roll([day], _CALENDAR)[0]
+    assert not vectorized.is_business_day(day, _CALENDAR)
+    assert vectorized.business_days_between(day, day + 7, _CALENDAR) == 5
+    assert vectorized.business_days_between(day, dates[1], _CALENDAR) == 0
+
+    with pytest.raises(ValueError, match="outside"):
+        vectorized.roll(np.array(["2022-01-01"], dtype="M8[D]"), _CALENDAR)
+    with pytest.raises(ValueError, match="no business day"):
+        vectorized.roll(np.array(["2021-01-31"], dtype="M8[D]"), _CALENDAR)
+    with pytest.raises(ValueError, match="convention"):
+        vectorized.roll(dates, _CALENDAR, "nearest")
+
+
+@given(
+    st.lists(st.tuples(_restricted_dates, _restricted_dates), min_size=1),
+    st.sampled_from(daycount.CONVENTIONS),
+)
+def test_year_fraction_against_scalar(pairs, convention):
+    starts = np.array([p[0] for p in pairs], dtype="M8[D]")
+    ends = np.array([p[1] for p in pairs], dtype="M8[D]")
+
+    fractions = vectorized.year_fraction(starts, ends, convention)
+    expected = [daycount.year_fraction(*p, convention) for p in pairs]
+    np.testing.assert_allclose(fractions, expected, atol=1e-12)
+
+
+def test_year_fraction_special_cases():
+    schedule = vectorized.schedules(
+        relativedelta(months=6), np.array(["2020-01-31T12:00"], dtype="M8[s]"), 3
+    )[0]
+    fractions = vectorized.year_fraction(schedule[:-1], schedule[1:], "30/360")
+    np.testing.assert_array_equal(fractions, [0.5, 0.5])
+
+    starts = np.array(["2020-01-31", "NaT"], dtype="M8[D]")
+    fractions = vectorized.year_fraction(starts, np.datetime64("NaT"), "ACT/ACT")
+    assert np.isnan(fractions).all()
+
+    with pytest.raises(ValueError, match="convention"):
+        vectorized.year_fraction(starts, starts, "BUS/252")
+
+
+@given(
+    st.lists(_restricted_datetimes, min_size=1, max_size=5),
+    st.lists(_freqs, max_size=4),
+)
+def test_apply_plan(dates, steps):
+    plan = DeltaPlan(*steps)
+    shifted = vectorized.apply_plan(np.array(dates, dtype="M8[us]"), plan)
+    assert shifted.astype("M8[us]").tolist() == [d + plan for d in dates]
+
+
+def test_apply_plan_nat():
+    dates = np.array(["2020-01-31", "NaT"], dtype="datetime64[D]")
+    plan = DeltaPlan(relativedelta(months=1), relativedelta(months=1))
+    expected = np.array(["2020-03-29", "NaT"], dtype="datetime64[D]")
+    np.testing.assert_array_equal(vectorized.apply_plan(dates, plan), expected)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from . import daterule
+from . import daterule, daycount, instrument, parallel
+from .calendar import BusinessCalendar
+from .daterule import DateRule, RuleSet
+from .plan import DeltaPlan
 from .relativedelta import RelativeDelta, relativedelta
+from .schedule import Schedule
 from .utils import (
     is_leap_year,
     shift_months,
@@ -12,9 +16,17 @@ from .utils import (
 )
 
 __all__ = [
+    "BusinessCalendar",
+    "DateRule",
+    "DeltaPlan",
     "RelativeDelta",
+    "RuleSet",
+    "Schedule",
     "daterule",
+    "daycount",
+    "instrument",
     "is_leap_year",
+    "parallel",
     "relativedelta",
     "shift_months",
     "shift_years",
@@ -0,0 +1,267 @@
+"""Provides `.urd` accessors for pandas and polars, backed by the vectorized functions.
+
+Importing this module registers a `urd` accessor on pandas `Series` and
+`DatetimeIndex`, and a `urd` namespace on polars `Expr` and `Series`, for
+whichever of the two libraries are installed. Each operation runs over the whole
+column at once, with the same month-end clamping as the rest of urelativedelta:
+>>> import urelativedelta.accessors
+>>> df["end"] = df["start"].urd.shift_months(3)
+>>> df["end"] = df["start"].urd + relativedelta(months=3)
+>>> df["period"] = df["date"].urd.bucket(relativedelta(months=3), start=date(2020, 1, 31))
+
+and similarly for polars:
+>>> df.with_columns(end=pl.col("start").urd.shift_months(3))
+>>> df.with_columns(delta=pl.col("end").urd.difference(pl.col("start")))
+
+Timezone-aware columns are shifted in local (wall) time, as for python datetimes.
+Arguments given as a column (e.g. a number of months for each row) are matched
+to the dates by position.
+"""
+from __future__ import annotations
+
+from abc import ABC as _ABC, abstractmethod as _abstractmethod
+from datetime import timedelta as _timedelta
+from typing import TYPE_CHECKING as _TYPE_CHECKING, Any as _Any
+
+from . import vectorized as _vectorized
+from .plan import DeltaPlan as _DeltaPlan
+from .relativedelta import RelativeDelta as _RelativeDelta
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from datetime import date, datetime
+
+    from numpy.typing import NDArray
+
+_DELTAS = (_RelativeDelta, _timedelta, _DeltaPlan)
+
+
+def _add(dates: NDArray, delta: _Any) -> NDArray:
+    if isinstance(delta, _DeltaPlan):
+        return _vectorized.apply_plan(dates, delta)
+    return _vectorized.add(dates, delta)
+
+
+def _bucket(
+    dates: NDArray,
+    freq: _RelativeDelta | _timedelta,
+    start: date | datetime,
+    end: date | datetime | None,
+    count: int | None,
+    rolling_day: int | None,
+) -> NDArray:
+    return _vectorized.bucket(dates, freq, start, end, count, rolling_day)
+
+
+class _Accessor(_ABC):
+    """The operations of the accessors, given how to convert to and from numpy."""
+
+    def __init__(self, obj: _Any):
+        self._obj = obj
+
+    @_abstractmethod
+    def _map(self, function: Callable[..., NDArray], *args: _Any) -> _Any:
+        """Apply a function of datetime64 arrays to the dates, and any columns."""
+
+    @_abstractmethod
+    def _map_difference(self, other: _Any) -> _Any:
+        """The relativedeltas between the dates and another column of dates."""
+
+    def shift_months(self, months: _Any) -> _Any:
+        """Shift the dates by the given number of months.
+
+        Ambiguous month-ends are shifted backwards as necessary."""
+        return self._map(_vectorized.shift_months, months)
+
+    def shift_years(self, years: _Any) -> _Any:
+        """Shift the dates by the given number of years.
+
+        Ambiguous month-ends are shifted backwards as necessary."""
+        return self._map(_vectorized.shift_years, years)
+
+    def with_day(self, day: _Any) -> _Any:
+        """Shift the dates to have the given day.
+
+        Ambiguous month-ends are shifted backwards as necessary."""
+        return self._map(_vectorized.with_day, day)
+
+    def with_month(self, month: _Any) -> _Any:
+        """Shift the dates to have the given month.
+
+        Ambiguous month-ends are shifted backwards as necessary."""
+        return self._map(_vectorized.with_month, month)
+
+    def with_year(self, year: _Any) -> _Any:
+        """Shift the dates to have the given year.
+
+        Ambiguous month-ends are shifted backwards as necessary."""
+        return self._map(_vectorized.with_year, year)
+
+    def add(self, delta: _RelativeDelta | _timedelta | _DeltaPlan) -> _Any:
+        """Add a relativedelta, timedelta or `DeltaPlan` to each of the dates."""
+        if not isinstance(delta, _DELTAS):
+            raise TypeError(f"unsupported delta type: {type(delta).__name__}")
+        return self._map(_add, delta)
+
+    def __add__(self, delta: _Any) -> _Any:
+        if not isinstance(delta, _DELTAS):
+            return NotImplemented
+        return self.add(delta)
+
+    def __sub__(self, delta: _Any) -> _Any:
+        if not isinstance(delta, (_RelativeDelta, _timedelta)):
+            return NotImplemented
+        return self.add(-delta)
+
+    def difference(self, other: _Any) -> _Any:
+        """The relativedeltas from the other dates to these, as a months and a
+        timedelta column, with `other + difference == self`."""
+        return self._map_difference(other)
+
+    def bucket(
+        self,
+        freq: _RelativeDelta | _timedelta,
+        start: date | datetime,
+        end: date | datetime | None = None,
+        count: int | None = None,
+        rolling_day: int | None = None,
+    ) -> _Any:
+        """The index of the period of the daterule each date falls in.
+
+        See `urelativedelta.vectorized.bucket`: dates before the rule (or missing)
+        are given the index -1.
+        """
+        return self._map(_bucket, freq, start, end, count, rolling_day)
+
+
+try:
+    import pandas as _pd  # type: ignore[import]
+except ImportError:
+    _pd = None
+
+if _pd is not None:
+
+    class PandasAccessor(_Accessor):
+        """The `.urd` accessor of datetime pandas `Series` and `DatetimeIndex`es."""
+
+        def __init__(self, obj: _Any):
+            if not _pd.api.types.is_datetime64_any_dtype(obj.dtype):
+                raise AttributeError("the .urd accessor requires datetime values")
+            super().__init__(obj)
+
+        def _map(self, function: Callable[..., NDArray], *args: _Any) -> _Any:
+            args = tuple(_pandas_values(arg) for arg in args)
+            result = function(_pandas_values(self._obj), *args)
+            if result.dtype.kind != "M":
+                return self._wrap(result)
+            return self._wrap(result, getattr(self._obj.dtype, "tz", None))
+
+        def _map_difference(self, other: _Any) -> _Any:
+            dates, other = _pandas_values(self._obj), _pandas_values(other)
+            # The timedeltas keep the time unit of the columns, as for `a - b`
+            months, timedelta = _vectorized.difference(dates, other)
+            index = self._obj.index if isinstance(self._obj, _pd.Series) else None
+            return _pd.DataFrame(
+                {"months": months, "timedelta": timedelta}, index=index
+            )
+
+        def _wrap(self, values: NDArray, tz: _Any = None) -> _Any:
+            if isinstance(self._obj, _pd.Series):
+                result = _pd.Series(values, index=self._obj.index, name=self._obj.name)
+                return result if tz is None else result.dt.tz_localize(tz)
+            index = _pd.Index(values, name=self._obj.name)
+            return index if tz is None else index.tz_localize(tz)
+
+    def _pandas_values(value: _Any) -> _Any:
+        """The numpy values of a column, in local time if it has a timezone."""
+        if not isinstance(value, (_pd.Series, _pd.Index)):
+            return value
+        if getattr(value.dtype, "tz", None) is not None:
+            local = _pd.DatetimeIndex(value).tz_localize(None)
+            return local.to_numpy()
+        return value.to_numpy()
+
+    _pd.api.extensions.register_series_accessor("urd")(PandasAccessor)
+    _pd.api.extensions.register_index_accessor("urd")(PandasAccessor)
+
+
+try:
+    import polars as _pl  # type: ignore[import]
+except ImportError:
+    _pl = None  # type: ignore[assignment]
+
+if _pl is not None:
+
+    class PolarsNamespace(_Accessor):
+        """The `.urd` namespace of polars date and datetime `Expr`s and `Series`."""
+
+        def _map(self, function: Callable[..., NDArray], *args: _Any) -> _Any:
+            columns = [i for i, arg in enumerate(args) if _is_polars(arg)]
+
+            def apply(series: Sequence[_Any]) -> _Any:
+                values = list(args)
+                for i, column in zip(columns, series[1:]):
+                    values[i] = column.to_numpy()
+                return _polars_apply(function, series[0], values)
+
+            if isinstance(self._obj, _pl.Series):
+                return apply([self._obj, *(args[i] for i in columns)])
+
+            # Date arithmetic keeps the type of the dates, unlike bucketing
+            dtype: _Any = _pl.Int64 if function is _bucket else _pl.dtype_of(self._obj)
+            return _pl.map_batches(
+                [self._obj, *(args[i] for i in columns)],
+                apply,
+                return_dtype=dtype,
+                is_elementwise=True,
+            )
+
+        def _map_difference(self, other: _Any) -> _Any:
+            def apply(series: Sequence[_Any]) -> _Any:
+                dates, others = (_local(s) for s in series)
+                months, timedelta = _vectorized.difference(
+                    dates.to_numpy(), others.to_numpy()
+                )
+                # Keep the time unit polars gives the difference of the columns
+                unit = (dates[:0] - others[:0]).dtype.time_unit
+                return _pl.DataFrame(
+                    {"months": months, "timedelta": timedelta.astype(f"m8[{unit}]")}
+                ).to_struct(series[0].name)
+
+            if isinstance(self._obj, _pl.Series):
+                return apply([self._obj, other])
+            timedelta = self._obj - other
+            return _pl.map_batches(
+                [self._obj, other],
+                apply,
+                return_dtype=_pl.dtype_of(
+                    _pl.struct(months=_pl.lit(0, _pl.Int64), timedelta=timedelta)
+                ),
+                is_elementwise=True,
+            )
+
+    def _is_polars(value: _Any) -> bool:
+        return isinstance(value, (_pl.Series, _pl.Expr))
+
+    def _local(series: _Any) -> _Any:
+        if getattr(series.dtype, "time_zone", None) is not None:
+            return series.dt.replace_time_zone(None)
+        return series
+
+    def _polars_apply(
+        function: Callable[..., NDArray], series: _Any, args: list[_Any]
+    ) -> _Any:
+        """Apply the function to the dates, keeping their type (e.g. `Date`)."""
+        local = _local(series)
+        dates = local.to_numpy()
+        values = function(dates, *args)
+        if function is _bucket:
+            return _pl.Series(series.name, values)
+
+        # Dates moved by part of a day are floored, as for `date + timedelta`
+        result = _pl.Series(series.name, values.astype(dates.dtype)).cast(local.dtype)
+        tz = getattr(series.dtype, "time_zone", None)
+        return result if tz is None else result.dt.replace_time_zone(tz)
+
+    _pl.api.register_expr_namespace("urd")(PolarsNamespace)
+    _pl.api.register_series_namespace("urd")(PolarsNamespace)
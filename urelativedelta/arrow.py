@@ -0,0 +1,197 @@
+"""Provides kernels for Apache Arrow date and timestamp arrays.
+
+The functions take pyarrow `date32`, `date64` or `timestamp` arrays, or chunked
+arrays such as the columns of a table. They read the values in place through the
+buffer protocol, rather than converting each to a python `date`, and return arrow
+arrays of the same type, keeping nulls as nulls:
+>>> dates = pa.array([date(2020, 1, 31), None, date(2020, 3, 31)], pa.date32())
+>>> arrow.shift_months(dates, 1).to_pylist()
+[datetime.date(2020, 2, 29), None, datetime.date(2020, 4, 30)]
+>>> table = table.append_column("end", arrow.add(table["start"], relativedelta(months=3)))
+>>> arrow.difference(table["end"], table["start"])
+
+They require numpy and pyarrow, which are available via the `arrow` extra:
+
+    pip install urelativedelta[arrow]
+
+Timezone-aware timestamps are shifted in local (wall) time, as for python datetimes,
+and local times which are ambiguous or don't exist in the timezone raise an error.
+Adding part of a day to `date32` or `date64` values drops the time, as for
+`date + timedelta`.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING as _TYPE_CHECKING, Any as _Any
+
+import numpy as _np
+import pyarrow as _pa  # type: ignore[import]
+import pyarrow.compute as _pc  # type: ignore[import]
+
+from . import vectorized as _vectorized
+from .plan import DeltaPlan as _DeltaPlan
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import timedelta
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from .relativedelta import RelativeDelta
+
+
+def shift_months(values: _Any, months: ArrayLike) -> _Any:
+    """Shift an arrow array of dates by the given number of months.
+
+    `months` may be a single integer, or an array (numpy or arrow) with an entry per
+    date. Ambiguous month-ends are shifted backwards as necessary, and null months
+    give null dates.
+    """
+    return _map(_shift_months, values, months)
+
+
+def add(values: _Any, delta: RelativeDelta | timedelta | _DeltaPlan) -> _Any:
+    """Add a relativedelta, timedelta or `DeltaPlan` to an arrow array of dates."""
+    return _map(_add, values, delta)
+
+
+def difference(d1: _Any, d2: _Any) -> _Any:
+    """The relativedeltas between two arrow arrays of dates.
+
+    This is the arrow equivalent of `RelativeDelta.difference`, given as a struct
+    array of `months` (int64) and `timedelta` (duration) fields, which is null
+    wherever either date is null.
+    """
+    return _map(_difference, d1, d2)
+
+
+def _shift_months(array: _Any, months: ArrayLike) -> _Any:
+    if isinstance(months, _pa.Array) and months.null_count:
+        valid = _pc.and_(array.is_valid(), months.is_valid())
+        months = _pc.fill_null(months, 0).to_numpy()
+        return _wrap(_vectorized.shift_months(_read(array), months), array, valid)
+    return _wrap(_vectorized.shift_months(_read(array), months), array)
+
+
+def _add(array: _Any, delta: RelativeDelta | timedelta | _DeltaPlan) -> _Any:
+    if isinstance(delta, _DeltaPlan):
+        return _wrap(_vectorized.apply_plan(_read(array), delta), array)
+    return _wrap(_vectorized.add(_read(array), delta), array)
+
+
+def _difference(array: _Any, others: _Any) -> _Any:
+    if not isinstance(others, _pa.Array):
+        raise TypeError("difference requires arrow arrays of dates")
+    if len(others) != len(array):
+        raise ValueError("difference requires arrays of the same length")
+
+    months, timedelta = _vectorized.difference(_read(array), _read(others))
+    unit = getattr(array.type, "unit", "us")
+    missing = _np.asarray(_pc.or_(array.is_null(), others.is_null()), dtype=bool)
+    return _pa.StructArray.from_arrays(
+        [
+            _pa.array(months, mask=missing),
+            _pa.array(timedelta.astype(f"m8[{unit}]"), mask=missing),
+        ],
+        names=["months", "timedelta"],
+        mask=_pa.array(missing),
+    )
+
+
+def _map(kernel: Callable[..., _Any], values: _Any, *args: _Any) -> _Any:
+    """Apply a kernel of arrow arrays to each chunk of a (possibly chunked) array.
+
+    Array arguments are matched to the values by position, so are split into the
+    same chunks.
+    """
+    if not isinstance(values, _pa.ChunkedArray):
+        return kernel(values, *(_rows(arg, 0, len(values)) for arg in args))
+
+    # An empty chunk gives the type of the result when there are no chunks
+    chunks, start = [], 0
+    for chunk in values.chunks or [_pa.array([], values.type)]:
+        stop = start + len(chunk)
+        chunks.append(kernel(chunk, *(_rows(arg, start, stop) for arg in args)))
+        start = stop
+    return _pa.chunked_array(chunks)
+
+
+def _rows(arg: _Any, start: int, stop: int) -> _Any:
+    """The rows of an array argument matching a chunk of the values."""
+    if isinstance(arg, _pa.ChunkedArray):
+        return arg.slice(start, stop - start).combine_chunks()
+    if isinstance(arg, _pa.Array):
+        return arg.slice(start, stop - start)
+    if isinstance(arg, (list, tuple, _np.ndarray)):
+        return _np.asarray(arg)[start:stop]
+    return arg
+
+
+def _read(array: _Any) -> NDArray[_np.datetime64]:
+    """The values of an arrow array of dates as datetime64, in local time.
+
+    The values buffer is read in place, except that the 32-bit days of `date32`
+    arrays are widened to the 64 bits numpy requires. Nulls have arbitrary values.
+    """
+    type_ = array.type
+    dtype: _np.dtype[_Any]
+    if _pa.types.is_date32(type_):
+        dtype = _np.dtype(_np.int32)
+    elif _pa.types.is_date64(type_):
+        dtype = _np.dtype("datetime64[ms]")
+    elif _pa.types.is_timestamp(type_):
+        if type_.tz is not None:
+            array = _pc.local_timestamp(array)
+        dtype = _np.dtype(f"datetime64[{type_.unit}]")
+    else:
+        raise TypeError(f"expected date32, date64 or timestamp values, not {type_}")
+
+    buffer = array.buffers()[1]
+    values = _np.frombuffer(
+        b"" if buffer is None else buffer,
+        dtype=dtype,
+        count=len(array),
+        offset=array.offset * dtype.itemsize,
+    )
+    return values.astype("datetime64[D]") if dtype.kind == "i" else values
+
+
+def _wrap(values: NDArray[_np.datetime64], like: _Any, valid: _Any = None) -> _Any:
+    """Store datetime64 values as an arrow array with the type of `like`.
+
+    The result has the nulls of `like`, or those of the `valid` flags if given.
+    """
+    type_ = like.type
+    if _pa.types.is_timestamp(type_):
+        arrow_type = _pa.timestamp(type_.unit)
+        data = values.astype(f"datetime64[{type_.unit}]").view(_np.int64)
+    else:
+        arrow_type = type_
+        days = values.astype("datetime64[D]")
+        if _pa.types.is_date32(type_):
+            data = days.view(_np.int64).astype(_np.int32)
+        else:
+            data = days.astype("datetime64[ms]").view(_np.int64)
+
+    if valid is None:
+        validity, null_count = _validity(like), like.null_count
+    else:
+        validity, null_count = valid.buffers()[1], valid.false_count
+
+    result = _pa.Array.from_buffers(
+        arrow_type,
+        len(like),
+        [validity, _pa.py_buffer(_np.ascontiguousarray(data))],
+        null_count=null_count,
+    )
+    if getattr(type_, "tz", None) is not None:
+        result = _pc.assume_timezone(result, type_.tz)
+    return result
+
+
+def _validity(array: _Any) -> _Any:
+    """The validity bitmap of an array, starting from its first value."""
+    if not array.null_count:
+        return None
+    if array.offset == 0:
+        return array.buffers()[0]
+    return _pc.is_valid(array).buffers()[1]
@@ -0,0 +1,160 @@
+"""Provides business day calendars for rolling and counting dates.
+
+Examples
+--------
+Roll a shifted date to a business day, skipping weekends and a holiday:
+>>> calendar = BusinessCalendar(date(2020, 1, 1), date(2030, 12, 31), [date(2022, 12, 26)])
+>>> calendar.roll(date(2022, 12, 24), "following")
+date(2022, 12, 27)
+>>> relativedelta(months=1).apply(date(2022, 11, 26), calendar, "preceding")
+date(2022, 12, 23)
+
+Count the business days from one date (inclusive) to another (exclusive):
+>>> calendar.business_days_between(date(2022, 12, 19), date(2022, 12, 31))
+9
+"""
+from __future__ import annotations
+
+from array import array as _array
+from datetime import date as _date, datetime as _datetime
+from itertools import accumulate as _accumulate
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+from .utils import _days
+
+if _TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import TypeVar
+
+    D = TypeVar("D", _datetime, _date)
+
+
+CONVENTIONS = ("following", "modified_following", "preceding", "modified_preceding")
+
+
+class BusinessCalendar:
+    """A calendar of business days over a fixed range of dates.
+
+    The calendar is built once into a flag for each day of its range, with a running
+    count of business days and the position of each business day. Checking, counting
+    and rolling dates then take constant time, however long the range.
+
+    Parameters
+    ----------
+    start : date
+        The first date (inclusive) covered by the calendar.
+    end : date
+        The last date (inclusive) covered by the calendar.
+    holidays : iterable of dates
+        Dates which are not business days. Those outside the range are ignored.
+    weekend : iterable of int
+        The days of the week which are not business days, from Monday (0) to
+        Sunday (6).
+    """
+
+    def __init__(
+        self,
+        start: _date,
+        end: _date,
+        holidays: Iterable[_date] = (),
+        weekend: Iterable[int] = (5, 6),
+    ):
+        first, last = start.toordinal(), end.toordinal()
+        if last < first:
+            raise ValueError("end must not be before start")
+
+        self.start = start
+        self.end = end
+        self.holidays = frozenset(holidays)
+        self.weekend = frozenset(weekend)
+
+        # The ordinal 1 (Jan 1st, year 1) is a Monday
+        week = bytes(int((first - 1 + i) % 7 not in self.weekend) for i in range(7))
+        size = last - first + 1
+        flags = bytearray(week * (size // 7 + 1))
+        del flags[size:]
+        for holiday in self.holidays:
+            if first <= holiday.toordinal() <= last:
+                flags[holiday.toordinal() - first] = 0
+
+        self._first = first
+        self._flags = flags
+        # The number of business days before each day, and the offset of each one
+        self._counts = _array("i", _accumulate(flags, initial=0))
+        self._business = _array("i", (i for i, flag in enumerate(flags) if flag))
+
+    def __repr__(self) -> str:
+        return (
+            f"BusinessCalendar(start={self.start!r}, end={self.end!r}, "
+            f"holidays={sorted(self.holidays)!r}, weekend={sorted(self.weekend)!r})"
+        )
+
+    def is_business_day(self, date: _date) -> bool:
+        """Whether the given date is a business day."""
+        return bool(self._flags[self._offset(date)])
+
+    def business_days_between(self, d1: _date, d2: _date) -> int:
+        """The number of business days from `d1` (inclusive) to `d2` (exclusive).
+
+        This is negative if `d2` is before `d1`.
+        """
+        return self._counts[self._offset(d2, 1)] - self._counts[self._offset(d1, 1)]
+
+    def roll(self, date: D, convention: str = "following") -> D:
+        """Move the given date to a business day, if it isn't one already.
+
+        Parameters
+        ----------
+        date : datetime or date
+            The date to roll. Any time of day is kept.
+        convention : str
+            One of "following" (the next business day), "preceding" (the previous
+            business day), or "modified_following" and "modified_preceding", which
+            roll the other way instead of changing month.
+
+        Returns
+        -------
+        datetime or date
+            The rolled date.
+        """
+        if convention not in CONVENTIONS:
+            raise ValueError(
+                f"unknown convention {convention!r}, use one of {CONVENTIONS}"
+            )
+
+        offset = self._offset(date)
+        if self._flags[offset]:
+            return date
+
+        target = self._rolled(offset, convention)
+        return date + _days(target - offset)
+
+    def _offset(self, date: _date, extra: int = 0) -> int:
+        """The position of a date in the calendar, allowing `extra` days beyond it."""
+        offset = date.toordinal() - self._first
+        if not 0 <= offset < len(self._flags) + extra:
+            raise ValueError(f"{date!r} is outside the calendar")
+        return offset
+
+    def _rolled(self, offset: int, convention: str) -> int:
+        """The offset of the business day a non-business day rolls to."""
+        count, business = self._counts[offset], self._business
+        following = business[count] if count < len(business) else None
+        preceding = business[count - 1] if count > 0 else None
+
+        if convention in ("following", "modified_following"):
+            target, other = following, preceding
+        else:
+            target, other = preceding, following
+
+        if target is not None and convention.startswith("modified"):
+            if not self._same_month(offset, target):
+                target = other
+        if target is None:
+            raise ValueError("no business day to roll to within the calendar")
+        return target
+
+    def _same_month(self, offset: int, other: int) -> bool:
+        first = _date.fromordinal(self._first + offset)
+        second = _date.fromordinal(self._first + other)
+        return first.month == second.month and first.year == second.year
@@ -1,4 +1,4 @@
-"""Provides iterators yielding datetimes with a regular interval.
+"""Provides lazy sequences of datetimes with a regular interval.
 
 Examples
 --------
@@ -15,6 +15,13 @@ Yield 4 dates, one each month, from Jan 31st 2020:
 >>> list(daterule.monthly(start, count=4))
 [date(2020, 1, 31), date(2020, 2, 29), date(2020, 3, 31), date(2020, 4, 30)]
 
+Find the 10,000th date, and the position of a date, without generating the others:
+>>> rule = daterule.monthly(start)
+>>> rule[9999]
+date(2853, 4, 30)
+>>> rule.index(date(2853, 4, 30))
+9999
+
 Warnings
 --------
 You can easily get an infinite series of dates by specifying a negative relativedelta
@@ -42,20 +49,866 @@ switch to Feb 1st 2020 for the next 58, etc:
 """
 from __future__ import annotations
 
-from datetime import timedelta as _timedelta
-from typing import TYPE_CHECKING as _TYPE_CHECKING
+from array import array as _array
+from collections import OrderedDict as _OrderedDict
+from copy import copy as _copy
+from datetime import date as _date, datetime as _datetime, timedelta as _timedelta
+from functools import partial as _partial
+from heapq import merge as _merge
+from itertools import count as _count, islice as _islice, takewhile as _takewhile
+from operator import index as _index
+from sys import getsizeof as _getsizeof
+from threading import Lock as _Lock
+from typing import (
+    TYPE_CHECKING as _TYPE_CHECKING,
+    Any as _Any,
+    Generic as _Generic,
+    TypeVar as _TypeVar,
+)
 
 from .relativedelta import relativedelta as _relativedelta
-from .utils import with_day as _with_day
+from .schedule import Schedule as _Schedule
+from .utils import _MONTH_STARTS, _NUM_MONTHS, _days, with_day as _with_day
 
 if _TYPE_CHECKING:
-    from collections.abc import Iterator
-    from datetime import date, datetime
-    from typing import TypeVar, Union
+    from collections.abc import Callable, Iterable, Iterator
+    from typing import Union
+
+    from .calendar import BusinessCalendar
+    from .schedule import Schedule
 
-    D = TypeVar("D", datetime, date)
     deltalike = Union[_relativedelta, _timedelta]
 
+D = _TypeVar("D", _datetime, _date)
+
+_ZERO = _timedelta(0)
+_UNKNOWN: _Any = object()
+_MAX_ORDINAL = _date.max.toordinal()
+
+
+class DateRule(_Generic[D]):
+    """A lazy sequence of datetimes with a regular interval.
+
+    The `n`th date is computed directly as `start + freq * n` (moved to the
+    `rolling_day`, if given), so a rule supports `len()` (when it has an `end`
+    or `count`), indexing, slicing and `reversed()` without generating the dates
+    before the one requested. Finding a date with `rule.index(date)` or
+    `date in rule` takes logarithmic time when the dates are monotonic, which is
+    the case unless `freq` mixes forward and backward shifts, or combines a
+    `rolling_day` with shifts of less than a day.
+
+    For compatibility with the iterators previously returned by this module, a
+    rule also supports `next(rule)`, which steps through the dates one at a time.
+    Once it has been stepped through this way, iterating over the rule continues
+    from the next date, as for those iterators, although indexing, `len()` and
+    searching still cover all of its dates.
+
+    Rules are immutable: their parameters are read-only, as the lengths and
+    dates of rules are cached.
+
+    Parameters
+    ----------
+    freq : relativedelta or timedelta
+        The interval to shift successive dates by.
+    start : datetime or date
+        The startpoint (inclusive) for yielding dates.
+    end : optional datetime or date
+        The endpoint (exclusive) beyond which we should no longer yield dates.
+    count: optional int
+        The number of dates to yield.
+    rolling_day: optional int
+        The target day for new dates.
+    calendar: optional BusinessCalendar
+        A calendar of business days to roll new dates to.
+    convention: str
+        The convention for rolling dates, see `BusinessCalendar.roll`.
+    """
+
+    def __init__(
+        self,
+        freq: deltalike,
+        start: D,
+        end: D | None = None,
+        count: int | None = None,
+        rolling_day: int | None = None,
+        calendar: BusinessCalendar | None = None,
+        convention: str = "following",
+    ):
+        if isinstance(freq, _timedelta):
+            freq = _relativedelta(timedelta=freq)
+
+        self._freq = freq
+        self._start: D = start
+        self._end: D | None = end
+        self._count = count
+        self._rolling_day = rolling_day
+        self._calendar = calendar
+        self._convention = convention
+
+        # Slices of a rule pick out the dates `first + step * i` of the full rule
+        self._first = 0
+        self._step = 1
+        self._length: int | None = _UNKNOWN
+        self._cursor: Iterator[D] | None = None
+        # Generators can't be advanced from two threads at once
+        self._lock = _Lock()
+
+    def __getstate__(self) -> dict[str, _Any]:
+        # The lock and the position of `next(rule)` belong to this rule alone, so
+        # copies and unpickled rules start afresh
+        state = self.__dict__.copy()
+        del state["_length"], state["_cursor"], state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, _Any]) -> None:
+        self.__dict__.update(state)
+        self._length, self._cursor, self._lock = _UNKNOWN, None, _Lock()
+
+    def __repr__(self) -> str:
+        calendar = ""
+        if self.calendar is not None:
+            calendar = f", calendar={self.calendar!r}, convention={self.convention!r}"
+        return (
+            f"DateRule(freq={self.freq!r}, start={self.start!r}, end={self.end!r}, "
+            f"count={self.count!r}, rolling_day={self.rolling_day!r}{calendar})"
+        )
+
+    @property
+    def freq(self) -> _relativedelta:
+        """The interval to shift successive dates by."""
+        return self._freq
+
+    @property
+    def start(self) -> D:
+        """The startpoint (inclusive) for yielding dates."""
+        return self._start
+
+    @property
+    def end(self) -> D | None:
+        """The endpoint (exclusive) beyond which no more dates are yielded."""
+        return self._end
+
+    @property
+    def count(self) -> int | None:
+        """The number of dates to yield."""
+        return self._count
+
+    @property
+    def rolling_day(self) -> int | None:
+        """The target day for new dates."""
+        return self._rolling_day
+
+    @property
+    def calendar(self) -> BusinessCalendar | None:
+        """The calendar of business days new dates are rolled to."""
+        return self._calendar
+
+    @property
+    def convention(self) -> str:
+        """The convention for rolling dates, see `BusinessCalendar.roll`."""
+        return self._convention
+
+    def __iter__(self) -> Iterator[D]:
+        if self._cursor is not None:
+            return self._continue()
+        return self._iterate()
+
+    def __next__(self) -> D:
+        with self._lock:
+            if self._cursor is None:
+                self._cursor = self._iterate()
+            return next(self._cursor)
+
+    def _iterate(self) -> Iterator[D]:
+        """All of the rule's dates, from the first."""
+        if self.end is not None and self._length is _UNKNOWN:
+            return self._generate()
+
+        length = self._get_length()
+        dates = self._step_through(self._first, self._step)
+        return dates if length is None else _islice(dates, length)
+
+    def _continue(self) -> Iterator[D]:
+        """The dates after those already taken with `next(rule)`."""
+        while True:
+            try:
+                yield next(self)
+            except StopIteration:
+                return
+
+    def __len__(self) -> int:
+        length = self._get_length()
+        if length is None:
+            raise TypeError("an infinite DateRule has no len()")
+        return length
+
+    def __bool__(self) -> bool:
+        length = self._get_length()
+        return length is None or length > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._get_slice(index)
+
+        index = _index(index)
+        length = self._get_length()
+        if index < 0:
+            if length is None:
+                raise IndexError("negative indices require a finite DateRule")
+            index += length
+        if index < 0 or (length is not None and index >= length):
+            raise IndexError("DateRule index out of range")
+
+        return self._get(index)
+
+    def __reversed__(self) -> Iterator[D]:
+        length = self._get_length()
+        if length is None:
+            raise TypeError("an infinite DateRule cannot be reversed")
+        return map(self._get, range(length - 1, -1, -1))
+
+    def __contains__(self, value: _Any) -> bool:
+        try:
+            self.index(value)
+        except ValueError:
+            return False
+        return True
+
+    def index(self, value: D) -> int:
+        """The position of the given date in the rule.
+
+        Raises
+        ------
+        ValueError
+            If the date is not in the rule.
+        """
+        length = self._get_length()
+        direction = self._direction()
+
+        if direction is None:
+            if length is None:
+                raise ValueError("cannot search an infinite, non-monotonic DateRule")
+            for i, current in enumerate(self._iterate()):
+                if current == value:
+                    return i
+        else:
+            if self._step < 0:
+                direction = -direction
+
+            def reached(i: int) -> bool:
+                current = self._get(i)
+                return current >= value if direction >= 0 else current <= value
+
+            try:
+                i = self._first_crossing(reached, length)
+                if (length is None or i < length) and self._get(i) == value:
+                    return i
+            except TypeError:
+                pass  # e.g. comparing a date with a datetime
+
+        raise ValueError(f"{value!r} is not in DateRule")
+
+    def materialise(self, previous: Schedule[D] | None = None) -> Schedule[D]:
+        """The dates of a finite rule, stored compactly in a `Schedule`.
+
+        Rules shifting by whole months, or whole days, are materialised straight
+        from their ordinals, without building a `date` for each one.
+
+        Parameters
+        ----------
+        previous : optional Schedule
+            The materialised dates of the same rule with a different `end` or
+            `count`, e.g. before a maturity was extended. Its dates are reused, so
+            only those beyond it are generated. Schedules are immutable (and may be
+            shared by a `ScheduleCache` or `ScheduleStore`), so `previous` itself is
+            left unchanged.
+
+        Raises
+        ------
+        ValueError
+            If the rule is infinite, or `previous` doesn't start with its dates.
+        """
+        length = self._get_length()
+        if length is None:
+            raise ValueError("cannot materialise an infinite DateRule")
+        if previous is not None and len(previous) and length:
+            return self._resize(previous, length)
+
+        ordinals = self._ordinals(length)
+        if ordinals is None:
+            return _Schedule(self._iterate())
+        return _Schedule._from_ordinals(ordinals, self.start)
+
+    def _resize(self, previous: Schedule[D], length: int) -> Schedule[D]:
+        """Truncate or extend a schedule starting with the rule's dates to `length`.
+
+        The dates beyond `previous` come from a slice of the rule, which gives
+        exactly the dates of the full rule, so the result is identical to
+        materialising it afresh.
+        """
+        kept = min(len(previous), length)
+        if (
+            previous.tzinfo is not getattr(self.start, "tzinfo", None)
+            or previous[0] != self._get(0)
+            or previous[kept - 1] != self._get(kept - 1)
+        ):
+            raise ValueError("the previous schedule is not of this rule")
+        if kept == length:
+            return previous[:length]
+
+        tail = self[kept:length].materialise()
+        values = _array(tail.values.typecode)
+        values.frombytes(
+            memoryview(previous.values).cast("B")[: kept * values.itemsize]
+        )
+        values.extend(tail.values)
+        return _Schedule._from_values(values, tail.tzinfo)
+
+    def _key(self) -> tuple[_Any, ...]:
+        """The parameters identifying the rule's dates.
+
+        Aware datetimes in different timezones can be equal while giving different
+        local times, so the timezones of the bounds are part of the key too.
+        """
+        return (
+            type(self),
+            type(self.start),
+            getattr(self.start, "tzinfo", None),
+            getattr(self.end, "tzinfo", None),
+            *self._parameters(),
+        )
+
+    def _parameters(self) -> tuple[_Any, ...]:
+        return (
+            self.freq,
+            self.start,
+            self.end,
+            self.count,
+            self.rolling_day,
+            self.calendar,
+            self.convention,
+            self._first,
+            self._step,
+        )
+
+    def _ordinals(self, length: int) -> _array | None:
+        """The ordinals of the rule's dates, if they can be found without the dates."""
+        months, timedelta = self.freq.total_months, self.freq.timedelta
+        rolling_day = self.rolling_day
+        if self.calendar is not None or not (
+            rolling_day is None or 1 <= rolling_day <= 31
+        ):
+            return None
+
+        if not timedelta:
+            return _array(
+                "i", _islice(self._month_ordinals(self._first, self._step), length)
+            )
+        if (
+            months
+            or rolling_day is not None
+            or timedelta.seconds
+            or timedelta.microseconds
+        ):
+            return None
+
+        days = timedelta.days * self._step
+        first = self.start.toordinal() + timedelta.days * self._first
+        last = first + days * (length - 1)
+        if length and not (1 <= min(first, last) and max(first, last) <= _MAX_ORDINAL):
+            raise OverflowError("date value out of range")
+        if not days:
+            return _array("i", [first]) * length
+        return _array("i", range(first, last + days, days))
+
+    def _date_at(self, n: int) -> D:
+        """The `n`th date of the full (unsliced) rule, ignoring `end` and `count`."""
+        current = self.start + self.freq * n
+        if self.rolling_day is not None:
+            current = _with_day(current, self.rolling_day)
+        if self.calendar is not None:
+            current = self.calendar.roll(current, self.convention)
+        return current
+
+    def _get(self, i: int) -> D:
+        return self._date_at(self._first + self._step * i)
+
+    def _generate(self) -> Iterator[D]:
+        """Yield dates one at a time, stopping once we pass the end."""
+        start, end, count = self.start, self.end, self.count
+        dates = self._step_through(0, 1)
+        if count is not None:
+            dates = _islice(dates, count)
+        if end is None:
+            return dates
+
+        stop: D = end
+        if stop >= start:
+            return _takewhile(lambda current: current < stop, dates)
+        return _takewhile(lambda current: current > stop, dates)
+
+    def _step_through(self, first: int, step: int) -> Iterator[D]:
+        """Yield the dates `first + step * i` of the full rule, for i = 0, 1, 2, ...
+
+        Frequencies made up of only months, or only a timedelta, are stepped through
+        incrementally. These give exactly the same dates as the closed form, but
+        without building a new relativedelta and shifted date for each one.
+        """
+        dates = self._step_through_unrolled(first, step)
+        if self.calendar is None:
+            return dates
+
+        roll, convention = self.calendar.roll, self.convention
+        return (roll(current, convention) for current in dates)
+
+    def _step_through_unrolled(self, first: int, step: int) -> Iterator[D]:
+        months, timedelta = self.freq.total_months, self.freq.timedelta
+        rolling_day = self.rolling_day
+
+        if rolling_day is None or 1 <= rolling_day <= 31:
+            if not timedelta:
+                return self._step_through_months(first, step)
+            # Dates discard any part of a timedelta smaller than a day
+            if not months and (
+                isinstance(self.start, _datetime)
+                or not (timedelta.seconds or timedelta.microseconds)
+            ):
+                return self._step_through_timedelta(first, step)
+
+        return map(self._date_at, _count(first, step))
+
+    def _step_through_months(self, first: int, step: int) -> Iterator[D]:
+        current = self.start
+        previous = current.toordinal()
+        for ordinal in self._month_ordinals(first, step):
+            current += _days(ordinal - previous)
+            previous = ordinal
+            yield current
+
+    def _month_ordinals(self, first: int, step: int) -> Iterator[int]:
+        """The ordinals of the dates of a rule shifting by whole months."""
+        start, rolling_day = self.start, self.rolling_day
+        index = 12 * start.year + start.month - 13
+        day = start.day if rolling_day is None else rolling_day
+
+        months = self.freq.total_months
+        index += months * first
+        months *= step
+
+        while True:
+            if not 0 <= index < _NUM_MONTHS:
+                raise ValueError(f"year {1 + index // 12} is out of range")
+
+            month_start = _MONTH_STARTS[index]
+            length = _MONTH_STARTS[index + 1] - month_start
+            yield month_start + (day if day < length else length) - 1
+            index += months
+
+    def _step_through_timedelta(self, first: int, step: int) -> Iterator[D]:
+        timedelta, rolling_day = self.freq.timedelta, self.rolling_day
+        current = self.start + timedelta * first
+        timedelta *= step
+
+        if rolling_day is None:
+            while True:
+                yield current
+                current += timedelta
+        else:
+            while True:
+                yield _with_day(current, rolling_day)
+                current += timedelta
+
+    def _direction(self) -> int | None:
+        """Whether dates increase (1), decrease (-1) or stay constant (0).
+
+        Returns `None` if the dates are not monotonic.
+        """
+        return _direction(
+            self.freq,
+            self.rolling_day,
+            isinstance(self.start, _datetime),
+            self.calendar is not None,
+        )
+
+    def _get_length(self) -> int | None:
+        """The number of dates in the rule, or `None` if it is infinite."""
+        if self._length is _UNKNOWN:
+            self._length = self._compute_length()
+        return self._length
+
+    def _compute_length(self) -> int | None:
+        start, end, count = self.start, self.end, self.count
+        if end is None:
+            return count
+
+        direction = self._direction()
+        if direction is None:
+            return sum(1 for _ in self._generate())
+
+        forwards = end >= start
+        if forwards:
+
+            def crossed(n: int) -> bool:
+                return self._date_at(n) >= end
+
+        else:
+
+            def crossed(n: int) -> bool:
+                return self._date_at(n) <= end
+
+        if direction == (1 if forwards else -1):
+            return self._first_crossing(crossed, count)
+
+        # The dates never approach the end, so either start past it or never reach it
+        if count == 0 or crossed(0):
+            return 0
+        return count
+
+    @staticmethod
+    def _first_crossing(crossed: Callable[[int], bool], limit: int | None) -> int:
+        """The first `n < limit` for which the monotonic `crossed(n)` holds.
+
+        Returns `limit` if there is no such `n`. Dates out of the representable range
+        are treated as having crossed.
+        """
+
+        def safe_crossed(n: int) -> bool:
+            try:
+                return crossed(n)
+            except (OverflowError, ValueError):
+                return True
+
+        lo, hi = 0, 1
+        while limit is None or hi < limit:
+            if safe_crossed(hi):
+                break
+            lo, hi = hi + 1, 2 * hi
+        else:
+            hi = limit
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if safe_crossed(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+
+        return lo
+
+    def _get_slice(self, index: slice) -> DateRule[D]:
+        length = self._get_length()
+        if length is not None:
+            indices = range(length)[index]
+            return self._slice(indices.start, indices.step, len(indices))
+
+        first = 0 if index.start is None else _index(index.start)
+        step = 1 if index.step is None else _index(index.step)
+        if first < 0 or step <= 0:
+            raise ValueError("slices of an infinite DateRule must start and step >= 0")
+        if index.stop is None:
+            return self._slice(first, step, None)
+
+        stop = _index(index.stop)
+        if stop < 0:
+            raise ValueError("slices of an infinite DateRule must stop >= 0")
+        return self._slice(first, step, len(range(first, stop, step)))
+
+    def _slice(self, first: int, step: int, length: int | None) -> DateRule[D]:
+        rule = _copy(self)
+        rule._end, rule._count = None, length
+        rule._first = self._first + self._step * first
+        rule._step = self._step * step
+        return rule
+
+
+class _AnchoredRule(DateRule[D]):
+    """A lazy sequence with one date per period of whole months.
+
+    Each date is found from the ordinals of its month's start and end by `anchor`,
+    keeping the time of day of `start`. The first date is the one in the month of
+    `start`, unless it falls before `start`, in which case it is the one in the
+    following period.
+    """
+
+    def __init__(
+        self,
+        anchor: Callable[[int, int], int],
+        name: str,
+        months: int,
+        start: D,
+        end: D | None,
+        count: int | None,
+        arguments: tuple[tuple[str, int], ...] = (),
+    ):
+        if not months:
+            raise ValueError("months must be non-zero")
+        DateRule.__init__(self, _relativedelta(months=months), start, end, count)
+
+        self._anchor = anchor
+        self._name = name
+        self._arguments = arguments
+        self._months = months
+        self._ordinal = start.toordinal()
+
+        index = 12 * start.year + start.month - 13
+        first = anchor(_MONTH_STARTS[index], _MONTH_STARTS[index + 1] - 1)
+        if first < self._ordinal if months > 0 else first > self._ordinal:
+            index += months
+        self._index = index
+
+    def __repr__(self) -> str:
+        arguments = "".join(f"{key}={value!r}, " for key, value in self._arguments)
+        return (
+            f"{self._name}({arguments}months={self._months!r}, start={self.start!r}, "
+            f"end={self.end!r}, count={self.count!r})"
+        )
+
+    def _date_at(self, n: int) -> D:
+        return self.start + _days(self._ordinal_at(n) - self._ordinal)
+
+    def _ordinal_at(self, n: int) -> int:
+        index = self._index + self._months * n
+        if not 0 <= index < _NUM_MONTHS:
+            raise ValueError(f"year {1 + index // 12} is out of range")
+        return self._anchor(_MONTH_STARTS[index], _MONTH_STARTS[index + 1] - 1)
+
+    def _ordinals(self, length: int) -> _array | None:
+        indices = range(self._first, self._first + self._step * length, self._step)
+        return _array("i", map(self._ordinal_at, indices))
+
+    def _parameters(self) -> tuple[_Any, ...]:
+        return (*DateRule._parameters(self), self._name, self._arguments)
+
+    def _step_through(self, first: int, step: int) -> Iterator[D]:
+        return map(self._date_at, _count(first, step))
+
+    def _direction(self) -> int | None:
+        return 1 if self._months > 0 else -1
+
+
+class RuleSet(_Generic[D]):
+    """A lazy, ordered combination of several rules.
+
+    Iterating a rule set merges the dates of its rules in increasing order,
+    yielding coinciding dates only once. Only a single pending date is held per
+    rule, so rules may be infinite.
+
+    Rule sets are built up from their union, then narrowed using their methods,
+    each of which returns a new rule set:
+    >>> coupons = daterule.monthly(date(2020, 1, 15))
+    >>> resets = daterule.iterator(relativedelta(months=3), date(2020, 1, 1))
+    >>> events = RuleSet(coupons, resets).exclude(date(2020, 4, 1))
+
+    Parameters
+    ----------
+    *rules : DateRule, RuleSet or iterable of dates
+        Rules yielding increasing dates, whose union forms the set.
+    """
+
+    def __init__(self, *rules: Iterable[D]):
+        for rule in rules:
+            _check_increasing(rule)
+
+        self._operation = _union
+        self._rules: tuple[Iterable[D], ...] = rules
+        self._excluded: tuple[Iterable[D], ...] = ()
+        self._exdates: frozenset[D] = frozenset()
+
+    def __repr__(self) -> str:
+        operation = self._operation.__name__.lstrip("_")
+        return (
+            f"RuleSet({operation}={list(self._rules)!r}, "
+            f"excluded={list(self._excluded)!r}, exdates={sorted(self._exdates)!r})"
+        )
+
+    def __iter__(self) -> Iterator[D]:
+        dates = self._operation([iter(rule) for rule in self._rules])
+        if self._excluded:
+            dates = _difference(dates, _union([iter(r) for r in self._excluded]))
+        if self._exdates:
+            exdates = self._exdates
+            dates = (current for current in dates if current not in exdates)
+        return dates
+
+    def union(self, *rules: Iterable[D]) -> RuleSet[D]:
+        """The dates in this set, or in any of the given rules."""
+        return RuleSet(self, *rules)
+
+    def intersection(self, *rules: Iterable[D]) -> RuleSet[D]:
+        """The dates in this set, and in each of the given rules."""
+        ruleset = RuleSet(self, *rules)
+        ruleset._operation = _intersection
+        return ruleset
+
+    def difference(self, *rules: Iterable[D]) -> RuleSet[D]:
+        """The dates in this set, but in none of the given rules."""
+        for rule in rules:
+            _check_increasing(rule)
+
+        ruleset = self._copy()
+        ruleset._excluded += rules
+        return ruleset
+
+    def exclude(self, *dates: D) -> RuleSet[D]:
+        """The dates in this set, other than those given."""
+        ruleset = self._copy()
+        ruleset._exdates |= frozenset(dates)
+        return ruleset
+
+    def _copy(self) -> RuleSet[D]:
+        ruleset: RuleSet[D] = RuleSet()
+        ruleset._operation = self._operation
+        ruleset._rules = self._rules
+        ruleset._excluded = self._excluded
+        ruleset._exdates = self._exdates
+        return ruleset
+
+
+class ScheduleCache:
+    """A bounded, least-recently-used cache of the dates of finite rules.
+
+    The dates of each rule are stored compactly as a `Schedule`, keyed on the
+    parameters of the rule, so equal rules built afresh share an entry. Once the
+    entries take more than `max_bytes`, the least recently used are evicted.
+
+    The cache may be shared between threads. The cache is opt-in: rules are only
+    cached when materialised through it:
+    >>> cache = ScheduleCache(max_bytes=1 << 20)
+    >>> schedule = cache.materialise(daterule.monthly(start, count=120))
+
+    Parameters
+    ----------
+    max_bytes : int
+        The most memory the cached schedules may take.
+    """
+
+    def __init__(self, max_bytes: int = 1 << 26):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: _OrderedDict[tuple, _Schedule] = _OrderedDict()
+        self._lock = _Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"ScheduleCache(max_bytes={self.max_bytes!r}, entries={len(self)}, "
+            f"nbytes={self.nbytes}, hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def materialise(self, rule: DateRule[D]) -> Schedule[D]:
+        """The schedule of the given finite rule, shared with any equal rule."""
+        key = rule._key()
+        with self._lock:
+            schedule = self._entries.get(key)
+            if schedule is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return schedule
+            self.misses += 1
+
+        # Other threads may use the cache while this rule is materialised
+        schedule = rule.materialise()
+        with self._lock:
+            self._store(key, schedule)
+        return schedule
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = self.hits = self.misses = self.evictions = 0
+
+    def _store(self, key: tuple, schedule: Schedule) -> None:
+        size = _getsizeof(schedule.values)
+        if size > self.max_bytes or key in self._entries:
+            return
+
+        self._entries[key] = schedule
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _getsizeof(evicted.values)
+            self.evictions += 1
+
+
+def _check_increasing(rule: Iterable[D]) -> None:
+    if isinstance(rule, DateRule):
+        direction = rule._direction()
+        if direction is None or direction * rule._step < 0:
+            raise ValueError(f"{rule!r} does not yield increasing dates")
+
+
+def _union(iterators: list[Iterator[D]]) -> Iterator[D]:
+    """Merge increasing iterators, skipping repeated dates."""
+    previous: _Any = _UNKNOWN
+    for current in _merge(*iterators):
+        if current != previous:
+            yield current
+            previous = current
+
+
+def _intersection(iterators: list[Iterator[D]]) -> Iterator[D]:
+    """Yield the dates common to every one of the increasing iterators."""
+    if not iterators:
+        return
+
+    try:
+        heads = [next(iterator) for iterator in iterators]
+        while True:
+            target = max(heads)
+            for i, iterator in enumerate(iterators):
+                while heads[i] < target:
+                    heads[i] = next(iterator)
+
+            if all(head == target for head in heads):
+                yield target
+                for i, iterator in enumerate(iterators):
+                    while heads[i] == target:
+                        heads[i] = next(iterator)
+    except StopIteration:
+        return
+
+
+def _difference(dates: Iterator[D], excluded: Iterator[D]) -> Iterator[D]:
+    """Yield the increasing dates which aren't in the increasing excluded dates."""
+    head: _Any = next(excluded, _UNKNOWN)
+    for current in dates:
+        while head is not _UNKNOWN and head < current:
+            head = next(excluded, _UNKNOWN)
+        if head is _UNKNOWN or head != current:
+            yield current
+
+
+def _direction(
+    freq: _relativedelta,
+    rolling_day: int | None,
+    has_time: bool,
+    rolled: bool = False,
+) -> int | None:
+    """Whether a rule's dates increase (1), decrease (-1) or stay constant (0).
+
+    Returns `None` if the dates are not monotonic.
+    """
+    months, timedelta = freq.total_months, freq.timedelta
+    if (rolling_day is not None or rolled) and has_time:
+        # Moving to the rolling day, or rolling to a business day, ignores the
+        # time, which can go backwards (e.g. Sat 11:00 and Sun 09:00 both roll to
+        # Monday, at 11:00 and then 09:00)
+        if timedelta.seconds or timedelta.microseconds:
+            return None
+
+    if months >= 0 and timedelta >= _ZERO:
+        return 1 if months or timedelta else 0
+    if months <= 0 and timedelta <= _ZERO:
+        return -1
+    return None
+
 
 def iterator(
     freq: deltalike,
@@ -63,8 +916,10 @@ def iterator(
     end: D | None = None,
     count: int | None = None,
     rolling_day: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes with a regular interval.
+    calendar: BusinessCalendar | None = None,
+    convention: str = "following",
+) -> DateRule[D]:
+    """A lazy sequence of datetimes with a regular interval.
 
     Parameters
     ----------
@@ -78,41 +933,25 @@ def iterator(
         The number of dates to yield.
     rolling_day: optional int
         The target day for new dates.
+    calendar: optional BusinessCalendar
+        A calendar of business days to roll new dates to.
+    convention: str
+        The convention for rolling dates, see `BusinessCalendar.roll`.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
-    if isinstance(freq, _timedelta):
-        freq = _relativedelta(timedelta=freq)
-
-    current_count = 0
-
-    while True:
-        if count is not None and current_count >= count:
-            return
-
-        current_date = start + freq * current_count
-        if rolling_day is not None:
-            current_date = _with_day(current_date, rolling_day)
-
-        if end is not None:
-            if end >= start and current_date >= end:
-                return
-            if end < start and current_date <= end:
-                return
-
-        current_count += 1
-        yield current_date
+    return DateRule(freq, start, end, count, rolling_day, calendar, convention)
 
 
 def secondly(
     start: D,
     end: D | None = None,
     count: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes once per second.
+) -> DateRule[D]:
+    """A lazy sequence of datetimes once per second.
 
     Parameters
     ----------
@@ -123,9 +962,9 @@ def secondly(
     count: optional int
         The number of dates to yield.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
     freq = _relativedelta(seconds=1)
@@ -136,8 +975,8 @@ def minutely(
     start: D,
     end: D | None = None,
     count: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes once per minute.
+) -> DateRule[D]:
+    """A lazy sequence of datetimes once per minute.
 
     Parameters
     ----------
@@ -148,9 +987,9 @@ def minutely(
     count: optional int
         The number of dates to yield.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
     freq = _relativedelta(minutes=1)
@@ -161,8 +1000,8 @@ def hourly(
     start: D,
     end: D | None = None,
     count: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes once per hour.
+) -> DateRule[D]:
+    """A lazy sequence of datetimes once per hour.
 
     Parameters
     ----------
@@ -173,9 +1012,9 @@ def hourly(
     count: optional int
         The number of dates to yield.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
     freq = _relativedelta(hours=1)
@@ -186,8 +1025,8 @@ def daily(
     start: D,
     end: D | None = None,
     count: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes once per day.
+) -> DateRule[D]:
+    """A lazy sequence of datetimes once per day.
 
     Parameters
     ----------
@@ -198,9 +1037,9 @@ def daily(
     count: optional int
         The number of dates to yield.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
     freq = _relativedelta(days=1)
@@ -211,8 +1050,8 @@ def weekly(
     start: D,
     end: D | None = None,
     count: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes once per week.
+) -> DateRule[D]:
+    """A lazy sequence of datetimes once per week.
 
     Parameters
     ----------
@@ -223,9 +1062,9 @@ def weekly(
     count: optional int
         The number of dates to yield.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
     freq = _relativedelta(days=7)
@@ -237,8 +1076,10 @@ def monthly(
     end: D | None = None,
     count: int | None = None,
     rolling_day: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes once per month.
+    calendar: BusinessCalendar | None = None,
+    convention: str = "following",
+) -> DateRule[D]:
+    """A lazy sequence of datetimes once per month.
 
     Parameters
     ----------
@@ -250,14 +1091,18 @@ def monthly(
         The number of dates to yield.
     rolling_day: optional int
         The target day for new dates.
+    calendar: optional BusinessCalendar
+        A calendar of business days to roll new dates to.
+    convention: str
+        The convention for rolling dates, see `BusinessCalendar.roll`.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
     freq = _relativedelta(months=1)
-    return iterator(freq, start, end, count, rolling_day)
+    return iterator(freq, start, end, count, rolling_day, calendar, convention)
 
 
 def yearly(
@@ -265,8 +1110,10 @@ def yearly(
     end: D | None = None,
     count: int | None = None,
     rolling_day: int | None = None,
-) -> Iterator[D]:
-    """An iterator yielding datetimes once per year.
+    calendar: BusinessCalendar | None = None,
+    convention: str = "following",
+) -> DateRule[D]:
+    """A lazy sequence of datetimes once per year.
 
     Parameters
     ----------
@@ -278,11 +1125,113 @@ def yearly(
         The number of dates to yield.
     rolling_day: optional int
         The target day for new dates.
+    calendar: optional BusinessCalendar
+        A calendar of business days to roll new dates to.
+    convention: str
+        The convention for rolling dates, see `BusinessCalendar.roll`.
 
-    Yields
-    ------
-    datetime or date
+    Returns
+    -------
+    DateRule
         The dates in the sequence for the provided rule.
     """
     freq = _relativedelta(years=1)
-    return iterator(freq, start, end, count, rolling_day)
+    return iterator(freq, start, end, count, rolling_day, calendar, convention)
+
+
+def nth_weekday(
+    start: D,
+    weekday: int,
+    nth: int,
+    end: D | None = None,
+    count: int | None = None,
+    months: int = 1,
+) -> DateRule[D]:
+    """A lazy sequence of datetimes on the `nth` given weekday of each period.
+
+    For example, `nth_weekday(start, 2, 3)` gives the third Wednesday of each
+    month. With `months`, the dates fall in every `months`th month from the month
+    of `start`, so `nth_weekday(date(2024, 3, 1), 4, -1, months=3)` gives the last
+    Friday of each calendar quarter (March, June, September and December). Each
+    date is computed directly from the weekday its month starts or ends on, and the
+    rule has the same random access as any other `DateRule`.
+
+    Parameters
+    ----------
+    start : datetime or date
+        The startpoint (inclusive) for yielding dates.
+    weekday : int
+        The day of the week, from Monday (0) to Sunday (6).
+    nth : int
+        Which such weekday in the month, from 1 to 4, or -1 (the last) to -4.
+    end : optional datetime or date
+        The endpoint (exclusive) beyond which we should no longer yield dates.
+    count: optional int
+        The number of dates to yield.
+    months: int
+        The number of months in each period.
+
+    Returns
+    -------
+    DateRule
+        The dates in the sequence for the provided rule.
+    """
+    if not 0 <= weekday <= 6:
+        raise ValueError("weekday must be in 0..6")
+    if not (1 <= nth <= 4 or -4 <= nth <= -1):
+        # Fifth weekdays don't occur in every month
+        raise ValueError("nth must be in 1..4 or -4..-1")
+
+    weeks = 7 * (nth - 1 if nth > 0 else nth + 1)
+    anchor = _partial(
+        _nth_weekday_from_start if nth > 0 else _nth_weekday_from_end, weekday, weeks
+    )
+    arguments = (("weekday", weekday), ("nth", nth))
+    return _AnchoredRule(anchor, "nth_weekday", months, start, end, count, arguments)
+
+
+def last_business_day(
+    start: D,
+    end: D | None = None,
+    count: int | None = None,
+    months: int = 1,
+) -> DateRule[D]:
+    """A lazy sequence of datetimes on the last weekday (Mon-Fri) of each period.
+
+    Parameters
+    ----------
+    start : datetime or date
+        The startpoint (inclusive) for yielding dates.
+    end : optional datetime or date
+        The endpoint (exclusive) beyond which we should no longer yield dates.
+    count: optional int
+        The number of dates to yield.
+    months: int
+        The number of months in each period.
+
+    Returns
+    -------
+    DateRule
+        The dates in the sequence for the provided rule.
+    """
+    return _AnchoredRule(
+        _last_business_day, "last_business_day", months, start, end, count
+    )
+
+
+# The anchors of the rules above are module-level functions (or partials of them),
+# rather than closures, so that the rules can be pickled. The ordinal 1 (Jan 1st,
+# year 1) is a Monday.
+
+
+def _nth_weekday_from_start(weekday: int, weeks: int, first: int, last: int) -> int:
+    return first + (weekday + 1 - first) % 7 + weeks
+
+
+def _nth_weekday_from_end(weekday: int, weeks: int, first: int, last: int) -> int:
+    return last - (last - 1 - weekday) % 7 + weeks
+
+
+def _last_business_day(first: int, last: int) -> int:
+    weekday = (last - 1) % 7
+    return last - weekday + 4 if weekday > 4 else last
@@ -0,0 +1,86 @@
+"""Provides day count conventions for computing year fractions between dates.
+
+The supported conventions are
+- "ACT/360": actual days divided by 360
+- "ACT/365F": actual days divided by 365
+- "30/360": the 30/360 bond basis, treating the 31st as the 30th when the period
+  starts on the 30th or 31st
+- "30E/360": the eurobond basis, always treating the 31st as the 30th
+- "ACT/ACT": the ISDA convention, dividing the days falling in leap years by 366
+  and the remainder by 365
+
+Only the dates of datetimes are used. The vectorised equivalent is
+`urelativedelta.vectorized.year_fraction`.
+
+Examples
+--------
+>>> year_fraction(date(2020, 1, 31), date(2020, 7, 31), "30/360")
+0.5
+>>> year_fraction(date(2019, 12, 1), date(2020, 12, 1), "ACT/ACT")
+1.0
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+from .utils import _MONTH_STARTS, is_leap_year as _is_leap_year
+
+if _TYPE_CHECKING:
+    from datetime import date
+
+
+CONVENTIONS = ("ACT/360", "ACT/365F", "30/360", "30E/360", "ACT/ACT")
+
+
+def year_fraction(start: date, end: date, convention: str) -> float:
+    """The fraction of a year from `start` to `end` under the given convention.
+
+    This is negative if `end` is before `start`.
+
+    Parameters
+    ----------
+    start : datetime or date
+        The start of the period.
+    end : datetime or date
+        The end of the period.
+    convention : str
+        One of "ACT/360", "ACT/365F", "30/360", "30E/360" or "ACT/ACT".
+
+    Returns
+    -------
+    float
+        The year fraction.
+    """
+    if convention == "ACT/360":
+        return (end.toordinal() - start.toordinal()) / 360
+    elif convention == "ACT/365F":
+        return (end.toordinal() - start.toordinal()) / 365
+    elif convention == "30/360" or convention == "30E/360":
+        day1, day2 = min(start.day, 30), end.day
+        if day2 == 31 and (day1 == 30 or convention == "30E/360"):
+            day2 = 30
+        days = (
+            360 * (end.year - start.year)
+            + 30 * (end.month - start.month)
+            + (day2 - day1)
+        )
+        return days / 360
+    elif convention == "ACT/ACT":
+        if end.toordinal() < start.toordinal():
+            return -_act_act(end, start)
+        return _act_act(start, end)
+
+    raise ValueError(f"unknown convention {convention!r}, use one of {CONVENTIONS}")
+
+
+def _act_act(start: date, end: date) -> float:
+    """The ISDA actual/actual year fraction, for `start <= end`."""
+    year1, year2 = start.year, end.year
+    # The days left in the first year, whole years between, and days into the last
+    remaining = _MONTH_STARTS[12 * year1] - start.toordinal()
+    elapsed = end.toordinal() - _MONTH_STARTS[12 * year2 - 12]
+    return (
+        remaining / (366 if _is_leap_year(year1) else 365)
+        + (year2 - year1 - 1)
+        + elapsed / (366 if _is_leap_year(year2) else 365)
+    )
@@ -0,0 +1,259 @@
+"""Provides opt-in counters and timings for the hot paths of urelativedelta.
+
+While enabled, calls to `shift_months`, adding a `RelativeDelta` to a date,
+`RelativeDelta.difference` and `daterule.iterator` are counted and timed, along
+with how often they take their slower branches:
+- `shift_months` and `RelativeDelta.__radd__` count the shifts clamped to the end
+  of a shorter month, and the additions of months and of timedeltas
+- `RelativeDelta.difference` counts the estimates corrected down (`months -= 1`)
+  or up (`months += 1`)
+- `daterule.iterator` counts the rules built with a `rolling_day` or a calendar,
+  while iterating over any rule counts the dates it yields, and those clamped to
+  the end of a month shorter than the `rolling_day`
+
+Instrumentation works by swapping the instrumented functions in place, so costs
+nothing once disabled. Only calls through the package see the swap: functions
+imported by name beforehand (`from urelativedelta import shift_months`) are not
+counted, and nor are calls within the compiled `utils` of the mypyc build (e.g.
+from `shift_years` to `shift_months`). The counts are not guarded against
+concurrent updates, so are only approximate when several threads are instrumented
+at once.
+
+Examples
+--------
+>>> with instrument.enabled() as stats:
+...     run_job()
+>>> logger.info(stats.summary())
+path                               calls    seconds  us/call
+shift_months                        5000   0.002311    0.462
+  clamped                            192
+...
+"""
+from __future__ import annotations
+
+import sys as _sys
+from collections import Counter as _Counter, defaultdict as _defaultdict
+from contextlib import contextmanager as _contextmanager
+from functools import wraps as _wraps
+from time import perf_counter as _perf_counter
+from typing import TYPE_CHECKING as _TYPE_CHECKING, Any as _Any
+
+from . import daterule as _daterule, utils as _utils
+from .relativedelta import RelativeDelta as _RelativeDelta
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+class Stats:
+    """Counts and cumulative timings of the instrumented paths."""
+
+    def __init__(self) -> None:
+        self.calls: _Counter[str] = _Counter()
+        self.seconds: dict[str, float] = _defaultdict(float)
+        self.branches: _Counter[tuple[str, str]] = _Counter()
+
+    def reset(self) -> None:
+        """Zero every count and timing."""
+        self.calls.clear()
+        self.seconds.clear()
+        self.branches.clear()
+
+    def as_dict(self) -> dict[str, dict[str, _Any]]:
+        """The counts and timings of each path, e.g. for structured logging."""
+        paths: dict[str, dict[str, _Any]] = {}
+        for path, calls in self.calls.items():
+            paths[path] = {"calls": calls, "seconds": self.seconds[path]}
+        for (path, branch), count in self.branches.items():
+            paths.setdefault(path, {"calls": 0, "seconds": 0.0})[branch] = count
+        return paths
+
+    def summary(self) -> str:
+        """A table of the counts and timings of each path, and their branches."""
+        lines = [f"{'path':<30} {'calls':>9} {'seconds':>10} {'us/call':>8}"]
+        for path, stats in sorted(self.as_dict().items()):
+            calls, seconds = stats.pop("calls"), stats.pop("seconds")
+            per_call = 1e6 * seconds / calls if calls else 0.0
+            lines.append(f"{path:<30} {calls:>9} {seconds:>10.6f} {per_call:>8.3f}")
+            for branch, count in sorted(stats.items()):
+                lines.append(f"  {branch:<28} {count:>9}")
+        return "\n".join(lines)
+
+
+stats = Stats()
+# The original of each instrumented function, by its instrumented version
+_originals: dict[_Any, _Any] = {}
+
+
+def is_enabled() -> bool:
+    """Whether instrumentation is currently enabled."""
+    return bool(_originals)
+
+
+def enable() -> Stats:
+    """Start counting and timing the hot paths, returning the shared `Stats`."""
+    if is_enabled():
+        return stats
+
+    _replace(_utils.shift_months, _shift_months(_utils.shift_months))
+    _replace(_daterule.iterator, _iterator(_daterule.iterator))
+
+    radd = _RelativeDelta.__radd__
+    _RelativeDelta.__radd__ = _radd(radd)  # type: ignore[method-assign]
+    _originals[_RelativeDelta.__radd__] = radd
+
+    # Replace the underlying function of the classmethod
+    difference = _RelativeDelta.__dict__["difference"]
+    wrapped: _Any = classmethod(_difference(difference.__func__))
+    _RelativeDelta.difference = wrapped  # type: ignore[method-assign,assignment]
+    _originals[wrapped] = difference
+
+    iterate = _daterule.DateRule._iterate
+    _daterule.DateRule._iterate = _iter(iterate)  # type: ignore[method-assign]
+    _originals[_daterule.DateRule._iterate] = iterate
+
+    return stats
+
+
+def disable() -> None:
+    """Stop instrumenting, restoring the original functions. Counts are kept."""
+    for wrapper, original in list(_originals.items()):
+        if _RelativeDelta.__dict__.get("__radd__") is wrapper:
+            _RelativeDelta.__radd__ = original  # type: ignore[method-assign]
+        elif _RelativeDelta.__dict__.get("difference") is wrapper:
+            _RelativeDelta.difference = original  # type: ignore[method-assign]
+        elif _daterule.DateRule.__dict__.get("_iterate") is wrapper:
+            _daterule.DateRule._iterate = original  # type: ignore[method-assign]
+        else:
+            _rebind(wrapper, original)
+    _originals.clear()
+
+
+@_contextmanager
+def enabled(reset: bool = True) -> Iterator[Stats]:
+    """Instrument the body of a `with` block, by default starting from zero."""
+    if reset:
+        stats.reset()
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield stats
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def summary() -> str:
+    """A table of the counts and timings recorded so far."""
+    return stats.summary()
+
+
+def _replace(original: _Any, wrapper: _Any) -> None:
+    _originals[wrapper] = original
+    _rebind(original, wrapper)
+
+
+def _rebind(old: _Any, new: _Any) -> None:
+    """Point every name bound to `old` in the package's modules at `new`.
+
+    Other modules import the functions under private aliases, e.g. `_shift_months`,
+    so each binding is swapped for calls made within the package to be counted.
+    """
+    for name, module in list(_sys.modules.items()):
+        if module is None or name.split(".")[0] != __package__:
+            continue
+        for attr, value in list(vars(module).items()):
+            if value is old:
+                setattr(module, attr, new)
+
+
+def _timed(path: str, function: Callable, *args: _Any, **kwargs: _Any) -> _Any:
+    start = _perf_counter()
+    result = function(*args, **kwargs)
+    stats.seconds[path] += _perf_counter() - start
+    stats.calls[path] += 1
+    return result
+
+
+def _shift_months(shift_months: Callable) -> Callable:
+    @_wraps(shift_months)
+    def wrapper(date, months):
+        shifted = _timed("shift_months", shift_months, date, months)
+        if shifted.day != date.day:
+            stats.branches["shift_months", "clamped"] += 1
+        return shifted
+
+    return wrapper
+
+
+def _radd(radd: Callable) -> Callable:
+    @_wraps(radd)
+    def wrapper(self, other):
+        result = _timed("RelativeDelta.__radd__", radd, self, other)
+        if result is not NotImplemented and hasattr(other, "day"):
+            if self._months:
+                stats.branches["RelativeDelta.__radd__", "months"] += 1
+                # Judged by the month shift alone, as the timedelta can move the day
+                days = _utils._shift_months_days(
+                    other.year, other.month, other.day, self._months
+                )
+                if (other + _utils._days(days)).day != other.day:
+                    stats.branches["RelativeDelta.__radd__", "clamped"] += 1
+            if self._timedelta:
+                stats.branches["RelativeDelta.__radd__", "timedelta"] += 1
+        return result
+
+    return wrapper
+
+
+def _difference(difference: Callable) -> Callable:
+    @_wraps(difference)
+    def wrapper(cls, d1, d2):
+        result = _timed("RelativeDelta.difference", difference, cls, d1, d2)
+        if d1 is not None and d2 is not None:
+            estimate = 12 * (d1.year - d2.year) + (d1.month - d2.month)
+            if result.total_months < estimate:
+                stats.branches["RelativeDelta.difference", "corrected down"] += 1
+            elif result.total_months > estimate:
+                stats.branches["RelativeDelta.difference", "corrected up"] += 1
+        return result
+
+    return wrapper
+
+
+def _iterator(iterator: Callable) -> Callable:
+    @_wraps(iterator)
+    def wrapper(*args, **kwargs):
+        rule = _timed("daterule.iterator", iterator, *args, **kwargs)
+        if rule.rolling_day is not None:
+            stats.branches["daterule.iterator", "rolling_day"] += 1
+        if rule.calendar is not None:
+            stats.branches["daterule.iterator", "calendar"] += 1
+        return rule
+
+    return wrapper
+
+
+def _iter(iterate: Callable) -> Callable:
+    @_wraps(iterate)
+    def wrapper(self):
+        return _timed_dates(self, iterate(self))
+
+    return wrapper
+
+
+def _timed_dates(rule: _daterule.DateRule, dates: Iterator) -> Iterator:
+    """Yield the dates of the rule, timing the generation of each."""
+    rolling_day, path = rule.rolling_day, "daterule.dates"
+    while True:
+        start = _perf_counter()
+        try:
+            current = next(dates)
+        except StopIteration:
+            return
+        finally:
+            stats.seconds[path] += _perf_counter() - start
+        stats.calls[path] += 1
+        if rolling_day is not None and current.day != rolling_day:
+            stats.branches[path, "clamped"] += 1
+        yield current
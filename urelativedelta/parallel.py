@@ -0,0 +1,240 @@
+"""Provides bulk versions of the shift and difference functions, run across cores.
+
+Large inputs are split into chunks, which are spread over a pool of worker
+processes, or of threads on free-threaded builds of CPython. Results are returned
+in the order of the inputs. Inputs no larger than a single chunk, or run with a
+single worker, are processed directly in the calling thread.
+
+Dates are passed to and from worker processes compactly as `Schedule`s, and
+relativedeltas as arrays of months and microseconds, which pickle several times
+faster than lists of python objects. Even so, process pools only pay off for large
+inputs, and larger chunks are usually faster.
+
+Examples
+--------
+>>> shifted = parallel.shift_months_many(dates, 3, workers=4)
+>>> deltas = parallel.difference_many(ends, starts)
+>>> rolled = parallel.apply_many(relativedelta(months=1), dates, calendar=calendar)
+"""
+from __future__ import annotations
+
+import sys as _sys
+from array import array as _array
+from concurrent.futures import (
+    ProcessPoolExecutor as _ProcessPoolExecutor,
+    ThreadPoolExecutor as _ThreadPoolExecutor,
+)
+from datetime import date as _date, datetime as _datetime, timedelta as _timedelta
+from os import cpu_count as _cpu_count
+from typing import TYPE_CHECKING as _TYPE_CHECKING, NamedTuple as _NamedTuple
+
+from .relativedelta import RelativeDelta as _RelativeDelta
+from .schedule import Schedule as _Schedule
+from .utils import shift_months as _shift_months
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import date, datetime
+    from typing import Any, TypeVar
+
+    from .calendar import BusinessCalendar
+
+    D = TypeVar("D", datetime, date)
+
+DEFAULT_CHUNKSIZE = 100_000
+_MICROSECOND = _timedelta(microseconds=1)
+
+
+def shift_months_many(
+    dates: Iterable[D],
+    months: int | Iterable[int],
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> list[D]:
+    """Shift many dates by the given number of months.
+
+    Parameters
+    ----------
+    dates : iterable of datetimes or dates
+        The dates to shift.
+    months : int or iterable of int
+        The number of months to shift every date by, or one number for each date.
+    workers : optional int
+        The most workers to use, by default one per cpu.
+    chunksize : int
+        The number of dates handled by a worker at a time.
+
+    Returns
+    -------
+    list of datetimes or dates
+        The shifted dates, in the same order.
+    """
+    dates = list(dates)
+    chunks: list[Any]
+    if isinstance(months, int):
+        chunks = [(chunk, months) for chunk in _chunked(dates, chunksize)]
+    else:
+        months = list(months)
+        if len(months) != len(dates):
+            raise ValueError("months should be an integer, or have one per date")
+        chunks = list(zip(_chunked(dates, chunksize), _chunked(months, chunksize)))
+
+    return _run(_shift_chunk, chunks, workers)
+
+
+def difference_many(
+    d1: Iterable[D],
+    d2: Iterable[D],
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> list[_RelativeDelta]:
+    """The relativedeltas between many pairs of dates, as `RelativeDelta.difference`.
+
+    Parameters
+    ----------
+    d1, d2 : iterables of datetimes or dates
+        The dates to find the differences `d1 - d2` between, pairwise.
+    workers : optional int
+        The most workers to use, by default one per cpu.
+    chunksize : int
+        The number of pairs handled by a worker at a time.
+
+    Returns
+    -------
+    list of RelativeDelta
+        The differences, in the same order.
+    """
+    d1, d2 = list(d1), list(d2)
+    if len(d1) != len(d2):
+        raise ValueError("d1 and d2 should have the same length")
+
+    chunks = list(zip(_chunked(d1, chunksize), _chunked(d2, chunksize)))
+    return _run(_difference_chunk, chunks, workers)
+
+
+def apply_many(
+    delta: _RelativeDelta,
+    dates: Iterable[D],
+    calendar: BusinessCalendar | None = None,
+    convention: str = "following",
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> list[D]:
+    """Apply a relativedelta to many dates, as `RelativeDelta.apply`.
+
+    Parameters
+    ----------
+    delta : RelativeDelta
+        The delta to add to each date.
+    dates : iterable of datetimes or dates
+        The dates to shift.
+    calendar : optional BusinessCalendar
+        The calendar of business days to roll the shifted dates to.
+    convention : str
+        The rolling convention, see `BusinessCalendar.roll`.
+    workers : optional int
+        The most workers to use, by default one per cpu.
+    chunksize : int
+        The number of dates handled by a worker at a time.
+
+    Returns
+    -------
+    list of datetimes or dates
+        The shifted dates, in the same order.
+    """
+    chunks = [
+        (delta, chunk, calendar, convention)
+        for chunk in _chunked(list(dates), chunksize)
+    ]
+    return _run(_apply_chunk, chunks, workers)
+
+
+def _chunked(items: list[Any], chunksize: int) -> list[list[Any]]:
+    if chunksize < 1:
+        raise ValueError("chunksize should be at least 1")
+    return [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+
+def _free_threaded() -> bool:
+    """Whether threads can run python code in parallel, i.e. the GIL is disabled."""
+    is_gil_enabled = getattr(_sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _run(
+    function: Callable[..., list[Any]], chunks: list[Any], workers: int | None
+) -> list[Any]:
+    """Apply the function to each chunk of arguments, concatenating the results."""
+    if workers is None:
+        workers = _cpu_count() or 1
+    workers = min(workers, len(chunks))
+
+    if workers <= 1:
+        return [item for chunk in chunks for item in function(*chunk)]
+
+    if _free_threaded():
+        with _ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(function, *zip(*chunks)))
+        return [item for result in results for item in result]
+
+    packed = [(function, *map(_pack, chunk)) for chunk in chunks]
+    with _ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_call_packed, *zip(*packed)))
+    return [item for result in results for item in _unpack(result)]
+
+
+def _call_packed(function: Callable[..., list], *args: Any) -> Any:
+    return _pack(function(*args))
+
+
+def _pack(value: Any) -> Any:
+    """Convert lists of dates or relativedeltas to a form which pickles quickly."""
+    if not isinstance(value, list) or not value:
+        return value
+
+    kind = type(value[0])
+    if kind is _RelativeDelta:
+        months = _array("q", [delta.total_months for delta in value])
+        microseconds = _array("q", [delta.timedelta // _MICROSECOND for delta in value])
+        return _PackedDeltas(months, microseconds)
+    if (kind is _date or kind is _datetime) and all(type(d) is kind for d in value):
+        try:
+            return _Schedule(value)
+        except ValueError:
+            pass  # datetimes with differing timezones
+    return value
+
+
+def _unpack(value: Any) -> list:
+    if isinstance(value, _PackedDeltas):
+        return [
+            _RelativeDelta._from_parts(months, _timedelta(microseconds=microseconds))
+            for months, microseconds in zip(value.months, value.microseconds)
+        ]
+    return list(value)
+
+
+class _PackedDeltas(_NamedTuple):
+    months: _array
+    microseconds: _array
+
+
+def _shift_chunk(dates: Iterable[Any], months: int | list[int]) -> list[Any]:
+    if isinstance(months, int):
+        return [_shift_months(d, months) for d in dates]
+    return list(map(_shift_months, dates, months))
+
+
+def _difference_chunk(d1: Iterable[Any], d2: Iterable[Any]) -> list[_RelativeDelta]:
+    return list(map(_RelativeDelta.difference, d1, d2))
+
+
+def _apply_chunk(
+    delta: _RelativeDelta,
+    dates: Iterable[Any],
+    calendar: BusinessCalendar | None,
+    convention: str,
+) -> list[Any]:
+    if calendar is None:
+        return [d + delta for d in dates]
+    return [delta.apply(d, calendar, convention) for d in dates]
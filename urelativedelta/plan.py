@@ -0,0 +1,234 @@
+"""Provides plans applying a chain of relativedeltas to dates in a single step.
+
+Adding relativedeltas to a date one at a time is not the same as adding their sum,
+since each shift by months can clamp the day to the end of a shorter month:
+>>> (date(2020, 1, 31) + relativedelta(months=1)) + relativedelta(months=1)
+date(2020, 3, 29)
+>>> date(2020, 1, 31) + relativedelta(months=2)
+date(2020, 3, 31)
+
+A `DeltaPlan` records the chain with these ordered semantics, but applies it to
+each date in one go: consecutive shifts by months are fused into a single shift
+(clamped to the shortest month passed through), and consecutive timedeltas are
+summed, so that only the final date is built:
+>>> plan = DeltaPlan() + relativedelta(months=1) + relativedelta(months=1) - relativedelta(days=3)
+>>> date(2020, 1, 31) + plan
+date(2020, 3, 26)
+>>> plan.apply_many(dates)
+
+The vectorised equivalent is `urelativedelta.vectorized.apply_plan`.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right as _bisect_right
+from datetime import date as _date, datetime as _datetime, timedelta as _timedelta
+from itertools import accumulate as _accumulate
+from typing import TYPE_CHECKING as _TYPE_CHECKING, NamedTuple as _NamedTuple
+
+from .relativedelta import RelativeDelta as _RelativeDelta
+from .utils import _MONTH_STARTS, _NUM_MONTHS, _days
+
+if _TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any, TypeVar, Union
+
+    D = TypeVar("D", _datetime, _date)
+    deltalike = Union[_RelativeDelta, _timedelta]
+
+_US_PER_DAY = 86_400_000_000
+_MICROSECOND = _timedelta(microseconds=1)
+_DAY = _timedelta(days=1)
+
+
+class _Segment(_NamedTuple):
+    """A run of shifts by months, followed by a run of timedeltas."""
+
+    # The running totals of the shifts by months, i.e. the months passed through
+    offsets: tuple[int, ...]
+    # The days added to dates, which (like `date + timedelta`) ignore the time of
+    # each timedelta, and the exact microseconds added to datetimes
+    days: int
+    microseconds: int
+    # The days moved by the shifts, and the last day they allow (see `_moves`),
+    # by the index of the starting month
+    moves: dict[int, tuple[int, int]]
+
+
+class DeltaPlan:
+    """An ordered chain of relativedeltas, applied to dates in a single step.
+
+    Adding a date to the plan gives the same result as adding each of its deltas
+    in turn. Plans are immutable: adding (or subtracting) a delta to a plan gives
+    a new plan, with the delta as its final step.
+
+    Parameters
+    ----------
+    *steps : relativedeltas or timedeltas
+        The deltas to add to dates, in order.
+    """
+
+    __slots__ = ("_steps", "_segments", "_timed")
+
+    _steps: tuple[_RelativeDelta, ...]
+    _segments: tuple[_Segment, ...]
+    _timed: bool
+
+    def __init__(self, *steps: deltalike):
+        self._steps = tuple(_as_relativedelta(step) for step in steps)
+        self._segments = _compile(self._steps)
+        # Steps of whole days move datetimes just as they do dates
+        self._timed = any(step.timedelta % _DAY for step in self._steps)
+
+    @property
+    def steps(self) -> tuple[_RelativeDelta, ...]:
+        """The relativedeltas of the plan, in the order they are applied."""
+        return self._steps
+
+    def __repr__(self) -> str:
+        return f"DeltaPlan({', '.join(map(repr, self._steps))})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, DeltaPlan):
+            return self._steps == other._steps
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._steps)
+
+    def __reduce__(self):
+        return (DeltaPlan, self._steps)
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def __add__(self, other: Any) -> DeltaPlan:
+        if isinstance(other, DeltaPlan):
+            return DeltaPlan(*self._steps, *other._steps)
+        if isinstance(other, (_RelativeDelta, _timedelta)):
+            return DeltaPlan(*self._steps, other)
+        return NotImplemented
+
+    def __sub__(self, other: Any) -> DeltaPlan:
+        if isinstance(other, (_RelativeDelta, _timedelta)):
+            return DeltaPlan(*self._steps, -other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, (_date, _datetime)):
+            return self.apply(other)
+        return NotImplemented
+
+    def apply(self, date: D) -> D:
+        """Apply each step of the plan to the date, in order."""
+        if self._timed and isinstance(date, _datetime):
+            return self._apply_datetime(date)
+
+        # The days moved so far, and the month and (zero-based) day reached
+        moved = 0
+        index = 12 * date.year + date.month - 13
+        day = date.day - 1
+        for offsets, days, _, moves in self._segments:
+            if offsets:
+                if index < 0:
+                    index, day = _locate(date.toordinal() + moved)
+                offset, last = moves.get(index) or _moves(index, offsets, moves)
+                if day > last:
+                    offset -= day - last
+                    day = last
+                moved += offset
+                index += offsets[-1]
+            if days:
+                moved += days
+                index = -1
+
+        return date + _days(moved)
+
+    def apply_many(self, dates: Iterable[D]) -> list[D]:
+        """Apply the plan to each of the dates, as `apply`."""
+        apply = self.apply
+        return [apply(date) for date in dates]
+
+    def _apply_datetime(self, date: _datetime) -> _datetime:
+        # As for dates, but tracking the time of day, carrying it into the date
+        moved = 0
+        index = 12 * date.year + date.month - 13
+        day = date.day - 1
+        time = initial = (
+            3600 * date.hour + 60 * date.minute + date.second
+        ) * 1_000_000 + date.microsecond
+        for offsets, _, microseconds, moves in self._segments:
+            if offsets:
+                if index < 0:
+                    index, day = _locate(date.toordinal() + moved)
+                offset, last = moves.get(index) or _moves(index, offsets, moves)
+                if day > last:
+                    offset -= day - last
+                    day = last
+                moved += offset
+                index += offsets[-1]
+            if microseconds:
+                days, time = divmod(time + microseconds, _US_PER_DAY)
+                moved += days
+                index = -1
+
+        shifted = date + _days(moved)
+        if time != initial:
+            shifted += _timedelta(microseconds=time - initial)
+        return shifted
+
+
+def _as_relativedelta(step: Any) -> _RelativeDelta:
+    if isinstance(step, _RelativeDelta):
+        return step
+    if isinstance(step, _timedelta):
+        return _RelativeDelta(timedelta=step)
+    raise TypeError(f"unsupported delta type: {type(step).__name__}")
+
+
+def _compile(steps: tuple[_RelativeDelta, ...]) -> tuple[_Segment, ...]:
+    """Group the steps into runs of months, each followed by a run of timedeltas."""
+    segments: list[_Segment] = []
+    months: list[int] = []
+    days = microseconds = 0
+    for step in steps:
+        if step.total_months:
+            if days or microseconds:
+                segments.append(_segment(months, days, microseconds))
+                months, days, microseconds = [], 0, 0
+            months.append(step.total_months)
+        if step.timedelta:
+            days += step.timedelta.days
+            microseconds += step.timedelta // _MICROSECOND
+    if months or days or microseconds:
+        segments.append(_segment(months, days, microseconds))
+    return tuple(segments)
+
+
+def _segment(months: list[int], days: int, microseconds: int) -> _Segment:
+    return _Segment(tuple(_accumulate(months)), days, microseconds, {})
+
+
+def _locate(ordinal: int) -> tuple[int, int]:
+    """The index of the month of an ordinal, and its (zero-based) day of the month."""
+    index = _bisect_right(_MONTH_STARTS, ordinal) - 1
+    return index, ordinal - _MONTH_STARTS[index]
+
+
+def _moves(
+    index: int, offsets: tuple[int, ...], moves: dict[int, tuple[int, int]]
+) -> tuple[int, int]:
+    """The days between the starts of the first and last months passed through, and
+    the last (zero-based) day of the shortest of them, which later days clamp to.
+    """
+    length = 31
+    for offset in offsets:
+        target = index + offset
+        if not 0 <= target < _NUM_MONTHS:
+            raise ValueError(f"year {1 + target // 12} is out of range")
+        length = min(length, _MONTH_STARTS[target + 1] - _MONTH_STARTS[target])
+
+    move = moves[index] = (
+        _MONTH_STARTS[index + offsets[-1]] - _MONTH_STARTS[index],
+        length - 1,
+    )
+    return move
@@ -4,11 +4,14 @@ from __future__ import annotations
 from datetime import date as _date, datetime as _datetime, timedelta as _pytimedelta
 from typing import TYPE_CHECKING as _TYPE_CHECKING
 
-from .utils import shift_months as _shift_months
+from .utils import _days, _shift_months_days, shift_months as _shift_months
 
 if _TYPE_CHECKING:
+    from collections.abc import Iterable
     from typing import Any, TypeVar
 
+    from .calendar import BusinessCalendar
+
     D = TypeVar("D", _datetime, _date)
 
 
@@ -16,24 +19,148 @@ _ZERO = _pytimedelta(0)
 
 
 class RelativeDelta:
-    """Represents relative difference between two dates."""
+    """Represents relative difference between two dates.
 
-    def __init__(
-        self,
+    Instances are immutable, and common values (e.g. zero or 1, 3, 6 and 12 months)
+    are shared rather than created afresh.
+    """
+
+    __slots__ = ("_months", "_timedelta")
+
+    _months: int
+    _timedelta: _pytimedelta
+
+    def __new__(
+        cls,
         years: int = 0,
         months: int = 0,
         timedelta: _pytimedelta | None = None,
         **delta_kwargs,
-    ):
-        self.total_months = months + 12 * years
+    ) -> RelativeDelta:
         if delta_kwargs:
-            self.timedelta = _pytimedelta(**delta_kwargs)
+            if len(delta_kwargs) == 1 and "days" in delta_kwargs:
+                delta = _days(delta_kwargs["days"])
+            else:
+                delta = _pytimedelta(**delta_kwargs)
             if timedelta is not None:
-                self.timedelta += timedelta
+                delta += timedelta
         elif timedelta is not None:
-            self.timedelta = timedelta
+            delta = timedelta
         else:
-            self.timedelta = _ZERO
+            delta = _ZERO
+
+        total_months = months + 12 * years
+        if not delta and cls is RelativeDelta:
+            interned = _INTERNED.get(total_months)
+            if interned is not None:
+                return interned
+
+        self = object.__new__(cls)
+        self._months = total_months
+        self._timedelta = delta
+        return self
+
+    @classmethod
+    def _from_parts(cls, total_months: int, timedelta: _pytimedelta) -> RelativeDelta:
+        """Create a relativedelta directly from its parts, skipping argument parsing."""
+        if not timedelta and cls is RelativeDelta:
+            interned = _INTERNED.get(total_months)
+            if interned is not None:
+                return interned
+
+        self = object.__new__(cls)
+        self._months = total_months
+        self._timedelta = timedelta
+        return self
+
+    @classmethod
+    def from_isoformat(cls, value: str) -> RelativeDelta:
+        """Create a relativedelta from an ISO 8601 duration, e.g. "P1Y2M10DT2H".
+
+        Years and months give `total_months`, while weeks (of 7 days), days, hours,
+        minutes and seconds give the `timedelta`. A leading minus sign negates the
+        whole duration ("-P1M"), and each component may also have its own sign
+        ("P1M-3D"), as written by `isoformat` for deltas mixing signs. The last
+        component other than years or months may be a decimal fraction ("PT0.5S").
+
+        Parsed strings are cached, so repeated strings give the same instance.
+
+        Raises
+        ------
+        ValueError
+            If the string is not an ISO 8601 duration.
+        """
+        if cls is RelativeDelta:
+            cached = _ISO_CACHE.get(value)
+            if cached is not None:
+                return cached
+
+        months, microseconds = _parse_isoformat(value)
+        delta = cls._from_parts(months, _pytimedelta(microseconds=microseconds))
+        if cls is RelativeDelta:
+            if len(_ISO_CACHE) >= _MAX_ISO_CACHE:
+                _ISO_CACHE.clear()
+            _ISO_CACHE[value] = delta
+        return delta
+
+    @classmethod
+    def from_isoformat_many(cls, values: Iterable[str]) -> list[RelativeDelta]:
+        """Create a relativedelta from each of the ISO 8601 durations, as
+        `from_isoformat`."""
+        from_isoformat = cls.from_isoformat
+        return [from_isoformat(value) for value in values]
+
+    def isoformat(self) -> str:
+        """The delta as an ISO 8601 duration, e.g. "P1Y2M10DT2H".
+
+        Negative deltas have a leading minus sign ("-P1M"), while deltas mixing
+        signs give their months, or their timedelta, negative components ("P1M-3D").
+        """
+        months, timedelta = self._months, self._timedelta
+        sign = ""
+        if months <= 0 and timedelta <= _ZERO and (months or timedelta):
+            sign, months, timedelta = "-", -months, -timedelta
+
+        parts = [sign, "P"]
+        if months:
+            month_sign = "-" if months < 0 else ""
+            years, months = divmod(abs(months), 12)
+            if years:
+                parts.append(f"{month_sign}{years}Y")
+            if months:
+                parts.append(f"{month_sign}{months}M")
+
+        time_sign = ""
+        if timedelta < _ZERO:
+            time_sign, timedelta = "-", -timedelta
+        if timedelta.days:
+            parts.append(f"{time_sign}{timedelta.days}D")
+
+        hours, seconds = divmod(timedelta.seconds, 3600)
+        minutes, seconds = divmod(seconds, 60)
+        if hours or minutes or seconds or timedelta.microseconds:
+            parts.append("T")
+        if hours:
+            parts.append(f"{time_sign}{hours}H")
+        if minutes:
+            parts.append(f"{time_sign}{minutes}M")
+        if timedelta.microseconds:
+            fraction = f"{timedelta.microseconds:06d}".rstrip("0")
+            parts.append(f"{time_sign}{seconds}.{fraction}S")
+        elif seconds:
+            parts.append(f"{time_sign}{seconds}S")
+
+        return "".join(parts) if len(parts) > 2 else "PT0S"
+
+    @property
+    def total_months(self) -> int:
+        """Months, including whole years, represented by this delta"""
+        return self._months
+
+    @property
+    def timedelta(self) -> _pytimedelta:
+        """The absolute component of this delta, applied after shifting months"""
+        return self._timedelta
 
     @classmethod
     def difference(cls, d1: D | None, d2: D | None) -> RelativeDelta:
@@ -44,9 +171,37 @@ class RelativeDelta:
         that is, it is the relativedelta equivalent of `d1 - d2`.
         """
         if d1 is None or d2 is None:
-            return cls()
+            return cls._from_parts(0, _ZERO)
+
+        if getattr(d1, "tzinfo", None) is not getattr(d2, "tzinfo", None):
+            return cls._difference_aware(d1, d2)
+
+        # We find the number of days from d2 to its shift by `months`, and compare
+        # with the days in `d1 - d2`, to avoid building any intermediate dates.
+        delta = d1 - d2
+        year, month, day = d2.year, d2.month, d2.day
+        months = 12 * (d1.year - year) + (d1.month - month)
+        days = _shift_months_days(year, month, day, months)
+
+        if delta.days >= 0:
+            if delta.days < days:
+                months -= 1
+                days = _shift_months_days(year, month, day, months)
+        elif delta.days > days or (
+            delta.days == days and (delta.seconds or delta.microseconds)
+        ):
+            months += 1
+            days = _shift_months_days(year, month, day, months)
 
-        # TODO: optimise this
+        return cls._from_parts(months, delta - _days(days))
+
+    @classmethod
+    def _difference_aware(cls, d1: D, d2: D) -> RelativeDelta:
+        """Difference between datetimes in differing timezones.
+
+        Shifting in local time can change the utc offset, so here we compare
+        actual shifted datetimes.
+        """
         months = 12 * (d1.year - d2.year) + (d1.month - d2.month)
 
         estimate = _shift_months(d2, months)
@@ -59,51 +214,82 @@ class RelativeDelta:
                 months += 1
                 estimate = _shift_months(d2, months)
 
-        timedelta = d1 - estimate
-
-        return RelativeDelta(months=months, timedelta=timedelta)
+        return cls._from_parts(months, d1 - estimate)
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, RelativeDelta):
-            return (
-                self.total_months == other.total_months
-                and self.timedelta == other.timedelta
-            )
+            return self._months == other._months and self._timedelta == other._timedelta
         elif isinstance(other, _pytimedelta):
-            return self.total_months == 0 and self.timedelta == other
+            return self._months == 0 and self._timedelta == other
         else:
             return False
 
     def __hash__(self):
-        return hash((self.total_months, self.timedelta))
+        return hash((self._months, self._timedelta))
+
+    def __reduce__(self):
+        return (self.__class__, (0, self._months, self._timedelta))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __bool__(self) -> bool:
-        return bool(self.total_months or self.timedelta)
+        return bool(self._months or self._timedelta)
 
     def __neg__(self) -> RelativeDelta:
-        return self.__class__(months=-self.total_months, timedelta=-self.timedelta)
+        return self._from_parts(-self._months, -self._timedelta)
 
     def __add__(self, other: Any) -> RelativeDelta:
         return self.__radd__(other)
 
     def __radd__(self, other):
         if isinstance(other, (_date, _datetime)):
-            if self.total_months:
-                other = _shift_months(other, self.total_months)
-            if self.timedelta:
-                other += self.timedelta
+            if self._months:
+                fold = isinstance(other, _datetime) and other.fold
+                other += _days(
+                    _shift_months_days(other.year, other.month, other.day, self._months)
+                )
+                if fold:
+                    # Adding a timedelta resets fold, which replace would have kept
+                    other = other.replace(fold=1)
+            if self._timedelta:
+                other += self._timedelta
             return other
         elif isinstance(other, RelativeDelta):
-            months = self.total_months + other.total_months
-            delta = self.timedelta + other.timedelta
-            return self.__class__(months=months, timedelta=delta)
+            return self._from_parts(
+                self._months + other._months, self._timedelta + other._timedelta
+            )
         elif isinstance(other, _pytimedelta):
-            months = self.total_months
-            delta = self.timedelta + other
-            return self.__class__(months=months, timedelta=delta)
+            return self._from_parts(self._months, self._timedelta + other)
         else:
             return NotImplemented
 
+    def apply(
+        self,
+        date: D,
+        calendar: BusinessCalendar | None = None,
+        convention: str = "following",
+    ) -> D:
+        """Add this delta to a date, then roll the result to a business day.
+
+        Parameters
+        ----------
+        date : datetime or date
+            The date to shift.
+        calendar : optional BusinessCalendar
+            The calendar of business days to roll to. If not given, this is the
+            same as `date + self`.
+        convention : str
+            The rolling convention, see `BusinessCalendar.roll`.
+        """
+        shifted = date + self
+        if calendar is None:
+            return shifted
+        return calendar.roll(shifted, convention)
+
     def __sub__(self, other: Any) -> RelativeDelta:
         return self + (-other)
 
@@ -111,32 +297,123 @@ class RelativeDelta:
         return other + (-self)
 
     def __mul__(self, n: int) -> RelativeDelta:
-        return self.__class__(
-            months=self.total_months * n, timedelta=self.timedelta * n
-        )
+        return self._from_parts(self._months * n, self._timedelta * n)
 
     def __rmul__(self, n: int) -> RelativeDelta:
         return self * n
 
     def __floordiv__(self, n: int) -> RelativeDelta:
-        return self.__class__(
-            months=self.total_months // n, timedelta=self.timedelta // n
-        )
+        return self._from_parts(self._months // n, self._timedelta // n)
 
     def __repr__(self) -> str:
-        return f"relativedelta(months={self.total_months}, timedelta={self.timedelta})"
+        return f"relativedelta(months={self._months}, timedelta={self._timedelta})"
 
     def years(self) -> int:
         """Years represented by this delta"""
-        return self.total_months // 12
+        return self._months // 12
 
     def months(self) -> int:
         """Months, excluding whole years, represented by this delta"""
-        return self.total_months % 12
+        return self._months % 12
 
     def days(self) -> int:
         """Days, excluding months and years, represented by this delta"""
-        return self.timedelta.days
-
+        return self._timedelta.days
+
+
+_DAY_US = 86_400_000_000
+# The designators of the date and time parts of a duration, in their order, with
+# the months and microseconds of each unit
+_DATE_DESIGNATORS = (
+    ("Y", 12, 0),
+    ("M", 1, 0),
+    ("W", 0, 7 * _DAY_US),
+    ("D", 0, _DAY_US),
+)
+_TIME_DESIGNATORS = (
+    ("H", 0, 3_600_000_000),
+    ("M", 0, 60_000_000),
+    ("S", 0, 1_000_000),
+)
+
+# Durations mostly come from config and messages, which repeat the same few
+# strings. The values are immutable, so sharing them between threads is safe: at
+# worst a race parses a string twice, or clears the cache early.
+_ISO_CACHE: dict[str, RelativeDelta] = {}
+_MAX_ISO_CACHE = 4096
+
+
+def _parse_isoformat(value: str) -> tuple[int, int]:
+    """The total months and microseconds of an ISO 8601 duration.
+
+    Rather than matching a regular expression, each designator is found in turn
+    with `str.find`, so only the numbers are copied out of the string.
+    """
+    sign, start, end = 1, 0, len(value)
+    if value[:1] == "-" or value[:1] == "+":
+        sign, start = (-1 if value[0] == "-" else 1), 1
+    if value[start : start + 1] != "P" or start + 1 == end:
+        raise ValueError(f"invalid ISO 8601 duration: {value!r}")
+
+    time = value.find("T", start)
+    if time < 0:
+        time = end
+    elif time + 1 == end:
+        raise ValueError(f"invalid ISO 8601 duration: {value!r}")
+
+    months = microseconds = 0
+    position, last = start + 1, -1
+    for designators, stop in ((_DATE_DESIGNATORS, time), (_TIME_DESIGNATORS, end)):
+        for designator, unit_months, unit_microseconds in designators:
+            found = value.find(designator, position, stop)
+            if found < 0:
+                continue
+            if last >= 0:
+                raise ValueError(
+                    f"invalid ISO 8601 duration: {value!r} (only the last "
+                    "component, other than years or months, may be fractional)"
+                )
+
+            number = value[position:found]
+            negative = number[:1] == "-"
+            if negative:
+                number = number[1:]
+            if number.isdigit() and number.isascii():
+                amount = int(number)
+                months += -amount * unit_months if negative else amount * unit_months
+                amount *= unit_microseconds
+            else:
+                whole, _, fraction = number.replace(",", ".").partition(".")
+                digits = whole + fraction
+                if unit_months or not (whole and fraction and digits.isdigit()):
+                    raise ValueError(f"invalid ISO 8601 duration: {value!r}")
+                if not digits.isascii():
+                    raise ValueError(f"invalid ISO 8601 duration: {value!r}")
+                # Fractions finer than a microsecond are truncated, as for timedelta
+                amount = int(whole) * unit_microseconds
+                amount += int(fraction) * unit_microseconds // 10 ** len(fraction)
+                last = found
+            microseconds += -amount if negative else amount
+            position = found + 1
+
+        if position != stop:
+            raise ValueError(f"invalid ISO 8601 duration: {value!r}")
+        if stop == end:
+            break
+        position = stop + 1
+
+    return sign * months, sign * microseconds
+
+
+def _intern(total_months: int) -> RelativeDelta:
+    self = object.__new__(RelativeDelta)
+    self._months = total_months
+    self._timedelta = _ZERO
+    return self
+
+
+# Instances are immutable, so the most common deltas can be shared (between
+# threads too, as this is never modified after import)
+_INTERNED = {months: _intern(months) for months in (0, 1, 3, 6, 12, -1, -3, -6, -12)}
 
 relativedelta = RelativeDelta  # XXX: alias for consistency with timedelta and dateutil
@@ -0,0 +1,167 @@
+"""Provides a compact container for materialised schedules of dates.
+
+A `Schedule` stores dates as an `array('i')` of proleptic ordinals, and datetimes
+as an `array('q')` of microseconds since 1970-01-01 (in local time, sharing the
+`tzinfo` of the schedule), building `date` and `datetime` objects only when they
+are accessed. This takes 4 or 8 bytes per date rather than the 32 to 48 of a
+python object in a list.
+
+The underlying array is available as `schedule.values` (and, from python 3.12,
+through the buffer protocol), so can be handed to numpy without copying:
+>>> schedule = daterule.monthly(date(2020, 1, 31), count=3).materialise()
+>>> np.frombuffer(schedule.values, dtype=np.int32)
+array([737455, 737484, 737515], dtype=int32)
+>>> np.asarray(schedule)
+array(['2020-01-31', '2020-02-29', '2020-03-31'], dtype='datetime64[D]')
+"""
+from __future__ import annotations
+
+from array import array as _array
+from collections.abc import Sequence as _Sequence
+from datetime import date as _date, datetime as _datetime, timedelta as _timedelta
+from typing import TYPE_CHECKING as _TYPE_CHECKING, TypeVar as _TypeVar
+
+if _TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from datetime import tzinfo
+    from typing import Any
+
+D = _TypeVar("D", _datetime, _date)
+
+_EPOCH_ORDINAL = _date(1970, 1, 1).toordinal()
+_US_PER_DAY = 86_400_000_000
+_MICROSECOND = _timedelta(microseconds=1)
+
+
+class Schedule(_Sequence[D]):
+    """An immutable sequence of dates, or of datetimes, stored compactly.
+
+    Parameters
+    ----------
+    dates : iterable of datetimes or dates
+        The dates of the schedule. Datetimes must all share the same `tzinfo`.
+    """
+
+    __slots__ = ("_values", "_tzinfo")
+
+    _values: _array | memoryview
+    _tzinfo: tzinfo | None
+
+    def __init__(self, dates: Iterable[D] = ()):
+        items: list[Any] = list(dates)
+        if items and isinstance(items[0], _datetime):
+            tz = items[0].tzinfo
+            if any(d.tzinfo is not tz for d in items):
+                raise ValueError("the datetimes of a schedule must share a tzinfo")
+            epoch = _datetime(1970, 1, 1, tzinfo=tz)
+            self._values = _array("q", [(d - epoch) // _MICROSECOND for d in items])
+            self._tzinfo = tz
+        else:
+            self._values = _array("i", [d.toordinal() for d in items])
+            self._tzinfo = None
+
+    @classmethod
+    def _from_values(
+        cls, values: _array | memoryview, tz: tzinfo | None = None
+    ) -> Schedule:
+        """A schedule directly over an ordinal ("i") or microsecond ("q") array.
+
+        The values may also be a memoryview of that format, e.g. into shared memory.
+        """
+        self = object.__new__(cls)
+        self._values = values
+        self._tzinfo = tz
+        return self
+
+    @classmethod
+    def _from_ordinals(cls, ordinals: _array, start: D) -> Schedule[D]:
+        """The schedule of the given ordinals, at the time of day of `start`."""
+        if not isinstance(start, _datetime):
+            return cls._from_values(ordinals)
+
+        seconds = 3600 * start.hour + 60 * start.minute + start.second
+        offset = 1_000_000 * seconds + start.microsecond - _EPOCH_ORDINAL * _US_PER_DAY
+        values = _array("q", [_US_PER_DAY * ordinal + offset for ordinal in ordinals])
+        return cls._from_values(values, start.tzinfo)
+
+    @property
+    def values(self) -> _array | memoryview:
+        """The underlying array (or memoryview) of ordinals, or of microseconds."""
+        return self._values
+
+    @property
+    def is_datetime(self) -> bool:
+        """Whether the schedule holds datetimes rather than dates."""
+        return self._values.itemsize == 8
+
+    @property
+    def tzinfo(self) -> tzinfo | None:
+        """The timezone shared by the datetimes of the schedule."""
+        return self._tzinfo
+
+    @property
+    def nbytes(self) -> int:
+        """The memory taken by the stored dates."""
+        return len(self._values) * self._values.itemsize
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._from_values(self._values[index], self._tzinfo)
+        return self._converter()(self._values[index])
+
+    def __iter__(self) -> Iterator[D]:
+        return map(self._converter(), self._values)
+
+    def __reversed__(self) -> Iterator[D]:
+        return map(self._converter(), reversed(self._values))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Schedule):
+            return (
+                self.is_datetime == other.is_datetime
+                and self._tzinfo == other._tzinfo
+                and self._values == other._values
+            )
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Schedule({list(self)!r})"
+
+    def __reduce__(self):
+        values = self._values
+        if isinstance(values, memoryview):
+            values = _array("q" if self.is_datetime else "i", values.tobytes())
+        return (self._from_values, (values, self._tzinfo))
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(self._values)
+
+    def __array__(self, dtype: Any = None) -> Any:
+        import numpy as np
+
+        if self.is_datetime:
+            arr = np.frombuffer(self._values, dtype="datetime64[us]")
+            arr.flags.writeable = False  # schedules are immutable
+        else:
+            ordinals = np.frombuffer(self._values, dtype=np.int32)
+            arr = (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+        return arr if dtype is None else arr.astype(dtype)
+
+    def _converter(self) -> Callable[[int], Any]:
+        """A function building the date (or datetime) for each stored value."""
+        if not self.is_datetime:
+            return _date.fromordinal
+
+        epoch = _datetime(1970, 1, 1, tzinfo=self._tzinfo)
+
+        def convert(value: int) -> _datetime:
+            return epoch + _timedelta(microseconds=value)
+
+        return convert
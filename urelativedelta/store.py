@@ -0,0 +1,168 @@
+"""Provides a memory-mapped store of schedules, shared between processes.
+
+A store is written once, by materialising a collection of finite rules into a
+single file of ordinal arrays, together with an index from the parameters of
+each rule to the position of its dates. Any number of processes can then open
+the file, and get the `Schedule` of a rule as a read-only view into the mapped
+memory, without regenerating or copying its dates.
+
+Examples
+--------
+>>> rules = [daterule.monthly(start, count=360) for start in starts]
+>>> store = ScheduleStore.create("schedules.bin", rules)
+>>> with ProcessPoolExecutor() as pool:
+...     pool.map(value_trade, trades, itertools.repeat(store))
+
+where each worker looks up its schedules in the store (which is passed between
+processes by its path):
+>>> schedule = store.materialise(daterule.monthly(trade.start, count=360))
+"""
+from __future__ import annotations
+
+import mmap as _mmap
+import pickle as _pickle
+import struct as _struct
+from threading import Lock as _Lock
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+from .schedule import Schedule as _Schedule
+
+if _TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import date, datetime, tzinfo
+    from os import PathLike
+    from typing import TypeVar, Union
+
+    from .daterule import DateRule
+    from .schedule import Schedule
+
+    D = TypeVar("D", datetime, date)
+    StrPath = Union[str, PathLike[str]]
+
+
+_MAGIC = b"URDSCHED"
+_VERSION = 1
+# The magic bytes, version, and the offset and size of the pickled index
+_HEADER = _struct.Struct("<8sIQQ")
+
+
+class ScheduleStore:
+    """A read-only, memory-mapped file of schedules, keyed on rule parameters.
+
+    Use `ScheduleStore.create` to write a new store. Stores are pickled by their
+    path, so can be passed to worker processes, which reopen the same file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        The file holding the store.
+    """
+
+    def __init__(self, path: StrPath):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = _Lock()
+
+        with open(path, "rb") as f:
+            self._mmap = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+
+        magic, version, index_offset, index_size = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path!r} is not a schedule store")
+
+        index = self._mmap[index_offset : index_offset + index_size]
+        self._index: dict[str, tuple[str, int, int, tzinfo | None]] = _pickle.loads(
+            index
+        )
+        self._memory = memoryview(self._mmap)
+
+    @classmethod
+    def create(cls, path: StrPath, rules: Iterable[DateRule]) -> ScheduleStore:
+        """Write the schedules of the given finite rules to a new store.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The file to write, replacing any existing file.
+        rules : iterable of DateRule
+            The rules to materialise. Equal rules are stored once.
+
+        Returns
+        -------
+        ScheduleStore
+            The new store, opened for reading.
+        """
+        index: dict[str, tuple[str, int, int, tzinfo | None]] = {}
+        with open(path, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            offset = _HEADER.size
+
+            for rule in rules:
+                key = _stable_key(rule)
+                if key in index:
+                    continue
+
+                schedule = rule.materialise()
+                values = schedule.values
+                # Keep every array aligned to its items, for numpy
+                padding = -offset % 8
+                f.write(bytes(padding))
+                offset += padding
+
+                typecode = "q" if schedule.is_datetime else "i"
+                index[key] = (typecode, offset, len(values), schedule.tzinfo)
+                f.write(values)
+                offset += schedule.nbytes
+
+            pickled = _pickle.dumps(index)
+            f.write(pickled)
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, _VERSION, offset, len(pickled)))
+
+        return cls(path)
+
+    def __repr__(self) -> str:
+        return f"ScheduleStore({self.path!r})"
+
+    def __reduce__(self):
+        return (type(self), (self.path,))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, rule: DateRule) -> bool:
+        return _stable_key(rule) in self._index
+
+    def materialise(self, rule: DateRule[D]) -> Schedule[D]:
+        """The schedule of the given finite rule.
+
+        Rules in the store are returned as views into the mapped file, while others
+        are materialised afresh.
+        """
+        entry = self._index.get(_stable_key(rule))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return rule.materialise()
+
+        with self._lock:
+            self.hits += 1
+
+        typecode, offset, length, tz = entry
+        itemsize = 8 if typecode == "q" else 4
+        values = self._memory[offset : offset + itemsize * length].cast(typecode)
+        return _Schedule._from_values(values, tz)
+
+    def close(self) -> None:
+        """Unmap the file. Schedules taken from the store must be released first."""
+        self._memory.release()
+        self._mmap.close()
+
+
+def _stable_key(rule: DateRule) -> str:
+    """A key for the rule's parameters, which is the same in every process.
+
+    Unlike hashes, the reprs of the parameters don't vary between processes.
+    """
+    return repr(rule._key())
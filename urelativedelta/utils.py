@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING as _TYPE_CHECKING
+from datetime import timedelta as _timedelta
+from typing import TYPE_CHECKING as _TYPE_CHECKING, Final as _Final
 
 if _TYPE_CHECKING:
     from datetime import date, datetime
@@ -9,13 +10,58 @@ if _TYPE_CHECKING:
     D = TypeVar("D", date, datetime)
 
 
-_THIRTY_DAY_MONTHS = {4, 6, 9, 11}
+_THIRTY_DAY_MONTHS: _Final = {4, 6, 9, 11}
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
 
 def is_leap_year(year: int) -> bool:
     return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
 
 
+def _build_month_starts() -> list[int]:
+    """The proleptic ordinal of the first day of each month in years 1 to 9999.
+
+    Month `(year, month)` lives at index `12 * year + month - 13`. A final entry
+    holds the ordinal Jan 1st 10000 would have, so that the length of every month
+    is the difference between consecutive entries.
+    """
+    # The gregorian calendar repeats every 400 years (146097 days), so we build
+    # a single cycle and then offset it.
+    cycle = []
+    ordinal = 1
+    for year in range(1, 401):
+        leap = is_leap_year(year)
+        for month, length in enumerate(_DAYS_IN_MONTH, 1):
+            cycle.append(ordinal)
+            ordinal += length + (leap and month == 2)
+
+    starts = [start + 146097 * n for n in range(25) for start in cycle]
+    del starts[12 * 9999 + 1 :]
+    return starts
+
+
+# Final lets the compiled build (see the README) read these without a lookup
+_MONTH_STARTS: _Final = _build_month_starts()
+_NUM_MONTHS: _Final = len(_MONTH_STARTS) - 1
+
+# Building a timedelta is several times slower than adding one to a date, and a
+# given shift only ever moves dates by a handful of distinct day counts.
+# The cache is safe to share between threads, including on free-threaded builds:
+# its values are immutable and a lost race only means building a timedelta twice.
+_DAY_DELTAS: _Final[dict[int, _timedelta]] = {}
+_MAX_DAY_DELTAS: _Final = 1 << 16
+
+
+def _days(days: int) -> _timedelta:
+    """A (cached) timedelta of the given number of days."""
+    delta = _DAY_DELTAS.get(days)
+    if delta is None:
+        if len(_DAY_DELTAS) >= _MAX_DAY_DELTAS:
+            _DAY_DELTAS.clear()
+        delta = _DAY_DELTAS[days] = _timedelta(days)
+    return delta
+
+
 def _normalise_day(year: int, month: int, day: int) -> int:
     """Shift the day backwards until it lies in the month.
 
@@ -50,12 +96,32 @@ def _shift_months_impl(
     return year, month, day
 
 
+def _shift_months_days(year: int, month: int, day: int, months: int) -> int:
+    """The number of days by which shifting a date by the given months moves it.
+
+    Ambiguous month-ends are shifted backwards as necessary. Working in days means
+    callers only need to build a single new date, via one timedelta addition."""
+    index = 12 * year + month - 13
+    target = index + months
+    if not 0 <= target < _NUM_MONTHS:
+        raise ValueError(f"year {1 + target // 12} is out of range")
+
+    start = _MONTH_STARTS[target]
+    length = _MONTH_STARTS[target + 1] - start
+    if day > length:
+        return start - _MONTH_STARTS[index] + length - day
+    return start - _MONTH_STARTS[index]
+
+
 def shift_months(date: D, months: int) -> D:
     """Shift a date by the given number of months.
 
     Ambiguous month-ends are shifted backwards as necessary."""
-    year, month, day = _shift_months_impl(date.year, date.month, date.day, months)
-    return date.replace(year=year, month=month, day=day)
+    if getattr(date, "fold", 0):
+        # Adding a timedelta would reset fold, so ambiguous times keep replace
+        year, month, day = _shift_months_impl(date.year, date.month, date.day, months)
+        return date.replace(year=year, month=month, day=day)
+    return date + _days(_shift_months_days(date.year, date.month, date.day, months))
 
 
 def shift_years(date: D, years: int) -> D:
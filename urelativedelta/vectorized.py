@@ -0,0 +1,571 @@
+"""Vectorised shift functions operating on numpy datetime64 arrays.
+
+These mirror the functions in `urelativedelta.utils`, but act on whole arrays
+of dates at once without creating any python `date` objects. They require numpy,
+which is available via the `numpy` extra:
+
+    pip install urelativedelta[numpy]
+
+Examples
+--------
+>>> dates = np.array(["2020-01-31", "2020-03-31"], dtype="datetime64[D]")
+>>> vectorized.shift_months(dates, 1)
+array(['2020-02-29', '2020-04-30'], dtype='datetime64[D]')
+
+The difference between paired arrays of dates is returned as a compact
+`RelativeDeltaArray` rather than as many `RelativeDelta` objects:
+>>> d1 = np.array(["2020-02-29", "2020-02-28"], dtype="datetime64[D]")
+>>> d2 = np.array(["2020-01-31", "2020-01-31"], dtype="datetime64[D]")
+>>> vectorized.difference(d1, d2)
+RelativeDeltaArray(total_months=array([1, 0]), timedelta=array([ 0, 28], dtype='timedelta64[D]'))
+
+The schedules of a daterule for many start dates can be generated in bulk:
+>>> starts = np.array(["2020-01-31", "2021-06-15"], dtype="datetime64[D]")
+>>> vectorized.schedules(relativedelta(months=1), starts, counts=[3, 2])
+array([['2020-01-31', '2020-02-29', '2020-03-31'],
+       ['2021-06-15', '2021-07-15',        'NaT']], dtype='datetime64[D]')
+
+Year fractions for a whole schedule come from a single call:
+>>> vectorized.year_fraction(schedule[:-1], schedule[1:], "ACT/360")
+
+A chain of relativedeltas recorded in a `DeltaPlan` is applied in one pass:
+>>> vectorized.apply_plan(dates, DeltaPlan(relativedelta(months=1), relativedelta(months=1)))
+array(['2020-03-29', '2020-05-30'], dtype='datetime64[D]')
+
+Dates can be rolled to the business days of a `BusinessCalendar`:
+>>> vectorized.roll(dates, calendar, "modified_following")
+
+NaT values are propagated unchanged, and the time component of finer-grained
+arrays (e.g. `datetime64[ns]`) is preserved.
+"""
+from __future__ import annotations
+
+from datetime import datetime as _datetime, timedelta as _timedelta
+from typing import TYPE_CHECKING as _TYPE_CHECKING, NamedTuple as _NamedTuple
+
+import numpy as _np
+
+from .calendar import CONVENTIONS as _CONVENTIONS
+from .daterule import DateRule as _DateRule, _direction
+from .daycount import CONVENTIONS as _DAY_COUNTS
+from .relativedelta import RelativeDelta as _RelativeDelta
+
+if _TYPE_CHECKING:
+    from datetime import date
+    from typing import Union
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from .calendar import BusinessCalendar
+    from .plan import DeltaPlan
+
+    deltalike = Union[_RelativeDelta, _timedelta, "RelativeDeltaArray"]
+
+
+_EPOCH_ORDINAL = _datetime(1970, 1, 1).toordinal()
+
+
+class RelativeDeltaArray(_NamedTuple):
+    """Many relativedeltas, stored as an array of months and an array of timedeltas.
+
+    Element `i` corresponds to `relativedelta(months=total_months[i], timedelta=timedelta[i])`.
+    """
+
+    total_months: NDArray[_np.int64]
+    timedelta: NDArray[_np.timedelta64]
+
+    def tolist(self) -> list[_RelativeDelta | None]:
+        """Convert to a (flat) list of `RelativeDelta` objects.
+
+        Elements with a NaT timedelta, such as the differences of NaT dates, give
+        None rather than a relativedelta.
+        """
+        return [
+            None
+            if timedelta is None
+            else _RelativeDelta(months=months, timedelta=timedelta)
+            for months, timedelta in zip(
+                self.total_months.ravel().tolist(),
+                self.timedelta.astype("m8[us]").ravel().tolist(),
+            )
+        ]
+
+
+def _as_datetime64(dates: ArrayLike) -> NDArray[_np.datetime64]:
+    """Convert the input to a datetime64 array with at least daily resolution."""
+    arr = _np.asarray(dates)
+    if arr.dtype.kind != "M":
+        arr = arr.astype("datetime64")
+    if _np.datetime_data(arr.dtype)[0] in ("Y", "M", "W"):
+        arr = arr.astype("datetime64[D]")
+    return arr
+
+
+def _as_timedelta64(delta: _timedelta) -> _np.timedelta64:
+    """Convert a timedelta, keeping whole days in daily resolution."""
+    if delta.seconds or delta.microseconds:
+        return _np.timedelta64(delta)
+    return _np.timedelta64(delta.days, "D")
+
+
+def _as_integers(values: ArrayLike, name: str) -> NDArray[_np.int64]:
+    arr = _np.asarray(values)
+    if arr.dtype.kind not in "iu":
+        raise TypeError(f"{name} should be an integer or an array of integers")
+    return arr.astype(_np.int64, copy=False)
+
+
+def _shift_months_impl(
+    dates: NDArray[_np.datetime64], months: NDArray[_np.int64]
+) -> NDArray[_np.datetime64]:
+    """Shift datetime64 values by the given number of months.
+
+    Ambiguous month-ends are shifted backwards as necessary."""
+    days = dates.astype("datetime64[D]")
+    month_starts = days.astype("datetime64[M]")
+    day = days - month_starts.astype("datetime64[D]")  # zero-based day of month
+
+    target = month_starts + months
+    target_start = target.astype("datetime64[D]")
+    month_length = (target + 1).astype("datetime64[D]") - target_start
+    day = _np.minimum(day, month_length - 1)
+
+    return target_start + day + (dates - days)
+
+
+def shift_months(dates: ArrayLike, months: ArrayLike) -> NDArray[_np.datetime64]:
+    """Shift an array of dates by the given number of months.
+
+    `months` may be a single integer or an array broadcastable against `dates`.
+    Ambiguous month-ends are shifted backwards as necessary."""
+    return _shift_months_impl(_as_datetime64(dates), _as_integers(months, "months"))
+
+
+def shift_years(dates: ArrayLike, years: ArrayLike) -> NDArray[_np.datetime64]:
+    """Shift an array of dates by the given number of years.
+
+    `years` may be a single integer or an array broadcastable against `dates`.
+    Ambiguous month-ends are shifted backwards as necessary."""
+    return shift_months(dates, _as_integers(years, "years") * 12)
+
+
+def with_day(dates: ArrayLike, day: ArrayLike) -> NDArray[_np.datetime64]:
+    """Shift an array of dates to have the given day.
+
+    Ambiguous month-ends are shifted backwards as necessary.
+    """
+    dates = _as_datetime64(dates)
+    day = _as_integers(day, "day")
+    if _np.any((day < 1) | (day > 31)):
+        raise ValueError("day should be between 1 and 31")
+
+    days = dates.astype("datetime64[D]")
+    month_starts = days.astype("datetime64[M]")
+    start = month_starts.astype("datetime64[D]")
+    month_length = (month_starts + 1).astype("datetime64[D]") - start
+    target = _np.minimum(day - 1, month_length - 1)
+
+    return start + target + (dates - days)
+
+
+def with_month(dates: ArrayLike, month: ArrayLike) -> NDArray[_np.datetime64]:
+    """Shift an array of dates to have the given month.
+
+    Ambiguous month-ends are shifted backwards as necessary.
+    """
+    dates = _as_datetime64(dates)
+    month = _as_integers(month, "month")
+    if _np.any((month < 1) | (month > 12)):
+        raise ValueError("month should be between 1 and 12")
+
+    current = dates.astype("datetime64[M]").astype(_np.int64) % 12 + 1
+    return _shift_months_impl(dates, month - current)
+
+
+def with_year(dates: ArrayLike, year: ArrayLike) -> NDArray[_np.datetime64]:
+    """Shift an array of dates to have the given year.
+
+    Ambiguous month-ends are shifted backwards as necessary.
+    """
+    dates = _as_datetime64(dates)
+    year = _as_integers(year, "year")
+
+    current = dates.astype("datetime64[Y]").astype(_np.int64) + 1970
+    return _shift_months_impl(dates, (year - current) * 12)
+
+
+def add(dates: ArrayLike, delta: deltalike) -> NDArray[_np.datetime64]:
+    """Add a relativedelta (or an array of them) to an array of dates.
+
+    This is the vectorised equivalent of `date + delta`: dates are first shifted
+    by whole months, and then by the remaining timedelta. As for python dates,
+    arrays of days are only shifted by the whole days of the timedelta.
+    """
+    dates = _as_datetime64(dates)
+    if isinstance(delta, _timedelta):
+        months: int | NDArray[_np.int64] = 0
+        timedelta: _np.timedelta64 | NDArray[_np.timedelta64] = _as_timedelta64(delta)
+    elif isinstance(delta, _RelativeDelta):
+        months = delta.total_months
+        timedelta = _as_timedelta64(delta.timedelta)
+    elif isinstance(delta, RelativeDeltaArray):
+        months, timedelta = delta
+    else:
+        raise TypeError(f"unsupported delta type: {type(delta).__name__}")
+
+    if _np.datetime_data(dates.dtype)[0] == "D":
+        timedelta = timedelta.astype("timedelta64[D]")  # as for python dates
+    if isinstance(delta, _timedelta):
+        return dates + timedelta
+    return _shift_months_impl(dates, _as_integers(months, "months")) + timedelta
+
+
+def apply_plan(dates: ArrayLike, plan: DeltaPlan) -> NDArray[_np.datetime64]:
+    """Apply each step of a `DeltaPlan` to an array of dates, in order.
+
+    This is the vectorised equivalent of `date + plan`. As for the plan, each run of
+    shifts by months is made in a single pass, clamping days to the shortest month
+    passed through, and each run of timedeltas is added at once. As with `add`,
+    timedeltas are added exactly, i.e. with the semantics of datetimes.
+    """
+    shifted = _as_datetime64(dates)
+    for offsets, _, microseconds, _ in plan._segments:
+        if offsets:
+            days = shifted.astype("datetime64[D]")
+            month_starts = days.astype("datetime64[M]")
+            day = days - month_starts.astype("datetime64[D]")
+            for offset in offsets:
+                target = month_starts + offset
+                length = (target + 1).astype("datetime64[D]") - target.astype(
+                    "datetime64[D]"
+                )
+                day = _np.minimum(day, length - 1)
+            shifted = target.astype("datetime64[D]") + day + (shifted - days)
+        if microseconds:
+            shifted = shifted + _as_timedelta64(_timedelta(microseconds=microseconds))
+    return shifted
+
+
+def difference(d1: ArrayLike, d2: ArrayLike) -> RelativeDeltaArray:
+    """Compute the relativedeltas between two arrays of dates.
+
+    This is the vectorised equivalent of `RelativeDelta.difference` and is
+    guaranteed to satisfy, element by element,
+    >>> add(d2, difference(d1, d2)) == d1
+    Pairs containing NaT give zero months and a NaT timedelta.
+    """
+    d1, d2 = _np.broadcast_arrays(_as_datetime64(d1), _as_datetime64(d2))
+    missing = _np.isnat(d1) | _np.isnat(d2)
+
+    months = d1.astype("datetime64[M]").astype(_np.int64) - d2.astype(
+        "datetime64[M]"
+    ).astype(_np.int64)
+    # Scalar inputs give 0-d arrays, so mask with `where` rather than assignment
+    months = _np.where(missing, 0, months)
+
+    # The estimate lies in the same month as d1 and so can overshoot it by at most
+    # one month, depending on the direction of the shift.
+    estimate = _shift_months_impl(d2, months)
+    forwards = d1 >= d2
+    months -= forwards & (estimate > d1)
+    months += ~forwards & (estimate < d1)
+    estimate = _shift_months_impl(d2, months)
+
+    return RelativeDeltaArray(months, d1 - estimate)
+
+
+def schedules(
+    freq: _RelativeDelta | _timedelta,
+    starts: ArrayLike,
+    counts: ArrayLike | None = None,
+    ends: ArrayLike | None = None,
+    rolling_day: int | None = None,
+) -> NDArray[_np.datetime64]:
+    """Generate the dates of a daterule for many start dates at once.
+
+    Row `i` of the result holds the same dates as
+    >>> daterule.iterator(freq, starts[i], ends[i], counts[i], rolling_day)
+    padded with NaT up to the length of the longest schedule. At least one of
+    `counts` or `ends` is required: each may be a single value, or an array with
+    an entry per start.
+    """
+    if isinstance(freq, _timedelta):
+        freq = _RelativeDelta(timedelta=freq)
+    if counts is None and ends is None:
+        raise ValueError("one of counts or ends is required")
+
+    starts = _as_datetime64(starts)
+    if starts.ndim != 1:
+        raise ValueError("starts should be one-dimensional")
+    has_time = _np.datetime_data(starts.dtype)[0] != "D"
+
+    def grid(width: int) -> NDArray[_np.datetime64]:
+        """The first `width` dates of every schedule, ignoring counts and ends."""
+        n = _np.arange(width)
+        dates = _shift_months_impl(starts[:, None], freq.total_months * n)
+        if freq.timedelta:
+            shift = _np.timedelta64(freq.timedelta) * n
+            if not has_time:
+                shift = shift.astype("timedelta64[D]")  # as for python dates
+            dates = dates + shift
+        if rolling_day is not None:
+            dates = with_day(dates, rolling_day)
+        return dates
+
+    if counts is not None:
+        lengths = _np.broadcast_to(_as_integers(counts, "counts"), starts.shape)
+        dates = grid(int(lengths.max(initial=0)))
+        valid = _np.arange(dates.shape[1]) < lengths[:, None]
+
+    if ends is not None:
+        stops = _np.broadcast_to(_as_datetime64(ends), starts.shape)[:, None]
+        missing = (_np.isnat(starts) | _np.isnat(stops[:, 0]))[:, None]
+        forwards = stops[:, 0] >= starts
+
+        def crossed(dates: NDArray[_np.datetime64]) -> NDArray[_np.bool_]:
+            """Whether each date is at or beyond the end of its schedule."""
+            beyond = _np.where(forwards[:, None], dates >= stops, dates <= stops)
+            return _np.logical_or.accumulate(beyond | missing, axis=1)
+
+        if counts is not None:
+            valid &= ~crossed(dates)
+        else:
+            direction = _direction(freq, rolling_day, has_time)
+            if direction is None:
+                raise ValueError("counts are required for non-monotonic rules")
+
+            # Schedules heading away from their ends must finish immediately
+            approaching = forwards if direction > 0 else ~forwards
+            if direction == 0:
+                approaching = _np.zeros_like(forwards)
+            if not crossed(grid(1))[~approaching, 0].all():
+                raise ValueError("some schedules never reach their ends")
+
+            width = 16
+            while True:
+                dates = grid(width)
+                valid = ~crossed(dates)
+                if not valid[:, -1].any():
+                    break
+                width *= 2
+
+    dates = dates[:, : valid.sum(axis=1).max(initial=0)]
+    return _np.where(valid[:, : dates.shape[1]], dates, _np.datetime64("NaT"))
+
+
+def bucket(
+    dates: ArrayLike,
+    freq: _RelativeDelta | _timedelta,
+    start: date | _datetime,
+    end: date | _datetime | None = None,
+    count: int | None = None,
+    rolling_day: int | None = None,
+    amounts: ArrayLike | None = None,
+):
+    """Assign each date to the period of a daterule it falls in.
+
+    The periods are the intervals between successive dates of
+    >>> daterule.iterator(freq, start, end, count, rolling_day)
+    so that date `d` is given the index `i` with `rule[i] <= d < rule[i + 1]`.
+    Dates before the first date of the rule (or NaT) are given the index -1, and
+    dates after the last date of a finite rule the index of the final period.
+
+    The rule must yield increasing dates. Rules shifting by whole months are
+    bucketed in closed form, and others by a binary search of their dates.
+
+    If `amounts` are provided, they are also summed within each period, and the
+    pair `(indices, totals)` is returned.
+    """
+    if isinstance(freq, _timedelta):
+        freq = _RelativeDelta(timedelta=freq)
+    rule = _DateRule(freq, start, end, count, rolling_day)
+    if rule._direction() != 1:
+        raise ValueError("bucketing requires a rule with increasing dates")
+
+    # Indices are masked by assignment, which needs at least one dimension
+    dates = _as_datetime64(dates)
+    shape = dates.shape
+    dates = _np.atleast_1d(dates)
+    missing = _np.isnat(dates)
+    first = _np.asarray(_np.datetime64(start))
+    length = rule._get_length()
+
+    if not freq.timedelta:
+        # The date at index n is in the month n * months after the start, so only
+        # lands after `d` if it is in the same month but on a later day.
+        months = freq.total_months
+        indices = (
+            dates.astype("datetime64[M]").astype(_np.int64)
+            - first.astype("datetime64[M]").astype(_np.int64)
+        ) // months
+        indices[missing] = 0
+        boundaries = _shift_months_impl(first, months * indices)
+        if rolling_day is not None:
+            boundaries = with_day(boundaries, rolling_day)
+        indices -= boundaries > dates
+        _np.maximum(indices, -1, out=indices)
+        if length is not None:
+            _np.minimum(indices, length - 1, out=indices)
+    else:
+        needed = length
+        if needed is None:
+            # We need every date of the rule up to (and including) the latest date
+            latest = dates[~missing].max(initial=first)
+            if isinstance(start, _datetime):
+                stop = latest.astype("datetime64[us]") + _np.timedelta64(1, "us")
+            else:
+                stop = latest.astype("datetime64[D]") + _np.timedelta64(1, "D")
+            needed = len(_DateRule(freq, start, stop.item(), None, rolling_day))
+        boundaries = schedules(freq, first[None], needed, rolling_day=rolling_day)[0]
+        indices = _np.searchsorted(boundaries, dates, side="right") - 1
+
+    indices[missing] = -1
+    if amounts is None:
+        return indices.reshape(shape)
+
+    valid = indices >= 0
+    periods = length if length is not None else indices.max(initial=-1) + 1
+    weights = _np.broadcast_to(amounts, indices.shape)[valid]
+    totals = _np.bincount(indices[valid], weights=weights, minlength=periods)
+    return indices.reshape(shape), totals
+
+
+def _calendar_offsets(
+    calendar: BusinessCalendar, dates: NDArray[_np.datetime64], extra: int = 0
+) -> tuple[NDArray[_np.int64], NDArray[_np.bool_]]:
+    """The position of each date in the calendar, and which dates are NaT."""
+    missing = _np.isnat(dates)
+    offsets = dates.astype("datetime64[D]").astype(_np.int64) - (
+        calendar._first - _EPOCH_ORDINAL
+    )
+    offsets = _np.where(missing, 0, offsets)
+    if _np.any((offsets < 0) | (offsets >= len(calendar._flags) + extra)):
+        raise ValueError("some dates are outside the calendar")
+    return offsets, missing
+
+
+def is_business_day(dates: ArrayLike, calendar: BusinessCalendar) -> NDArray[_np.bool_]:
+    """Whether each date is a business day of the calendar (NaT never is)."""
+    offsets, missing = _calendar_offsets(calendar, _as_datetime64(dates))
+    flags = _np.frombuffer(calendar._flags, dtype=_np.uint8)
+    return (flags[offsets] != 0) & ~missing
+
+
+def business_days_between(
+    d1: ArrayLike, d2: ArrayLike, calendar: BusinessCalendar
+) -> NDArray[_np.int64]:
+    """The number of business days from each `d1` (inclusive) to `d2` (exclusive).
+
+    This is the vectorised equivalent of `BusinessCalendar.business_days_between`.
+    Pairs containing NaT give zero.
+    """
+    d1, d2 = _np.broadcast_arrays(_as_datetime64(d1), _as_datetime64(d2))
+    offsets1, missing1 = _calendar_offsets(calendar, d1, 1)
+    offsets2, missing2 = _calendar_offsets(calendar, d2, 1)
+    counts = _np.frombuffer(calendar._counts, dtype=calendar._counts.typecode)
+
+    between = counts[offsets2].astype(_np.int64) - counts[offsets1]
+    return _np.where(missing1 | missing2, 0, between)
+
+
+def roll(
+    dates: ArrayLike, calendar: BusinessCalendar, convention: str = "following"
+) -> NDArray[_np.datetime64]:
+    """Move each date to a business day of the calendar, if it isn't one already.
+
+    This is the vectorised equivalent of `BusinessCalendar.roll`.
+    """
+    if convention not in _CONVENTIONS:
+        raise ValueError(
+            f"unknown convention {convention!r}, use one of {_CONVENTIONS}"
+        )
+
+    dates = _as_datetime64(dates)
+    offsets, missing = _calendar_offsets(calendar, dates)
+    flags = _np.frombuffer(calendar._flags, dtype=_np.uint8)
+    counts = _np.frombuffer(calendar._counts, dtype=calendar._counts.typecode)
+    business = _np.frombuffer(calendar._business, dtype=calendar._business.typecode)
+    if not len(business):
+        business = _np.zeros(1, dtype=business.dtype)  # no date can roll anywhere
+
+    # The previous and next business days of each date, if there are any
+    count = counts[offsets].astype(_np.int64)
+    has_following = count < len(calendar._business)
+    has_preceding = count > 0
+    following = business[_np.minimum(count, len(business) - 1)]
+    preceding = business[_np.maximum(count - 1, 0)]
+
+    if convention.endswith("following"):
+        target, other = following, preceding
+        has_target, has_other = has_following, has_preceding
+    else:
+        target, other = preceding, following
+        has_target, has_other = has_preceding, has_following
+
+    shift = (target - offsets).astype("timedelta64[D]")
+    if convention.startswith("modified"):
+        days = dates.astype("datetime64[D]")
+        crossed = (days + shift).astype("datetime64[M]") != days.astype("datetime64[M]")
+        crossed &= has_target
+        target = _np.where(crossed, other, target)
+        has_target = _np.where(crossed, has_other, has_target)
+        shift = (target - offsets).astype("timedelta64[D]")
+
+    rolling = (flags[offsets] == 0) & ~missing
+    if _np.any(rolling & ~has_target):
+        raise ValueError("no business day to roll to within the calendar")
+    return _np.where(rolling, dates + shift, dates)
+
+
+def _is_leap_year(years: NDArray[_np.int64]) -> NDArray[_np.bool_]:
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def year_fraction(
+    starts: ArrayLike, ends: ArrayLike, convention: str
+) -> NDArray[_np.float64]:
+    """The fraction of a year between each pair of dates under the given convention.
+
+    This is the vectorised equivalent of `daycount.year_fraction`. Pairs containing
+    NaT give NaN.
+    """
+    if convention not in _DAY_COUNTS:
+        raise ValueError(f"unknown convention {convention!r}, use one of {_DAY_COUNTS}")
+
+    starts, ends = _np.broadcast_arrays(
+        _as_datetime64(starts).astype("datetime64[D]"),
+        _as_datetime64(ends).astype("datetime64[D]"),
+    )
+    missing = _np.isnat(starts) | _np.isnat(ends)
+    days = (ends - starts).astype(_np.int64)
+
+    if convention == "ACT/360":
+        fractions = days / 360
+    elif convention == "ACT/365F":
+        fractions = days / 365
+    elif convention == "ACT/ACT":
+        first, last = _np.minimum(starts, ends), _np.maximum(starts, ends)
+        year1 = first.astype("datetime64[Y]")
+        year2 = last.astype("datetime64[Y]")
+        remaining = ((year1 + 1).astype("datetime64[D]") - first).astype(_np.int64)
+        elapsed = (last - year2.astype("datetime64[D]")).astype(_np.int64)
+        year1, year2 = year1.astype(_np.int64) + 1970, year2.astype(_np.int64) + 1970
+        fractions = _np.sign(days) * (
+            remaining / _np.where(_is_leap_year(year1), 366, 365)
+            + (year2 - year1 - 1)
+            + elapsed / _np.where(_is_leap_year(year2), 366, 365)
+        )
+    else:
+        months1 = starts.astype("datetime64[M]")
+        months2 = ends.astype("datetime64[M]")
+        day1 = (starts - months1.astype("datetime64[D]")).astype(_np.int64) + 1
+        day2 = (ends - months2.astype("datetime64[D]")).astype(_np.int64) + 1
+        day1 = _np.minimum(day1, 30)
+        if convention == "30/360":
+            day2 = _np.where((day2 == 31) & (day1 == 30), 30, day2)
+        else:
+            day2 = _np.minimum(day2, 30)
+        months = months2.astype(_np.int64) - months1.astype(_np.int64)
+        fractions = (30 * months + (day2 - day1)) / 360
+
+    return _np.where(missing, _np.nan, fractions)